@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Indicator benchmark and regression suite
+========================================
+
+Runs every function in indicators.py on 1k, 100k and 10M bars of synthetic
+candles, records wall time, throughput and peak memory, checks the results
+against independent NumPy reference implementations and compares throughput
+with a stored baseline. Runs fully offline.
+
+Usage:
+    python benchmark_indicators.py                     # check against the baseline
+    python benchmark_indicators.py --update-baseline   # record a new baseline
+    python benchmark_indicators.py --sizes 1000 100000 # skip the 10M-bar run
+
+Exit code is 1 if any result is outside the tolerance or any throughput
+falls more than BENCHMARK_REGRESSION_MARGIN below the baseline.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from demo_data import iter_synthetic_candles
+from indicators import calculate_sma, calculate_ema, calculate_rsi, calculate_bollinger_bands, detect_crossover
+from config import BENCHMARK_BASELINE_PATH, BENCHMARK_REGRESSION_MARGIN, BENCHMARK_TOLERANCE
+
+BENCHMARK_SIZES = (1_000, 100_000, 10_000_000)
+
+# Timed samples per measurement, each lasting at least MIN_SAMPLE_TIME seconds
+BENCHMARK_SAMPLES = 5
+MIN_SAMPLE_TIME = 0.05
+
+# Rows per block in the chunked reference implementations (bounds their memory)
+REFERENCE_CHUNK = 1_000_000
+
+
+def _rolling_reference(values, window, reducer):
+    """Apply a reducer over sliding windows in chunks, NaN for incomplete windows"""
+    result = np.full(len(values), np.nan)
+    for start in range(window - 1, len(values), REFERENCE_CHUNK):
+        stop = min(start + REFERENCE_CHUNK, len(values))
+        windows = sliding_window_view(values[start - window + 1:stop], window)
+        result[start:stop] = reducer(windows)
+    return result
+
+
+def reference_sma(values, period):
+    """Mean over each full window"""
+    return _rolling_reference(values, period, lambda windows: windows.mean(axis=-1))
+
+
+def reference_ema(values, period, block=256):
+    """
+    EMA with adjust=False, seeded with the first value
+
+    Within fixed-size blocks the recursion is a matrix product with a
+    lower-triangular decay matrix; only the last value of each block is
+    carried sequentially.
+    """
+    alpha = 2 / (period + 1)
+    decay = 1 - alpha
+    result = np.empty(len(values))
+    result[0] = values[0]
+    rest = values[1:]
+
+    n_blocks = -(-len(rest) // block)
+    padded = np.zeros(n_blocks * block)
+    padded[:len(rest)] = rest
+    steps = np.arange(block)
+    weights = np.tril(decay ** np.clip(steps[:, None] - steps[None, :], 0, None))
+    partial = alpha * padded.reshape(n_blocks, block) @ weights.T
+    carry_weights = decay ** (steps + 1)
+
+    previous = values[0]
+    for i in range(n_blocks):
+        partial[i] += carry_weights * previous
+        previous = partial[i, -1]
+    result[1:] = partial.ravel()[:len(rest)]
+    return result
+
+
+def reference_rsi(values, period=14):
+    """Simple-average RSI over price changes, first change counted as zero"""
+    delta = np.diff(values, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    mean_gain = reference_sma(gains, period)
+    mean_loss = reference_sma(losses, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + mean_gain / mean_loss)
+
+
+def reference_bollinger_bands(values, period=20, std_dev=2):
+    """Mean +/- std_dev sample standard deviations"""
+    middle = reference_sma(values, period)
+    std = _rolling_reference(values, period, lambda windows: windows.std(axis=-1, ddof=1))
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+
+def reference_crossover(first, second):
+    """1 where first crosses above second, -1 where it crosses below"""
+    result = np.zeros(len(first), dtype=np.int64)
+    result[1:][(first[1:] > second[1:]) & (first[:-1] <= second[:-1])] = 1
+    result[1:][(first[1:] < second[1:]) & (first[:-1] >= second[:-1])] = -1
+    return result
+
+
+def _close_enough(actual, expected, tolerance):
+    """Compare arrays with a relative tolerance, treating matching NaNs as equal"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    return bool(np.allclose(actual, expected, rtol=tolerance, atol=tolerance, equal_nan=True))
+
+
+def _benchmark_cases(close):
+    """
+    Build (name, call, reference) for every indicator function
+
+    Inputs that are themselves indicators (crossover operands) are prepared
+    here, outside the timed call.
+    """
+    values = close.to_numpy()
+    fast, slow = calculate_sma(close, 20), calculate_sma(close, 50)
+
+    return [
+        ('calculate_sma', lambda: calculate_sma(close, 20),
+         lambda: reference_sma(values, 20)),
+        ('calculate_ema', lambda: calculate_ema(close, 12),
+         lambda: reference_ema(values, 12)),
+        ('calculate_rsi', lambda: calculate_rsi(close, 14),
+         lambda: reference_rsi(values, 14)),
+        ('calculate_bollinger_bands', lambda: calculate_bollinger_bands(close, 20, 2),
+         lambda: reference_bollinger_bands(values, 20, 2)),
+        ('detect_crossover', lambda: detect_crossover(fast, slow),
+         lambda: reference_crossover(fast.to_numpy(), slow.to_numpy())),
+    ]
+
+
+def _measure(call, samples=BENCHMARK_SAMPLES, min_sample_time=MIN_SAMPLE_TIME):
+    """
+    Time a call and measure its peak traced memory
+
+    Fast calls are repeated inside each sample until it lasts at least
+    `min_sample_time`, and the best sample is kept, which keeps timer and
+    scheduler noise well below the regression margin.
+
+    Returns:
+        tuple: (result, best wall time per call in seconds, peak memory in bytes)
+    """
+    start = time.perf_counter()
+    result = call()
+    first = time.perf_counter() - start
+    calls = max(1, int(min_sample_time / first)) if first > 0 else 1000
+
+    best = first
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(calls):
+            result = call()
+        best = min(best, (time.perf_counter() - start) / calls)
+
+    # Peak memory is measured in a separate run so tracing does not skew the timing
+    del result
+    tracemalloc.start()
+    result = call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, tolerance=BENCHMARK_TOLERANCE, seed=42):
+    """
+    Benchmark every indicator at every size
+
+    Args:
+        sizes (iterable): Number of bars per run
+        tolerance (float): Relative and absolute tolerance against the references
+        seed (int): Seed for the synthetic candles
+
+    Returns:
+        list: One result dict per (function, size)
+    """
+    results = []
+    for size in sizes:
+        close = next(iter_synthetic_candles(size, chunk_size=size, seed=seed, timeframe='1m'))['close']
+        print(f"\n📏 {size:,} bars")
+
+        for name, call, reference in _benchmark_cases(close):
+            result, seconds, peak = _measure(call)
+            expected = reference()
+            if isinstance(result, tuple):
+                correct = all(_close_enough(r, e, tolerance) for r, e in zip(result, expected))
+            else:
+                correct = _close_enough(result, expected, tolerance)
+
+            results.append({
+                'function': name,
+                'bars': size,
+                'seconds': seconds,
+                'bars_per_second': size / seconds if seconds > 0 else float('inf'),
+                'peak_mb': peak / 1024 ** 2,
+                'correct': correct,
+            })
+            print(f"   {'✓' if correct else '✗'} {name:<26} {seconds * 1000:10.2f} ms  "
+                  f"{size / seconds / 1e6:8.2f} M bars/s  peak {peak / 1024 ** 2:9.1f} MB")
+        del close
+
+    return results
+
+
+def load_baseline(path=BENCHMARK_BASELINE_PATH):
+    """Load stored throughput per function and size, or an empty baseline"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results, path=BENCHMARK_BASELINE_PATH):
+    """Store the throughput of these results as the new baseline"""
+    baseline = load_baseline(path)
+    for result in results:
+        baseline.setdefault(result['function'], {})[str(result['bars'])] = result['bars_per_second']
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def find_regressions(results, baseline, margin=BENCHMARK_REGRESSION_MARGIN):
+    """
+    Compare throughput against the baseline
+
+    Args:
+        results (list): Results from run_benchmarks
+        baseline (dict): {function: {bars: bars_per_second}}
+        margin (float): Allowed fractional slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        list: (function, bars, baseline throughput, current throughput) for each regression
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result['function'], {}).get(str(result['bars']))
+        if expected and result['bars_per_second'] < expected * (1 - margin):
+            regressions.append((result['function'], result['bars'], expected, result['bars_per_second']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicators.py and check for regressions")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(BENCHMARK_SIZES),
+                        help="Numbers of bars to benchmark")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store the measured throughput as the new baseline")
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument('--margin', type=float, default=BENCHMARK_REGRESSION_MARGIN,
+                        help="Allowed fractional throughput drop before failing")
+    args = parser.parse_args()
+
+    print("🏁 Indicator benchmark")
+    results = run_benchmarks(args.sizes)
+    failed = [r for r in results if not r['correct']]
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n💾 Baseline saved to {os.path.abspath(args.baseline)}")
+        regressions = []
+    else:
+        baseline = load_baseline(args.baseline)
+        if not baseline:
+            print(f"\n⚠️  No baseline at {args.baseline}; run with --update-baseline to record one")
+        regressions = find_regressions(results, baseline, args.margin)
+
+    for result in failed:
+        print(f"✗ {result['function']} ({result['bars']:,} bars) differs from the reference")
+    for name, bars, expected, actual in regressions:
+        print(f"✗ {name} ({bars:,} bars) regressed: {actual / 1e6:.2f} M bars/s "
+              f"vs baseline {expected / 1e6:.2f} M bars/s")
+
+    if failed or regressions:
+        return 1
+    print("\n✅ All indicators within tolerance and baseline throughput")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import os
+import glob
+import pandas as pd
+from config import CANDLE_STORE_PATH, STORE_MAX_PARTS
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class CandleStore:
+    """
+    Local Parquet store for OHLCV candles
+
+    Candles are partitioned on disk by exchange, symbol and timeframe:
+
+        <root>/exchange=binance/symbol=BTC-USDT/timeframe=1h/part-<first_ms>-<last_ms>.parquet
+
+    New candles are written as small part files and periodically compacted
+    into one file, so appending a delta never rewrites the whole history.
+    Loaded partitions are kept in memory for repeated reads.
+    """
+
+    def __init__(self, root=CANDLE_STORE_PATH):
+        self.root = root
+        self._frames = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    def _partition_dir(self, exchange_name, symbol, timeframe):
+        """Directory holding one (exchange, symbol, timeframe) partition"""
+        safe_symbol = symbol.replace('/', '-').replace(':', '_')
+        return os.path.join(self.root, f'exchange={exchange_name}',
+                            f'symbol={safe_symbol}', f'timeframe={timeframe}')
+
+    def _part_files(self, exchange_name, symbol, timeframe):
+        return sorted(glob.glob(os.path.join(self._partition_dir(exchange_name, symbol, timeframe),
+                                             'part-*.parquet')))
+
+    def load(self, exchange_name, symbol, timeframe, limit=None):
+        """
+        Load stored candles for a partition
+
+        Args:
+            exchange_name (str): Name of the exchange
+            symbol (str): Trading pair symbol
+            timeframe (str): Timeframe for data
+            limit (int): Only return the most recent `limit` candles (optional)
+
+        Returns:
+            pd.DataFrame: OHLCV data with datetime index, or None if nothing is stored
+        """
+        key = (exchange_name, symbol, timeframe)
+        if key not in self._frames:
+            files = self._part_files(exchange_name, symbol, timeframe)
+            if not files:
+                return None
+            df = pd.concat([pd.read_parquet(path) for path in files])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            self._frames[key] = df
+
+        df = self._frames[key]
+        if limit is not None:
+            df = df.iloc[-limit:]
+        return df
+
+    def last_timestamp(self, exchange_name, symbol, timeframe):
+        """
+        Get the open time of the newest stored candle
+
+        Returns:
+            pd.Timestamp: Newest candle timestamp, or None if nothing is stored
+        """
+        df = self.load(exchange_name, symbol, timeframe)
+        if df is None or len(df) == 0:
+            return None
+        return df.index[-1]
+
+    def append(self, exchange_name, symbol, timeframe, df):
+        """
+        Write candles newer or older than the stored history to a new part file
+
+        Args:
+            exchange_name (str): Name of the exchange
+            symbol (str): Trading pair symbol
+            timeframe (str): Timeframe for data
+            df (pd.DataFrame): OHLCV data with datetime index
+
+        Returns:
+            int: Number of candles written
+        """
+        if df is None or len(df) == 0:
+            return 0
+
+        stored = self.load(exchange_name, symbol, timeframe)
+        if stored is None or len(stored) == 0:
+            new_rows = df[OHLCV_COLUMNS]
+        else:
+            # Backfilled history lands before the first stored candle, new candles after the last
+            outside = (df.index < stored.index[0]) | (df.index > stored.index[-1])
+            new_rows = df.loc[outside, OHLCV_COLUMNS]
+        if len(new_rows) == 0:
+            return 0
+
+        partition = self._partition_dir(exchange_name, symbol, timeframe)
+        os.makedirs(partition, exist_ok=True)
+        first_ms = int(new_rows.index[0].timestamp() * 1000)
+        last_ms = int(new_rows.index[-1].timestamp() * 1000)
+        new_rows.to_parquet(os.path.join(partition, f'part-{first_ms:013d}-{last_ms:013d}.parquet'))
+
+        key = (exchange_name, symbol, timeframe)
+        existing = self._frames.get(key)
+        self._frames[key] = new_rows if existing is None else pd.concat([existing, new_rows]).sort_index()
+
+        if len(self._part_files(exchange_name, symbol, timeframe)) > STORE_MAX_PARTS:
+            self.compact(exchange_name, symbol, timeframe)
+
+        return len(new_rows)
+
+    def compact(self, exchange_name, symbol, timeframe):
+        """Merge all part files of a partition into a single file"""
+        files = self._part_files(exchange_name, symbol, timeframe)
+        if len(files) <= 1:
+            return
+
+        df = self.load(exchange_name, symbol, timeframe)
+        first_ms = int(df.index[0].timestamp() * 1000)
+        last_ms = int(df.index[-1].timestamp() * 1000)
+        target = os.path.join(self._partition_dir(exchange_name, symbol, timeframe),
+                              f'part-{first_ms:013d}-{last_ms:013d}.parquet')
+
+        # Put the merged file in place before removing the parts it replaces; if
+        # that is interrupted, load() drops the rows the leftover parts repeat
+        tmp_path = target + '.tmp'
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, target)
+        for path in files:
+            if path != target:
+                os.remove(path)
@@ -1,13 +1,67 @@
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection, PolyCollection
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from config import CHART_SAVE_PATH, CHART_FILENAME
+from config import (CHART_SAVE_PATH, CHART_FILENAME, CHART_RENDER_MODE, CHART_QUALITY,
+                    CHART_QUALITY_PROFILES, CHART_MIN_CANDLE_PIXELS, CHART_WORKERS, SPREAD_MAX_PLOTTED)
+from spread_analytics import SpreadAnalyzer
+
+UP_COLOR = (0.0, 0.5, 0.0, 1.0)    # matplotlib 'green'
+DOWN_COLOR = (1.0, 0.0, 0.0, 1.0)  # matplotlib 'red'
+
+def decimate_ohlc(df, max_bars):
+    """
+    Downsample OHLCV data into at most `max_bars` buckets
+
+    Each bucket keeps the first open, highest high, lowest low, last close
+    and total volume of the candles it covers, so the visible price range is
+    preserved. Other columns keep their last value, except signal columns,
+    which take the net direction of the signals in the bucket.
+
+    Args:
+        df (pd.DataFrame): OHLCV data (optionally with indicators)
+        max_bars (int): Maximum number of candles to keep
+
+    Returns:
+        pd.DataFrame: Decimated data indexed by each bucket's first timestamp
+    """
+    n = len(df)
+    if n <= max_bars:
+        return df
+
+    bucket_size = int(np.ceil(n / max_bars))
+    starts = np.arange(0, n, bucket_size)
+    ends = np.append(starts[1:], n) - 1
+
+    result = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if column == 'open':
+            result[column] = values[starts]
+        elif column == 'high':
+            result[column] = np.maximum.reduceat(values, starts)
+        elif column == 'low':
+            result[column] = np.minimum.reduceat(values, starts)
+        elif column == 'volume':
+            result[column] = np.add.reduceat(values, starts)
+        elif column.endswith('_signal') and column != 'combined_signal':
+            # Net direction so isolated signals survive but opposing ones cancel
+            filled = np.nan_to_num(values.astype(float))
+            result[column] = np.sign(np.add.reduceat(filled, starts))
+        else:
+            result[column] = values[ends]
+
+    return pd.DataFrame(result, index=df.index[starts])
 
 class ChartGenerator:
-    def __init__(self):
+    def __init__(self, render_mode=CHART_RENDER_MODE, quality=CHART_QUALITY):
+        self.render_mode = render_mode
+        self.quality = CHART_QUALITY_PROFILES[quality]
+        self.spread_analyzer = SpreadAnalyzer()
         self.setup_style()
         self.ensure_chart_directory()
     
@@ -48,8 +102,15 @@ class ChartGenerator:
             print("No data to plot after removing NaN values")
             return None
         
+        fast = self.render_mode == 'fast'
+        if fast:
+            plot_df = decimate_ohlc(plot_df, self._max_candles(fig, ax1))
+        
         # Plot 1: Candlestick chart with moving averages
-        self._plot_candlesticks(ax1, plot_df)
+        if fast:
+            self._plot_candlesticks_fast(ax1, plot_df)
+        else:
+            self._plot_candlesticks(ax1, plot_df)
         self._plot_moving_averages(ax1, plot_df)
         self._plot_bollinger_bands(ax1, plot_df)
         self._plot_signals(ax1, plot_df)
@@ -66,15 +127,22 @@ class ChartGenerator:
         ax2.grid(True, alpha=0.3)
         
         # Plot 3: Volume
-        self._plot_volume(ax3, plot_df)
+        if fast:
+            self._plot_volume_fast(ax3, plot_df)
+        else:
+            self._plot_volume(ax3, plot_df)
         ax3.set_ylabel('Volume', fontsize=12)
         ax3.set_xlabel('Date', fontsize=12)
         ax3.grid(True, alpha=0.3)
         
         # Format x-axis
         for ax in [ax1, ax2, ax3]:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
-            ax.xaxis.set_major_locator(mdates.HourLocator(interval=6))
+            if fast:
+                self._format_fast_date_axis(ax)
+                ax.set_xlim(ax1.get_xlim())
+            else:
+                ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
+                ax.xaxis.set_major_locator(mdates.HourLocator(interval=6))
             plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
         
         # Adjust layout
@@ -85,7 +153,7 @@ class ChartGenerator:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             save_path = os.path.join(CHART_SAVE_PATH, f'{exchange_name}_{timestamp}_{CHART_FILENAME}')
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='black')
+        plt.savefig(save_path, dpi=self.quality['dpi'], bbox_inches='tight', facecolor='black')
         plt.close()
         
         print(f"Chart saved: {save_path}")
@@ -110,6 +178,51 @@ class ChartGenerator:
         # Add wicks
         ax.vlines(df.index, df['low'], df['high'], color=colors, linewidth=1)
     
+    def _max_candles(self, fig, ax):
+        """Number of candles that fit the axes width at the current dpi"""
+        width_px = ax.get_position().width * fig.get_figwidth() * self.quality['dpi']
+        return max(int(width_px // CHART_MIN_CANDLE_PIXELS), 1)
+    
+    def _format_fast_date_axis(self, ax):
+        """Date ticks that adapt to any history length"""
+        locator = mdates.AutoDateLocator()
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    
+    def _candle_geometry(self, df):
+        """Candle x positions (matplotlib date numbers), body width and colors"""
+        x = mdates.date2num(df.index.to_pydatetime())
+        width = np.median(np.diff(x)) * 0.6 if len(x) > 1 else 0.6 / 24
+        up = df['close'].to_numpy() >= df['open'].to_numpy()
+        colors = np.where(up[:, None], UP_COLOR, DOWN_COLOR)
+        return x, width, colors
+    
+    def _plot_candlesticks_fast(self, ax, df):
+        """Plot candlesticks as two batched collections instead of per-candle artists"""
+        x, width, colors = self._candle_geometry(df)
+        opens = df['open'].to_numpy()
+        closes = df['close'].to_numpy()
+        
+        # Wicks: one segment per candle
+        wicks = np.empty((len(x), 2, 2))
+        wicks[:, :, 0] = x[:, None]
+        wicks[:, 0, 1] = df['low'].to_numpy()
+        wicks[:, 1, 1] = df['high'].to_numpy()
+        ax.add_collection(LineCollection(wicks, colors=colors, linewidths=1))
+        
+        # Bodies: one rectangle per candle
+        left, right = x - width / 2, x + width / 2
+        bodies = np.stack([
+            np.column_stack([left, opens]),
+            np.column_stack([left, closes]),
+            np.column_stack([right, closes]),
+            np.column_stack([right, opens]),
+        ], axis=1)
+        ax.add_collection(PolyCollection(bodies, facecolors=colors, edgecolors=colors, linewidths=0.5))
+        
+        ax.set_xlim(x[0] - width, x[-1] + width)
+        ax.set_ylim(df['low'].min() * 0.995, df['high'].max() * 1.005)
+    
     def _plot_moving_averages(self, ax, df):
         """Plot moving averages"""
         # Plot SMAs
@@ -171,10 +284,32 @@ class ChartGenerator:
         
         ax.bar(df.index, df['volume'], color=colors, alpha=0.7, width=0.6)
     
+    def _plot_volume_fast(self, ax, df):
+        """Plot volume bars as one batched collection"""
+        x, width, colors = self._candle_geometry(df)
+        volume = df['volume'].to_numpy()
+        
+        left, right = x - width / 2, x + width / 2
+        zeros = np.zeros_like(volume)
+        bars = np.stack([
+            np.column_stack([left, zeros]),
+            np.column_stack([left, volume]),
+            np.column_stack([right, volume]),
+            np.column_stack([right, zeros]),
+        ], axis=1)
+        ax.add_collection(PolyCollection(bars, facecolors=colors, edgecolors='none', alpha=0.7))
+        
+        ax.set_xlim(x[0] - width, x[-1] + width)
+        ax.set_ylim(0, volume.max() * 1.05 if len(volume) else 1)
+    
     def create_comparison_chart(self, data_dict, save_path=None):
         """
         Create a comparison chart showing price data from multiple exchanges
         
+        Prices are aligned on a common timeline by the spread analyzer; the
+        lower panel shows the pairwise spreads with the largest current
+        z-scores.
+        
         Args:
             data_dict (dict): Dictionary with exchange names as keys and DataFrames as values
             save_path (str): Path to save the chart (optional)
@@ -182,27 +317,49 @@ class ChartGenerator:
         Returns:
             str: Path to saved chart
         """
-        fig, ax = plt.subplots(figsize=(16, 8))
+        aligned = self.spread_analyzer.update(data_dict)
+        spreads = self.spread_analyzer.get_spreads()
+        summary = self.spread_analyzer.summary()
+        plotted = list(summary.index[:SPREAD_MAX_PLOTTED])
+        
+        fig, (ax, ax_spread) = plt.subplots(2, 1, figsize=(16, 10), height_ratios=[2, 1], sharex=True)
         
         colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
         
-        for i, (exchange_name, df) in enumerate(data_dict.items()):
-            if df is not None and len(df) > 0:
-                color = colors[i % len(colors)]
-                ax.plot(df.index, df['close'], label=exchange_name.upper(), 
-                       color=color, linewidth=2, alpha=0.8)
+        if self.render_mode == 'fast':
+            max_points = self._max_candles(fig, ax)
+            aligned = decimate_ohlc(aligned, max_points)
+            spreads = decimate_ohlc(spreads[plotted], max_points)
+        
+        for i, exchange_name in enumerate(aligned.columns):
+            color = colors[i % len(colors)]
+            ax.plot(aligned.index, aligned[exchange_name], label=exchange_name.upper(), 
+                   color=color, linewidth=2, alpha=0.8)
+        
+        for i, pair in enumerate(plotted):
+            ax_spread.plot(spreads.index, spreads[pair], color=colors[i % len(colors)], linewidth=1,
+                           alpha=0.8, label=f"{pair.upper()} (z {summary.loc[pair, 'last_zscore']:+.2f})")
+        ax_spread.axhline(y=0, color='white', linestyle='--', alpha=0.5)
         
         ax.set_title('BTC/USDT Price Comparison Across Exchanges', 
                     fontsize=14, fontweight='bold')
         ax.set_ylabel('Price (USDT)', fontsize=12)
-        ax.set_xlabel('Date', fontsize=12)
         ax.legend()
         ax.grid(True, alpha=0.3)
         
+        ax_spread.set_ylabel('Spread (bps)', fontsize=12)
+        ax_spread.set_xlabel('Date', fontsize=12)
+        if plotted:
+            ax_spread.legend(loc='upper left')
+        ax_spread.grid(True, alpha=0.3)
+        
         # Format x-axis
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
-        ax.xaxis.set_major_locator(mdates.HourLocator(interval=6))
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        if self.render_mode == 'fast':
+            self._format_fast_date_axis(ax_spread)
+        else:
+            ax_spread.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
+            ax_spread.xaxis.set_major_locator(mdates.HourLocator(interval=6))
+        plt.setp(ax_spread.xaxis.get_majorticklabels(), rotation=45)
         
         plt.tight_layout()
         
@@ -211,8 +368,102 @@ class ChartGenerator:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             save_path = os.path.join(CHART_SAVE_PATH, f'comparison_{timestamp}.png')
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='black')
+        plt.savefig(save_path, dpi=self.quality['dpi'], bbox_inches='tight', facecolor='black')
         plt.close()
         
         print(f"Comparison chart saved: {save_path}")
-        return save_path 
\ No newline at end of file
+        return save_path
+
+
+def frame_to_buffers(df):
+    """
+    Pack a DataFrame into plain NumPy buffers for cheap transfer to a worker
+
+    Args:
+        df (pd.DataFrame): Numeric data with datetime index
+
+    Returns:
+        dict: Index (datetimes as int64 UTC ticks with their unit and timezone),
+            column names and one contiguous float block
+    """
+    is_datetime = isinstance(df.index, pd.DatetimeIndex)
+    return {
+        'index': df.index.asi8 if is_datetime else np.asarray(df.index),
+        'index_unit': df.index.unit if is_datetime else None,
+        'index_tz': str(df.index.tz) if is_datetime and df.index.tz is not None else None,
+        'index_name': df.index.name,
+        'columns': list(df.columns),
+        'values': np.ascontiguousarray(df.to_numpy(dtype=np.float64)),
+    }
+
+def frame_from_buffers(payload):
+    """
+    Rebuild a DataFrame packed by frame_to_buffers
+
+    Args:
+        payload (dict): Buffers produced by frame_to_buffers
+
+    Returns:
+        pd.DataFrame: Data with the original index, timezone included
+    """
+    if payload['index_unit'] is None:
+        index = pd.Index(payload['index'], name=payload['index_name'])
+    else:
+        index = pd.DatetimeIndex(payload['index'].view(f"datetime64[{payload['index_unit']}]"), name=payload['index_name'])
+        if payload['index_tz'] is not None:
+            index = index.tz_localize('UTC').tz_convert(payload['index_tz'])
+    return pd.DataFrame(payload['values'], index=index, columns=payload['columns'], copy=False)
+
+_worker_chart_generator = None
+
+def _init_chart_worker(render_mode, quality):
+    """Set up a headless ChartGenerator in each pool process"""
+    global _worker_chart_generator
+    plt.switch_backend('Agg')
+    _worker_chart_generator = ChartGenerator(render_mode, quality)
+
+def _render_chart_job(kind, payload, exchange_name=None, save_path=None):
+    """Render one chart inside a pool process"""
+    if kind == 'candlestick':
+        return _worker_chart_generator.create_candlestick_chart(
+            frame_from_buffers(payload), exchange_name, save_path)
+    data_dict = {name: frame_from_buffers(buffers) for name, buffers in payload.items()}
+    return _worker_chart_generator.create_comparison_chart(data_dict, save_path)
+
+class ChartRenderPool:
+    """
+    Render charts in a pool of headless worker processes
+
+    DataFrames are sent as NumPy buffers instead of pickled frames, and
+    submissions return futures so callers can keep working while the
+    images are written.
+    """
+
+    def __init__(self, workers=CHART_WORKERS, render_mode=CHART_RENDER_MODE, quality=CHART_QUALITY):
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_chart_worker,
+                                            initargs=(render_mode, quality))
+
+    def submit_candlestick(self, df, exchange_name, save_path=None):
+        """
+        Queue a candlestick chart
+
+        Returns:
+            concurrent.futures.Future: Resolves to the saved chart path
+        """
+        return self.executor.submit(_render_chart_job, 'candlestick', frame_to_buffers(df),
+                                    exchange_name, save_path)
+
+    def submit_comparison(self, data_dict, save_path=None):
+        """
+        Queue a comparison chart
+
+        Returns:
+            concurrent.futures.Future: Resolves to the saved chart path
+        """
+        payload = {name: frame_to_buffers(df[['close']]) for name, df in data_dict.items()
+                   if df is not None and len(df) > 0}
+        return self.executor.submit(_render_chart_job, 'comparison', payload, None, save_path)
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes"""
+        self.executor.shutdown(wait=wait)
@@ -23,13 +23,87 @@ SYMBOL = 'BTC/USDT'
 TIMEFRAME = '1h'
 LIMIT = 500  # Number of candles to fetch
 
+# Multi-symbol, multi-timeframe analysis (see multi_timeframe.py)
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']  # Symbol universe
+TIMEFRAMES = ['15m', '1h', '4h']  # Only the shortest is fetched; the rest are aggregated locally
+UNIVERSE_BASE_CANDLES = 1000  # Base-timeframe candles fetched per symbol
+
+# Concurrent fetching parameters
+ASYNC_FETCH = False  # Fetch all exchanges and symbols at once with ccxt.async_support
+REQUEST_TIMEOUT = 10  # Seconds before a single OHLCV request is abandoned
+MAX_CONCURRENT_REQUESTS = 10  # In-flight requests allowed per exchange
+EXCHANGE_RATE_LIMITS = {}  # Requests per second per exchange, e.g. {'binance': 10}; defaults to the exchange's own rateLimit
+
+# Candle store parameters
+USE_CANDLE_STORE = False  # Keep candles on disk and only download new ones
+CANDLE_STORE_PATH = 'data/candles'  # Parquet store partitioned by exchange/symbol/timeframe
+BACKFILL_CANDLES = 5000  # History to page in the first time a symbol is fetched
+PAGE_LIMIT = 1000  # Candles requested per page while backfilling
+STORE_MAX_PARTS = 50  # Part files per partition before they are compacted
+
+# Market metadata cache
+USE_MARKET_CACHE = True  # Reuse load_markets() results across calls and runs
+MARKET_CACHE_PATH = 'data/markets'  # One JSON file of markets per exchange
+MARKET_CACHE_TTL = 24 * 60 * 60  # Seconds before cached markets are refreshed in the background
+TICKER_CACHE_TTL = 10  # Seconds a fetched ticker is reused
+
+# Pipeline profiling
+PROFILE_PIPELINE = False  # Time each stage and exchange and write a JSON report
+PROFILE_CAPTURE = None  # None, 'cprofile' or 'tracemalloc' for a whole-run capture
+PROFILE_REPORT_PATH = 'profiles/pipeline_report.json'  # Runs and latency percentiles
+PROFILE_HISTORY = 100  # Runs kept in the report
+
+# Service (daemon) mode parameters
+SERVICE_CLOSE_GRACE = 1  # Seconds after a candle closes before polling for it
+SERVICE_MAX_WAIT = 30  # Seconds to keep polling for a closed candle the exchange hasn't published yet
+SERVICE_CHART_MODE = 'off'  # Chart mode used after each candle ('off' or 'background')
+SIGNAL_LATENCY_SLO = 5.0  # Target seconds from candle close to signal output
+
 # Technical indicators parameters
 SMA_PERIODS = [20, 50]  # Short and long SMA periods
 EMA_PERIODS = [12, 26]  # Short and long EMA periods
 
+# Compact frames: float32 indicators and int8 signals in one preallocated block
+COMPACT_FRAMES = False
+
 # Signal parameters
 SIGNAL_THRESHOLD = 0.001  # Minimum price change for signal generation
 
+# Declarative signal rules, compiled into one vectorized pass (see signal_rules.py)
+# Crossover rules need a short and a long period; without them the rule holds at 0
+SIGNAL_RULES = [
+    {'name': 'sma_signal', 'type': 'crossover', 'fast': f'sma_{SMA_PERIODS[0]}', 'slow': f'sma_{SMA_PERIODS[1]}', 'weight': 1.0}
+    if len(SMA_PERIODS) >= 2 else {'name': 'sma_signal', 'type': 'hold', 'weight': 1.0},
+    {'name': 'ema_signal', 'type': 'crossover', 'fast': f'ema_{EMA_PERIODS[0]}', 'slow': f'ema_{EMA_PERIODS[1]}', 'weight': 1.0}
+    if len(EMA_PERIODS) >= 2 else {'name': 'ema_signal', 'type': 'hold', 'weight': 1.0},
+    {'name': 'rsi_signal', 'type': 'threshold', 'column': 'rsi', 'buy_below': 30, 'sell_above': 70, 'weight': 1.0},
+    {'name': 'bb_signal', 'type': 'band', 'column': 'close', 'lower': 'bb_lower', 'upper': 'bb_upper', 'weight': 1.0},
+]
+
+# Parameter sweep (see parameter_sweep.py)
+SWEEP_HORIZON = 12  # Bars ahead used to score each signal
+SWEEP_WORKERS = None  # Processes for the sweep; None uses every core
+SWEEP_CHUNK = 16  # (short, long) pairs evaluated per task
+
+# Indicator benchmark (see benchmark_indicators.py)
+BENCHMARK_BASELINE_PATH = 'benchmarks/indicator_baseline.json'  # Stored throughput per function and size
+BENCHMARK_REGRESSION_MARGIN = 0.25  # Fail when throughput drops more than this fraction below baseline
+BENCHMARK_TOLERANCE = 1e-6  # Relative tolerance against the reference implementations
+
 # Chart parameters
 CHART_SAVE_PATH = 'charts'
-CHART_FILENAME = 'btc_trading_chart.png' 
\ No newline at end of file
+CHART_FILENAME = 'btc_trading_chart.png'
+CHART_RENDER_MODE = 'classic'  # 'fast' batches candles into collections and decimates long histories
+CHART_QUALITY = 'print'  # Quality profile from CHART_QUALITY_PROFILES
+CHART_QUALITY_PROFILES = {
+    'draft': {'dpi': 72},
+    'standard': {'dpi': 120},
+    'print': {'dpi': 300},
+}
+CHART_MIN_CANDLE_PIXELS = 3  # Fast mode aggregates candles until each is at least this wide
+SPREAD_TOLERANCE = None  # Oldest candle a venue may contribute to an aligned timestamp (None = half a TIMEFRAME bar)
+SPREAD_ZSCORE_WINDOW = 100  # Rows in the rolling spread z-score
+SPREAD_MAX_ROWS = None  # Keep at most this many aligned rows in the cache (None keeps all)
+SPREAD_MAX_PLOTTED = 6  # Spreads shown on the comparison chart (largest |z-score| first)
+CHART_MODE = 'sync'  # 'sync', 'parallel' (process pool), 'background' (don't wait) or 'off'
+CHART_WORKERS = 2  # Processes used by the chart pool
@@ -1,12 +1,54 @@
 import ccxt
+import ccxt.async_support as ccxt_async
+import asyncio
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import time
-from config import EXCHANGES, SYMBOL, TIMEFRAME, LIMIT
+from config import (EXCHANGES, SYMBOL, TIMEFRAME, LIMIT, ASYNC_FETCH, REQUEST_TIMEOUT,
+                    MAX_CONCURRENT_REQUESTS, EXCHANGE_RATE_LIMITS, USE_CANDLE_STORE,
+                    BACKFILL_CANDLES, PAGE_LIMIT, USE_MARKET_CACHE)
+from market_cache import MarketCache
+from profiler import PipelineProfiler
+
+
+class RateLimiter:
+    """
+    Per-exchange rate limiter for asyncio requests
+
+    Caps the number of in-flight requests and spaces request starts so an
+    exchange never sees more than `requests_per_second` calls.
+    """
+
+    def __init__(self, requests_per_second, max_concurrent=MAX_CONCURRENT_REQUESTS):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.lock = asyncio.Lock()
+        self.next_slot = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
 
 class DataFetcher:
-    def __init__(self):
+    def __init__(self, use_store=USE_CANDLE_STORE, use_market_cache=USE_MARKET_CACHE, profiler=None):
         self.exchanges = {}
+        self.profiler = profiler or PipelineProfiler(enabled=False)
+        self.store = None
+        self._backfilled = {}
+        if use_store:
+            from candle_store import CandleStore
+            self.store = CandleStore()
+        self.market_cache = MarketCache() if use_market_cache else None
         self.initialize_exchanges()
     
     def initialize_exchanges(self):
@@ -24,6 +66,7 @@ class DataFetcher:
                     'enableRateLimit': True,
                 })
                 
+                self.profiler.instrument_exchange(exchange_name, exchange)
                 self.exchanges[exchange_name] = exchange
                 print(f"✓ {exchange_name.capitalize()} initialized successfully")
                 
@@ -49,26 +92,159 @@ class DataFetcher:
         exchange = self.exchanges[exchange_name]
         
         try:
-            # Fetch OHLCV data
-            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            
-            # Convert timestamp to datetime
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('datetime', inplace=True)
+            # Serve from the local store, downloading only the missing delta
+            if self.store is not None:
+                self.sync_candles(exchange_name, symbol, timeframe, min_candles=limit)
+                return self.store.load(exchange_name, symbol, timeframe, limit=limit)
             
-            # Drop timestamp column
-            df.drop('timestamp', axis=1, inplace=True)
+            # Page through history when more candles are needed than one request returns
+            if limit > PAGE_LIMIT:
+                return self.fetch_history(exchange_name, symbol, timeframe, limit)
             
-            return df
+            # Fetch OHLCV data
+            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            return self._to_dataframe(ohlcv)
             
         except Exception as e:
             print(f"Error fetching data from {exchange_name}: {str(e)}")
             return None
     
-    def fetch_all_exchanges(self, symbol=SYMBOL, timeframe=TIMEFRAME, limit=LIMIT):
+    def sync_candles(self, exchange_name, symbol=SYMBOL, timeframe=TIMEFRAME, min_candles=BACKFILL_CANDLES):
+        """
+        Bring the local candle store up to date for one partition
+        
+        Backfills history on the first run, then only requests candles after
+        the last stored timestamp, plus any older history when `min_candles`
+        reaches further back than the store. Nothing is downloaded when the
+        requested range is already on disk.
+        
+        Args:
+            exchange_name (str): Name of the exchange
+            symbol (str): Trading pair symbol
+            timeframe (str): Timeframe for data
+            min_candles (int): Closed candles the store should hold (at least BACKFILL_CANDLES on the first run)
+        
+        Returns:
+            int: Number of new candles stored
+        """
+        step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        now_ms = int(time.time() * 1000)
+        stored = self.store.load(exchange_name, symbol, timeframe)
+        
+        if stored is None or len(stored) == 0:
+            since = now_ms - max(min_candles, BACKFILL_CANDLES) * step_ms
+            return self.backfill(exchange_name, symbol, timeframe, since)
+        
+        new_candles = 0
+        
+        # Page in the history between the requested start and the first stored candle
+        key = (exchange_name, symbol, timeframe)
+        wanted_since = now_ms // step_ms * step_ms - min_candles * step_ms
+        first_ms = int(stored.index[0].timestamp() * 1000)
+        if wanted_since < first_ms and wanted_since < self._backfilled.get(key, first_ms):
+            new_candles += self.backfill(exchange_name, symbol, timeframe, wanted_since, until=first_ms)
+            # Remember how far back was asked for, so history the exchange doesn't have isn't re-requested
+            self._backfilled[key] = wanted_since
+        
+        # The newest closed candle is already stored
+        since = int(stored.index[-1].timestamp() * 1000) + step_ms
+        if since + step_ms <= now_ms:
+            new_candles += self.backfill(exchange_name, symbol, timeframe, since)
+        
+        return new_candles
+    
+    def backfill(self, exchange_name, symbol, timeframe, since, page_limit=PAGE_LIMIT, until=None):
+        """
+        Page through history with `since` and append closed candles to the store
+        
+        Args:
+            exchange_name (str): Name of the exchange
+            symbol (str): Trading pair symbol
+            timeframe (str): Timeframe for data
+            since (int): Start time in milliseconds
+            page_limit (int): Candles requested per page
+            until (int): Stop paging once candles reach this time in milliseconds (optional)
+        
+        Returns:
+            int: Number of new candles stored
+        """
+        exchange = self.exchanges[exchange_name]
+        step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        stored = 0
+        
+        while True:
+            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+            if not ohlcv:
+                break
+            
+            # Only closed candles go to disk; the open one is still changing
+            now_ms = int(time.time() * 1000)
+            closed = [row for row in ohlcv if row[0] + step_ms <= now_ms]
+            stored += self.store.append(exchange_name, symbol, timeframe, self._to_dataframe(closed))
+            
+            next_since = int(ohlcv[-1][0]) + step_ms
+            if next_since <= since or len(closed) < len(ohlcv) or next_since + step_ms > now_ms:
+                break
+            if until is not None and next_since >= until:
+                break
+            since = next_since
+        
+        if stored:
+            print(f"✓ Stored {stored} new candles for {symbol} {timeframe} from {exchange_name}")
+        return stored
+    
+    def fetch_history(self, exchange_name, symbol, timeframe, limit, page_limit=PAGE_LIMIT):
+        """
+        Fetch the most recent `limit` candles in pages of `page_limit`
+        
+        Args:
+            exchange_name (str): Name of the exchange
+            symbol (str): Trading pair symbol
+            timeframe (str): Timeframe for data
+            limit (int): Number of candles to fetch
+            page_limit (int): Candles requested per page
+        
+        Returns:
+            pd.DataFrame: OHLCV data with datetime index
+        """
+        exchange = self.exchanges[exchange_name]
+        step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        since = int(time.time() * 1000) // step_ms * step_ms - (limit - 1) * step_ms
+        rows = []
+        
+        while len(rows) < limit:
+            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+            if not ohlcv:
+                break
+            rows.extend(ohlcv)
+            next_since = int(ohlcv[-1][0]) + step_ms
+            if next_since <= since or len(ohlcv) < page_limit:
+                break
+            since = next_since
+        
+        df = self._to_dataframe(rows)
+        return df[~df.index.duplicated(keep='last')].iloc[-limit:]
+    
+    @staticmethod
+    def _to_dataframe(ohlcv):
+        """
+        Convert raw ccxt OHLCV rows to a DataFrame
+        
+        Args:
+            ohlcv (list): Rows of [timestamp, open, high, low, close, volume]
+        
+        Returns:
+            pd.DataFrame: OHLCV data with datetime index
+        """
+        # Build columns from one float block instead of row-by-row parsing
+        values = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        
+        # Convert timestamp to datetime
+        index = pd.DatetimeIndex(pd.to_datetime(values[:, 0].astype(np.int64), unit='ms'), name='datetime')
+        
+        return pd.DataFrame(values[:, 1:], index=index, columns=['open', 'high', 'low', 'close', 'volume'])
+    
+    def fetch_all_exchanges(self, symbol=SYMBOL, timeframe=TIMEFRAME, limit=LIMIT, concurrent=ASYNC_FETCH):
         """
         Fetch OHLCV data from all initialized exchanges
         
@@ -76,18 +252,25 @@ class DataFetcher:
             symbol (str): Trading pair symbol
             timeframe (str): Timeframe for data
             limit (int): Number of candles to fetch
+            concurrent (bool): Fetch every exchange at once instead of one after another
         
         Returns:
             dict: Dictionary with exchange names as keys and DataFrames as values
         """
+        if concurrent:
+            results = self.fetch_all_concurrent([symbol], timeframe, limit)
+            return {name: frames[symbol] for name, frames in results.items() if symbol in frames}
+        
         data = {}
         
         for exchange_name in self.exchanges.keys():
             print(f"Fetching data from {exchange_name}...")
-            df = self.fetch_ohlcv(exchange_name, symbol, timeframe, limit)
+            with self.profiler.stage('fetch', exchange_name):
+                df = self.fetch_ohlcv(exchange_name, symbol, timeframe, limit)
             
             if df is not None:
                 data[exchange_name] = df
+                self.profiler.count('rows_fetched', len(df), exchange_name)
                 print(f"✓ Fetched {len(df)} candles from {exchange_name}")
             else:
                 print(f"✗ Failed to fetch data from {exchange_name}")
@@ -97,6 +280,218 @@ class DataFetcher:
         
         return data
     
+    def fetch_all_concurrent(self, symbols=None, timeframe=TIMEFRAME, limit=LIMIT, exchanges=None,
+                             max_concurrent=MAX_CONCURRENT_REQUESTS):
+        """
+        Fetch OHLCV data for every exchange and symbol concurrently
+        
+        Args:
+            symbols (list): Trading pair symbols (defaults to [SYMBOL])
+            timeframe (str): Timeframe for data
+            limit (int): Number of candles to fetch
+            exchanges (dict): Optional async exchange clients by name (e.g. stub exchanges)
+            max_concurrent (int): In-flight requests allowed per exchange
+        
+        Returns:
+            dict: {exchange_name: {symbol: DataFrame}}
+        """
+        return asyncio.run(self.fetch_all_exchanges_async(symbols, timeframe, limit, exchanges, max_concurrent))
+    
+    def create_async_exchanges(self):
+        """
+        Create ccxt.async_support clients for the configured exchanges
+        
+        Returns:
+            dict: Async exchange clients by name
+        """
+        async_exchanges = {}
+        for exchange_name, config in EXCHANGES.items():
+            try:
+                exchange_class = getattr(ccxt_async, exchange_name)
+                
+                # Throttling is done by RateLimiter, so ccxt's own limiter is off
+                async_exchanges[exchange_name] = exchange_class({
+                    'apiKey': config['api_key'],
+                    'secret': config['secret'],
+                    'sandbox': config['sandbox'],
+                    'enableRateLimit': False,
+                })
+                self.profiler.instrument_exchange(exchange_name, async_exchanges[exchange_name])
+            except Exception as e:
+                print(f"✗ Failed to initialize async {exchange_name}: {str(e)}")
+        return async_exchanges
+    
+    async def fetch_all_exchanges_async(self, symbols=None, timeframe=TIMEFRAME, limit=LIMIT, exchanges=None,
+                                        max_concurrent=MAX_CONCURRENT_REQUESTS):
+        """
+        Fetch OHLCV data for every exchange and symbol at once
+        
+        Each exchange gets its own RateLimiter instead of a global sleep, and
+        every request is bounded by REQUEST_TIMEOUT. Like the sequential path,
+        each exchange is timed as a 'fetch' stage, requests above PAGE_LIMIT
+        candles are paged, and closed candles go to the candle store when one
+        is configured.
+        
+        Args:
+            symbols (list): Trading pair symbols (defaults to [SYMBOL])
+            timeframe (str): Timeframe for data
+            limit (int): Number of candles to fetch
+            exchanges (dict): Optional async exchange clients by name (e.g. stub exchanges)
+            max_concurrent (int): In-flight requests allowed per exchange
+        
+        Returns:
+            dict: {exchange_name: {symbol: DataFrame}}
+        """
+        symbols = symbols or [SYMBOL]
+        owns_exchanges = exchanges is None
+        if owns_exchanges:
+            exchanges = self.create_async_exchanges()
+        
+        try:
+            tasks = []
+            for exchange_name, exchange in exchanges.items():
+                limiter = RateLimiter(self._requests_per_second(exchange_name, exchange), max_concurrent)
+                tasks.append(self._fetch_exchange_async(exchange_name, exchange, limiter,
+                                                        symbols, timeframe, limit))
+            
+            results = [result for exchange_results in await asyncio.gather(*tasks)
+                       for result in exchange_results]
+        finally:
+            if owns_exchanges:
+                await asyncio.gather(*(exchange.close() for exchange in exchanges.values()),
+                                     return_exceptions=True)
+        
+        data = {exchange_name: {} for exchange_name in exchanges}
+        for exchange_name, symbol, df in results:
+            if df is not None:
+                data[exchange_name][symbol] = df
+        
+        for exchange_name, frames in data.items():
+            print(f"✓ Fetched {len(frames)}/{len(symbols)} symbols from {exchange_name}")
+        
+        return data
+    
+    async def _fetch_exchange_async(self, exchange_name, exchange, limiter, symbols, timeframe, limit):
+        """
+        Fetch every symbol from one exchange, timed as its 'fetch' stage
+        
+        Returns:
+            list: (exchange_name, symbol, DataFrame or None) per symbol
+        """
+        with self.profiler.stage('fetch', exchange_name):
+            results = await asyncio.gather(*(self._fetch_ohlcv_async(exchange_name, exchange, limiter,
+                                                                     symbol, timeframe, limit)
+                                             for symbol in symbols))
+        
+        step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        for _, symbol, df in results:
+            if df is None:
+                continue
+            self.profiler.count('rows_fetched', len(df), exchange_name)
+            if self.store is not None:
+                # Only closed candles go to disk; the open one is still changing
+                closed = df[df.index + pd.Timedelta(milliseconds=step_ms) <= pd.to_datetime(time.time(), unit='s')]
+                self.store.append(exchange_name, symbol, timeframe, closed)
+        return results
+    
+    async def _fetch_ohlcv_async(self, exchange_name, exchange, limiter, symbol, timeframe, limit):
+        """
+        Fetch one symbol from one exchange under its rate limiter and timeout
+        
+        Requests above PAGE_LIMIT candles are paged with `since`, one
+        rate-limited request per page.
+        
+        Returns:
+            tuple: (exchange_name, symbol, DataFrame or None)
+        """
+        try:
+            if limit > PAGE_LIMIT:
+                return exchange_name, symbol, await self._fetch_history_async(exchange, limiter, symbol,
+                                                                              timeframe, limit)
+            async with limiter:
+                ohlcv = await asyncio.wait_for(
+                    exchange.fetch_ohlcv(symbol, timeframe, limit=limit),
+                    timeout=REQUEST_TIMEOUT
+                )
+            return exchange_name, symbol, self._to_dataframe(ohlcv)
+        except asyncio.TimeoutError:
+            print(f"✗ Timed out fetching {symbol} from {exchange_name} after {REQUEST_TIMEOUT}s")
+        except Exception as e:
+            print(f"Error fetching {symbol} from {exchange_name}: {str(e)}")
+        return exchange_name, symbol, None
+    
+    async def _fetch_history_async(self, exchange, limiter, symbol, timeframe, limit, page_limit=PAGE_LIMIT):
+        """
+        Async counterpart of fetch_history: the most recent `limit` candles in pages of `page_limit`
+        
+        Returns:
+            pd.DataFrame: OHLCV data with datetime index
+        """
+        step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        since = int(time.time() * 1000) // step_ms * step_ms - (limit - 1) * step_ms
+        rows = []
+        
+        while len(rows) < limit:
+            async with limiter:
+                ohlcv = await asyncio.wait_for(
+                    exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=page_limit),
+                    timeout=REQUEST_TIMEOUT
+                )
+            if not ohlcv:
+                break
+            rows.extend(ohlcv)
+            next_since = int(ohlcv[-1][0]) + step_ms
+            if next_since <= since or len(ohlcv) < page_limit:
+                break
+            since = next_since
+        
+        df = self._to_dataframe(rows)
+        return df[~df.index.duplicated(keep='last')].iloc[-limit:]
+    
+    @staticmethod
+    def _requests_per_second(exchange_name, exchange):
+        """
+        Resolve the request budget for an exchange
+        
+        Uses EXCHANGE_RATE_LIMITS when set, otherwise the exchange's own
+        rateLimit (milliseconds between requests, as ccxt defines it).
+        """
+        if exchange_name in EXCHANGE_RATE_LIMITS:
+            return EXCHANGE_RATE_LIMITS[exchange_name]
+        rate_limit_ms = getattr(exchange, 'rateLimit', 0)
+        return 1000.0 / rate_limit_ms if rate_limit_ms else 0
+    
+    def get_symbols(self, exchange_name):
+        """
+        Get the symbols traded on an exchange, served from the market cache when enabled
+        
+        Args:
+            exchange_name (str): Name of the exchange
+        
+        Returns:
+            list: Market symbols
+        """
+        exchange = self.exchanges[exchange_name]
+        if self.market_cache is not None:
+            return self.market_cache.get_symbols(exchange_name, exchange)
+        return list(exchange.load_markets().keys())
+    
+    def fetch_ticker(self, exchange_name, symbol=SYMBOL):
+        """
+        Fetch a ticker, reusing a recent one from the market cache when enabled
+        
+        Args:
+            exchange_name (str): Name of the exchange
+            symbol (str): Trading pair symbol
+        
+        Returns:
+            dict: ccxt ticker
+        """
+        exchange = self.exchanges[exchange_name]
+        if self.market_cache is not None:
+            return self.market_cache.get_ticker(exchange_name, exchange, symbol)
+        return exchange.fetch_ticker(symbol)
+    
     def get_exchange_info(self, exchange_name):
         """
         Get exchange information
@@ -113,12 +508,12 @@ class DataFetcher:
         exchange = self.exchanges[exchange_name]
         
         try:
-            markets = exchange.load_markets()
-            ticker = exchange.fetch_ticker(SYMBOL)
+            symbols = self.get_symbols(exchange_name)
+            ticker = self.fetch_ticker(exchange_name, SYMBOL)
             
             return {
                 'name': exchange_name,
-                'symbols': list(markets.keys()),
+                'symbols': symbols,
                 'current_price': ticker['last'],
                 '24h_volume': ticker['baseVolume'],
                 '24h_change': ticker['percentage'],
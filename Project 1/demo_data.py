@@ -1,26 +1,197 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
 
-def generate_demo_data():
+# Regime parameters for the synthetic market (annualized drift and volatility)
+CALM_REGIME = {'drift': 0.20, 'volatility': 0.45}
+VOLATILE_REGIME = {'drift': -0.30, 'volatility': 1.10}
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+def _simulate_log_returns(rng, n_bars, drift, volatility, regime_switch_prob=0.0,
+                          jump_prob=0.0, jump_std=0.03, start_regime=0):
+    """
+    Draw per-bar log returns from a regime-switching GBM with jumps
+    
+    Args:
+        rng (np.random.Generator): Random generator
+        n_bars (int): Number of bars
+        drift (tuple): Per-bar drift for (calm, volatile) regimes
+        volatility (tuple): Per-bar volatility for (calm, volatile) regimes
+        regime_switch_prob (float): Probability of switching regime on each bar
+        jump_prob (float): Probability of a jump on each bar
+        jump_std (float): Standard deviation of jump log returns
+        start_regime (int): Regime the series starts in (0 calm, 1 volatile)
+    
+    Returns:
+        tuple: (log_returns, regimes)
+    """
+    # Two-state Markov chain: the regime flips on every switch event
+    if regime_switch_prob > 0:
+        switches = rng.random(n_bars) < regime_switch_prob
+        regimes = (start_regime + np.cumsum(switches)) % 2
+    else:
+        regimes = np.full(n_bars, start_regime)
+    
+    mu = np.asarray(drift)[regimes]
+    sigma = np.asarray(volatility)[regimes]
+    
+    # GBM log returns with Ito correction
+    log_returns = (mu - 0.5 * sigma ** 2) + sigma * rng.standard_normal(n_bars)
+    
+    # Compound Poisson jumps
+    if jump_prob > 0:
+        jumps = rng.random(n_bars) < jump_prob
+        log_returns[jumps] += rng.normal(0, jump_std, jumps.sum())
+    
+    return log_returns, regimes
+
+def _candles_from_closes(rng, closes, prev_close, wick_vol=0.004, volume_scale=100.0):
+    """
+    Build OHLCV columns around a close price path
+    
+    Args:
+        rng (np.random.Generator): Random generator
+        closes (np.ndarray): Close prices
+        prev_close (float): Close before the first bar (used as its open)
+        wick_vol (float): Scale of the high/low wicks relative to price
+        volume_scale (float): Typical volume per bar
+    
+    Returns:
+        dict: Column arrays for open, high, low, close and volume
+    """
+    n_bars = len(closes)
+    opens = np.empty(n_bars)
+    opens[0] = prev_close
+    opens[1:] = closes[:-1]
+    opens *= 1 + rng.normal(0, wick_vol / 4, n_bars)
+    
+    body_high = np.maximum(opens, closes)
+    body_low = np.minimum(opens, closes)
+    highs = body_high * (1 + np.abs(rng.normal(0, wick_vol, n_bars)))
+    lows = body_low * (1 - np.abs(rng.normal(0, wick_vol, n_bars)))
+    
+    # Volume rises with the size of the move
+    move = np.abs(closes - opens) / opens
+    volumes = volume_scale * rng.lognormal(0, 0.5, n_bars) * (1 + move * 100)
+    
+    return {'open': opens, 'high': highs, 'low': lows, 'close': closes, 'volume': volumes}
+
+def iter_synthetic_candles(n_bars, chunk_size=1_000_000, seed=None, base_price=45000,
+                           timeframe='1h', end=None, drift=None, volatility=None,
+                           switches_per_year=12, jumps_per_year=20, jump_std=0.03):
+    """
+    Stream one synthetic OHLCV series in chunks
+    
+    State (last price, regime, random stream) carries across chunks, so the
+    concatenated chunks are one continuous series while memory stays bounded
+    by chunk_size.
+    
+    Args:
+        n_bars (int): Total number of bars
+        chunk_size (int): Bars per yielded DataFrame
+        seed (int | np.random.SeedSequence): Seed for reproducible output
+        base_price (float): Starting price
+        timeframe (str): Candle timeframe, e.g. '1m' or '1h'
+        end (datetime): Timestamp of the last bar (defaults to now)
+        drift (tuple): Annualized drift for (calm, volatile) regimes
+        volatility (tuple): Annualized volatility for (calm, volatile) regimes
+        switches_per_year (float): Expected number of regime switches per year
+        jumps_per_year (float): Expected number of price jumps per year
+        jump_std (float): Standard deviation of jump log returns
+    
+    Yields:
+        pd.DataFrame: OHLCV chunk with datetime index
+    """
+    rng = np.random.default_rng(seed)
+    drift = drift if drift is not None else (CALM_REGIME['drift'], VOLATILE_REGIME['drift'])
+    volatility = volatility if volatility is not None else (CALM_REGIME['volatility'], VOLATILE_REGIME['volatility'])
+    
+    step = pd.Timedelta(timeframe)
+    end = pd.Timestamp(end if end is not None else datetime.now()).floor(step)
+    start = end - step * (n_bars - 1)
+    
+    # Scale annualized parameters to one bar
+    dt = step / pd.Timedelta(minutes=1) / MINUTES_PER_YEAR
+    bar_drift = np.asarray(drift) * dt
+    bar_volatility = np.asarray(volatility) * np.sqrt(dt)
+    regime_switch_prob = min(switches_per_year * dt, 1.0)
+    jump_prob = min(jumps_per_year * dt, 1.0)
+    
+    prev_close = base_price
+    regime = 0
+    for offset in range(0, n_bars, chunk_size):
+        size = min(chunk_size, n_bars - offset)
+        log_returns, regimes = _simulate_log_returns(
+            rng, size, bar_drift, bar_volatility, regime_switch_prob, jump_prob, jump_std, regime
+        )
+        closes = prev_close * np.exp(np.cumsum(log_returns))
+        columns = _candles_from_closes(rng, closes, prev_close, volume_scale=base_price / 450)
+        
+        index = pd.date_range(start=start + step * offset, periods=size, freq=step)
+        yield pd.DataFrame(columns, index=index)
+        
+        prev_close = closes[-1]
+        regime = regimes[-1]
+
+def generate_synthetic_market(n_bars=500, exchanges=('binance', 'mexc'), symbols=('BTC/USDT',),
+                              seed=None, base_prices=None, timeframe='1h', end=None,
+                              chunk_size=None, **kwargs):
+    """
+    Generate synthetic OHLCV data for many exchanges and symbols
+    
+    Every series is fully vectorized and reproducible from `seed`; each
+    (exchange, symbol) pair gets an independent random stream. Pass
+    chunk_size to get generators of chunks instead of whole frames.
+    
+    Args:
+        n_bars (int): Bars per series
+        exchanges (iterable): Exchange names
+        symbols (iterable): Trading pair symbols
+        seed (int): Seed for reproducible output
+        base_prices (dict): Starting price per symbol (defaults to 45000)
+        timeframe (str): Candle timeframe, e.g. '1m' or '1h'
+        end (datetime): Timestamp of the last bar (defaults to now)
+        chunk_size (int): Stream each series in chunks of this many bars (optional)
+        **kwargs: Model parameters passed to iter_synthetic_candles
+    
+    Returns:
+        dict: {exchange: {symbol: DataFrame or chunk generator}}
+    """
+    base_prices = base_prices or {}
+    end = end if end is not None else datetime.now()
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(exchanges) * len(symbols)))
+    
+    market = {}
+    for exchange in exchanges:
+        market[exchange] = {}
+        for symbol in symbols:
+            chunks = iter_synthetic_candles(
+                n_bars, chunk_size or n_bars, next(seeds), base_prices.get(symbol, 45000),
+                timeframe, end, **kwargs
+            )
+            market[exchange][symbol] = chunks if chunk_size else next(chunks)
+    return market
+
+def generate_demo_data(n_bars=501, seed=None):
     """
     Generate demo OHLCV data for testing purposes
     
+    Args:
+        n_bars (int): Number of hourly candles per exchange
+        seed (int): Seed for reproducible output (optional)
+    
     Returns:
         dict: Dictionary with demo data for different exchanges
     """
     print("📊 Generating demo data...")
     
+    rng = np.random.default_rng(seed)
+    
     # Base price and parameters
     base_price = 45000  # Starting BTC price
     volatility = 0.02   # 2% daily volatility
     trend = 0.001       # Slight upward trend
-    
-    # Generate timestamps (last 500 hours)
-    end_time = datetime.now()
-    start_time = end_time - timedelta(hours=500)
-    timestamps = pd.date_range(start=start_time, end=end_time, freq='1H')
+    timestamps = pd.date_range(end=pd.Timestamp(datetime.now()).floor('h'), periods=n_bars, freq=timedelta(hours=1))
     
     demo_data = {}
     
@@ -29,46 +200,42 @@ def generate_demo_data():
     
     for exchange in exchanges:
         # Add some randomness to make exchanges slightly different
-        exchange_volatility = volatility * (1 + random.uniform(-0.1, 0.1))
-        exchange_trend = trend * (1 + random.uniform(-0.2, 0.2))
+        exchange_volatility = volatility * (1 + rng.uniform(-0.1, 0.1))
+        exchange_trend = trend * (1 + rng.uniform(-0.2, 0.2))
         
-        # Generate price series
-        prices = []
-        current_price = base_price * (1 + random.uniform(-0.05, 0.05))
+        # Add trend and random walk
+        price_change = exchange_trend + rng.normal(0, exchange_volatility / 24, n_bars)
+        current_price = base_price * (1 + rng.uniform(-0.05, 0.05)) * np.cumprod(1 + price_change)
         
-        for i in range(len(timestamps)):
-            # Add trend and random walk
-            price_change = (exchange_trend + 
-                          random.normalvariate(0, exchange_volatility / 24))
-            current_price *= (1 + price_change)
-            
-            # Generate OHLCV data
-            high = current_price * (1 + abs(random.normalvariate(0, 0.005)))
-            low = current_price * (1 - abs(random.normalvariate(0, 0.005)))
-            open_price = current_price * (1 + random.normalvariate(0, 0.002))
-            close_price = current_price * (1 + random.normalvariate(0, 0.002))
-            volume = random.uniform(100, 1000) * current_price / 1000
-            
-            prices.append({
-                'open': max(open_price, low),
-                'high': max(high, open_price, close_price),
-                'low': min(low, open_price, close_price),
-                'close': close_price,
-                'volume': volume
-            })
+        # Generate OHLCV data
+        high = current_price * (1 + np.abs(rng.normal(0, 0.005, n_bars)))
+        low = current_price * (1 - np.abs(rng.normal(0, 0.005, n_bars)))
+        open_price = current_price * (1 + rng.normal(0, 0.002, n_bars))
+        close_price = current_price * (1 + rng.normal(0, 0.002, n_bars))
+        volume = rng.uniform(100, 1000, n_bars) * current_price / 1000
         
         # Create DataFrame
-        df = pd.DataFrame(prices, index=timestamps)
+        df = pd.DataFrame({
+            'open': np.maximum(open_price, low),
+            'high': np.maximum.reduce([high, open_price, close_price]),
+            'low': np.minimum.reduce([low, open_price, close_price]),
+            'close': close_price,
+            'volume': volume
+        }, index=timestamps)
         demo_data[exchange] = df
         
         print(f"✓ Generated {len(df)} demo candles for {exchange}")
     
     return demo_data
 
-def generate_realistic_btc_data():
+def generate_realistic_btc_data(n_bars=501, seed=None):
     """
     Generate more realistic BTC price data based on historical patterns
     
+    Args:
+        n_bars (int): Number of hourly candles per exchange
+        seed (int): Seed for reproducible output (optional)
+    
     Returns:
         dict: Dictionary with realistic demo data
     """
@@ -76,65 +243,52 @@ def generate_realistic_btc_data():
     
     # Historical BTC price patterns (simplified)
     base_price = 45000
-    timestamps = pd.date_range(
-        start=datetime.now() - timedelta(hours=500),
-        end=datetime.now(),
-        freq='1H'
-    )
-    
     demo_data = {}
     exchanges = ['binance', 'mexc']
+    seeds = np.random.SeedSequence(seed).spawn(len(exchanges))
     
-    for exchange in exchanges:
-        # Generate realistic price movement
-        np.random.seed(hash(exchange) % 1000)  # Different seed for each exchange
+    for exchange, exchange_seed in zip(exchanges, seeds):
+        rng = np.random.default_rng(exchange_seed)
         
         # Create price series with realistic patterns
-        returns = np.random.normal(0.0001, 0.015, len(timestamps))  # 1.5% hourly volatility
+        returns = rng.normal(0.0001, 0.015, n_bars)  # 1.5% hourly volatility
+        
+        # Add slight mean reversion against the trailing 20-bar mean return
+        cumulative = np.concatenate(([0.0], np.cumsum(returns)))
+        trailing_mean = (cumulative[21:-1] - cumulative[1:-21]) / 20
+        returns[21:] -= trailing_mean * 0.1
         
-        # Add some trend and mean reversion
-        for i in range(1, len(returns)):
-            # Add slight mean reversion
-            if i > 20:
-                mean_return = np.mean(returns[i-20:i])
-                returns[i] += (0 - mean_return) * 0.1
-            
-            # Add occasional larger moves
-            if random.random() < 0.05:  # 5% chance of larger move
-                returns[i] *= random.uniform(1.5, 2.5)
+        # Add occasional larger moves (5% chance)
+        large_moves = rng.random(n_bars) < 0.05
+        large_moves[0] = False
+        returns[large_moves] *= rng.uniform(1.5, 2.5, large_moves.sum())
         
         # Convert returns to prices
-        prices = [base_price]
-        for ret in returns[1:]:
-            prices.append(prices[-1] * (1 + ret))
+        returns[0] = 0.0
+        prices = base_price * np.cumprod(1 + returns)
         
-        # Generate OHLCV data
-        ohlcv_data = []
-        for i, price in enumerate(prices):
-            # Create realistic OHLCV from price
-            base = price
-            high = base * (1 + abs(random.normalvariate(0, 0.008)))
-            low = base * (1 - abs(random.normalvariate(0, 0.008)))
-            open_price = base * (1 + random.normalvariate(0, 0.003))
-            close_price = base * (1 + random.normalvariate(0, 0.003))
-            
-            # Ensure OHLC relationship
-            high = max(high, open_price, close_price)
-            low = min(low, open_price, close_price)
-            
-            # Volume based on price movement
-            price_change = abs(close_price - open_price) / open_price
-            volume = random.uniform(50, 200) * (1 + price_change * 10)
-            
-            ohlcv_data.append({
-                'open': open_price,
-                'high': high,
-                'low': low,
-                'close': close_price,
-                'volume': volume
-            })
+        # Create realistic OHLCV from price
+        open_price = prices * (1 + rng.normal(0, 0.003, n_bars))
+        close_price = prices * (1 + rng.normal(0, 0.003, n_bars))
+        high = prices * (1 + np.abs(rng.normal(0, 0.008, n_bars)))
+        low = prices * (1 - np.abs(rng.normal(0, 0.008, n_bars)))
+        
+        # Ensure OHLC relationship
+        high = np.maximum.reduce([high, open_price, close_price])
+        low = np.minimum.reduce([low, open_price, close_price])
+        
+        # Volume based on price movement
+        price_change = np.abs(close_price - open_price) / open_price
+        volume = rng.uniform(50, 200, n_bars) * (1 + price_change * 10)
         
-        df = pd.DataFrame(ohlcv_data, index=timestamps)
+        timestamps = pd.date_range(end=pd.Timestamp(datetime.now()).floor('h'), periods=n_bars, freq=timedelta(hours=1))
+        df = pd.DataFrame({
+            'open': open_price,
+            'high': high,
+            'low': low,
+            'close': close_price,
+            'volume': volume
+        }, index=timestamps)
         demo_data[exchange] = df
         
         print(f"✓ Generated {len(df)} realistic candles for {exchange}")
@@ -150,4 +304,4 @@ if __name__ == "__main__":
         print(f"  Shape: {df.shape}")
         print(f"  Date Range: {df.index[0]} to {df.index[-1]}")
         print(f"  Price Range: ${df['low'].min():.2f} - ${df['high'].max():.2f}")
-        print(f"  Current Price: ${df['close'].iloc[-1]:.2f}") 
\ No newline at end of file
+        print(f"  Current Price: ${df['close'].iloc[-1]:.2f}")
@@ -1,5 +1,9 @@
 import pandas as pd
 import numpy as np
+from collections import deque
+
+# Bars per block when computing rolling standard deviations over long histories
+ROLLING_STD_CHUNK = 10_000
 
 def calculate_sma(data, period):
     """
@@ -45,6 +49,33 @@ def calculate_rsi(data, period=14):
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
+def calculate_rolling_std(data, period):
+    """
+    Calculate a rolling sample standard deviation
+    
+    pandas updates rolling variance online, so on long histories whose price
+    level changes by orders of magnitude the rounding error from earlier
+    prices swamps the variance of later windows. Long series are therefore
+    computed in independent blocks (overlapping by period - 1 bars), which
+    gives identical windows while keeping the error bounded per block.
+    
+    Args:
+        data (pd.Series or pd.DataFrame): Price data (one column per series)
+        period (int): Window length
+    
+    Returns:
+        pd.Series or pd.DataFrame: Rolling standard deviation
+    """
+    if len(data) <= ROLLING_STD_CHUNK:
+        return data.rolling(window=period).std()
+    
+    blocks = []
+    for start in range(0, len(data), ROLLING_STD_CHUNK):
+        lead = min(start, period - 1)
+        block = data.iloc[start - lead:start + ROLLING_STD_CHUNK].rolling(window=period).std()
+        blocks.append(block.iloc[lead:])
+    return pd.concat(blocks)
+
 def calculate_bollinger_bands(data, period=20, std_dev=2):
     """
     Calculate Bollinger Bands
@@ -58,7 +89,7 @@ def calculate_bollinger_bands(data, period=20, std_dev=2):
         tuple: (upper_band, middle_band, lower_band)
     """
     middle_band = data.rolling(window=period).mean()
-    std = data.rolling(window=period).std()
+    std = calculate_rolling_std(data, period)
     upper_band = middle_band + (std * std_dev)
     lower_band = middle_band - (std * std_dev)
     return upper_band, middle_band, lower_band
@@ -84,4 +115,249 @@ def detect_crossover(series1, series2):
     bearish = (series1 < series2) & (series1.shift(1) >= series2.shift(1))
     crossover[bearish] = -1
     
-    return crossover 
\ No newline at end of file
+    return crossover 
+
+class StreamingSMA:
+    """
+    Simple Moving Average updated one value at a time
+
+    Keeps a running sum over a fixed-size window so each update costs O(1)
+    regardless of how much history has been seen. Produces the same values
+    as calculate_sma.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.value = np.nan
+
+    def update(self, price):
+        """
+        Add a new price and return the updated SMA
+
+        Args:
+            price (float): Latest closing price
+
+        Returns:
+            float: SMA value (NaN until the window is full)
+        """
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(price)
+        self.total += price
+
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+
+class StreamingEMA:
+    """
+    Exponential Moving Average updated one value at a time
+
+    Matches calculate_ema (pandas ewm with adjust=False), which seeds the
+    average with the first price.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = np.nan
+
+    def update(self, price):
+        """
+        Add a new price and return the updated EMA
+
+        Args:
+            price (float): Latest closing price
+
+        Returns:
+            float: EMA value
+        """
+        if np.isnan(self.value):
+            self.value = price
+        else:
+            self.value = self.alpha * price + (1 - self.alpha) * self.value
+        return self.value
+
+
+class StreamingRSI:
+    """
+    Relative Strength Index updated one value at a time
+
+    Keeps running gain and loss accumulators over the last `period` price
+    changes. calculate_rsi averages gains and losses with a simple rolling
+    mean (and counts the first bar as a zero change), so the accumulators
+    are windowed sums rather than Wilder's smoothing to give the same numbers.
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.changes = deque(maxlen=period)
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.prev_price = None
+        self.value = np.nan
+
+    def update(self, price):
+        """
+        Add a new price and return the updated RSI
+
+        Args:
+            price (float): Latest closing price
+
+        Returns:
+            float: RSI value (NaN until enough changes have been seen)
+        """
+        delta = 0.0 if self.prev_price is None else price - self.prev_price
+        self.prev_price = price
+
+        if len(self.changes) == self.period:
+            old_gain, old_loss = self.changes[0]
+            self.gain_sum -= old_gain
+            self.loss_sum -= old_loss
+
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.changes.append((gain, loss))
+        self.gain_sum += gain
+        self.loss_sum += loss
+
+        if len(self.changes) < self.period:
+            return self.value
+
+        # Clamp tiny negative residues left by the running subtraction
+        gain_sum = max(self.gain_sum, 0.0)
+        loss_sum = max(self.loss_sum, 0.0)
+
+        if loss_sum == 0:
+            self.value = 100.0 if gain_sum > 0 else np.nan
+        else:
+            rs = gain_sum / loss_sum
+            self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class StreamingBollingerBands:
+    """
+    Bollinger Bands updated one value at a time
+
+    Uses a sliding-window Welford update for the mean and variance so each
+    update is O(1). Rounding error in the running sums still accumulates over
+    long streams (as in calculate_rolling_std), so every ROLLING_STD_CHUNK
+    updates the mean and variance are recomputed exactly from the window.
+    Produces the same values as calculate_bollinger_bands (sample standard
+    deviation).
+    """
+
+    def __init__(self, period=20, std_dev=2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates_since_anchor = 0
+        self.value = (np.nan, np.nan, np.nan)
+
+    def _reanchor(self):
+        """Recompute the mean and sum of squared deviations from the window"""
+        window = np.fromiter(self.window, dtype=np.float64, count=len(self.window))
+        self.mean = float(window.mean())
+        self.m2 = float(((window - self.mean) ** 2).sum())
+        self.updates_since_anchor = 0
+
+    def update(self, price):
+        """
+        Add a new price and return the updated bands
+
+        Args:
+            price (float): Latest closing price
+
+        Returns:
+            tuple: (upper_band, middle_band, lower_band)
+        """
+        if len(self.window) < self.period:
+            # Growing window: standard Welford step
+            self.window.append(price)
+            delta = price - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (price - self.mean)
+        else:
+            # Full window: replace the oldest value in place
+            old = self.window[0]
+            self.window.append(price)
+            old_mean = self.mean
+            self.mean += (price - old) / self.period
+            self.m2 += (price - old) * (price - self.mean + old - old_mean)
+
+            self.updates_since_anchor += 1
+            if self.updates_since_anchor >= ROLLING_STD_CHUNK:
+                self._reanchor()
+
+        if len(self.window) == self.period:
+            variance = max(self.m2, 0.0) / (self.period - 1)
+            std = np.sqrt(variance)
+            self.value = (self.mean + std * self.std_dev,
+                          self.mean,
+                          self.mean - std * self.std_dev)
+        return self.value
+
+
+class StreamingIndicators:
+    """
+    Incremental counterpart of SignalGenerator.calculate_indicators
+
+    Feeds each closed OHLCV bar through streaming SMA, EMA, RSI and Bollinger
+    Band calculators and returns the latest values under the same column
+    names the batch pipeline uses.
+    """
+
+    def __init__(self, sma_periods, ema_periods, rsi_period=14, bb_period=20, bb_std_dev=2):
+        self.smas = {period: StreamingSMA(period) for period in sma_periods}
+        self.emas = {period: StreamingEMA(period) for period in ema_periods}
+        self.rsi = StreamingRSI(rsi_period)
+        self.bollinger = StreamingBollingerBands(bb_period, bb_std_dev)
+        self.bars_seen = 0
+        self.latest = {}
+
+    def update(self, bar):
+        """
+        Add a new bar and return the updated indicator values
+
+        Args:
+            bar (dict | pd.Series | float): OHLCV bar with a 'close' field, or a close price
+
+        Returns:
+            dict: Indicator values keyed by column name
+        """
+        close = float(bar) if np.isscalar(bar) else float(bar['close'])
+
+        values = {}
+        for period, sma in self.smas.items():
+            values[f'sma_{period}'] = sma.update(close)
+        for period, ema in self.emas.items():
+            values[f'ema_{period}'] = ema.update(close)
+        values['rsi'] = self.rsi.update(close)
+        bb_upper, bb_middle, bb_lower = self.bollinger.update(close)
+        values['bb_upper'] = bb_upper
+        values['bb_middle'] = bb_middle
+        values['bb_lower'] = bb_lower
+
+        self.bars_seen += 1
+        self.latest = values
+        return values
+
+    def warm_up(self, df):
+        """
+        Replay historical bars to bring the indicators up to date
+
+        Args:
+            df (pd.DataFrame): OHLCV data in chronological order
+
+        Returns:
+            dict: Indicator values after the last bar
+        """
+        for close in df['close'].to_numpy(dtype=float):
+            self.update(close)
+        return self.latest
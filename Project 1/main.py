@@ -60,15 +60,20 @@ def main():
     bot = TradingBot()
     
     try:
-        # Run complete analysis
-        results = bot.run_analysis()
-        
-        if results is None:
-            print("❌ Analysis failed. Please check your configuration and try again.")
-            return
-        
-        # Print exchange information
-        bot.print_exchange_info()
+        try:
+            # Run complete analysis
+            results = bot.run_analysis()
+            
+            if results is None:
+                print("❌ Analysis failed. Please check your configuration and try again.")
+                return
+            
+            # Print exchange information
+            bot.print_exchange_info()
+        finally:
+            # Write the stage timings report (when PROFILE_PIPELINE is enabled) and stop
+            # tracemalloc/cProfile, also when the analysis ended early
+            bot.finish_profiling()
         
         print("\n" + "="*80)
         print("🎉 Trading Bot Analysis Complete!")
@@ -114,26 +119,55 @@ def run_demo():
         bot = TradingBot()
         bot.data = demo_data
         
-        # Process demo data
-        bot.process_data()
-        
-        # Generate charts
-        chart_paths = bot.generate_charts()
-        
-        # Display results
-        bot.print_latest_signals()
-        bot.print_signal_summary()
-        
-        print(f"\n📊 Generated {len(chart_paths)} demo charts:")
-        for path in chart_paths:
-            print(f"   📁 {path}")
+        try:
+            # Process demo data
+            bot.process_data()
+            
+            # Generate charts
+            chart_paths = bot.generate_charts()
+            
+            # Display results
+            bot.print_latest_signals()
+            bot.print_signal_summary()
+            
+            print(f"\n📊 Generated {len(chart_paths)} demo charts:")
+            for path in chart_paths:
+                print(f"   📁 {path}")
+        finally:
+            # Charts queued on the pool finish before it is shut down
+            bot.shutdown()
             
     except ImportError:
         print("❌ Demo mode not available. Please install all dependencies.")
 
+def run_service():
+    """Run the bot as a long-running service that reacts to every candle close"""
+    print_banner()
+    print_config()
+    
+    from trading_service import TradingService
+    
+    service = TradingService()
+    service.run()
+
+def run_universe():
+    """Analyze every symbol in SYMBOLS on every timeframe in TIMEFRAMES"""
+    print_banner()
+    print_config()
+    
+    bot = TradingBot()
+    try:
+        bot.run_universe()
+    finally:
+        bot.finish_profiling()
+
 if __name__ == "__main__":
-    # Check if running in demo mode
+    # Check if running in demo or service mode
     if len(sys.argv) > 1 and sys.argv[1] == "--demo":
         run_demo()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        run_service()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--universe":
+        run_universe()
     else:
         main() 
\ No newline at end of file
@@ -0,0 +1,207 @@
+import os
+import copy
+import json
+import time
+import threading
+from config import MARKET_CACHE_PATH, MARKET_CACHE_TTL, TICKER_CACHE_TTL
+
+
+class MarketCache:
+    """
+    Shared cache for exchange market metadata and tickers
+
+    Markets (the `load_markets()` payload) are kept in memory and persisted
+    to one JSON file per exchange, so later runs start without downloading
+    them again. Entries older than `ttl` are still served while a background
+    thread refreshes them (stale-while-revalidate). ccxt clients are not
+    thread-safe, so background refreshes download through their own client
+    rather than the one the caller is fetching with. Tickers are cached in
+    memory only, with a much shorter TTL.
+    """
+
+    def __init__(self, path=MARKET_CACHE_PATH, ttl=MARKET_CACHE_TTL, ticker_ttl=TICKER_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.ticker_ttl = ticker_ttl
+        self._markets = {}
+        self._tickers = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresh_thread = None
+
+    def _cache_file(self, exchange_name):
+        return os.path.join(self.path, f'{exchange_name}_markets.json')
+
+    def _read_disk(self, exchange_name):
+        """Load a persisted markets entry, or None if missing or unreadable"""
+        try:
+            with open(self._cache_file(exchange_name), 'r') as f:
+                entry = json.load(f)
+            return entry if 'timestamp' in entry and 'markets' in entry else None
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, exchange_name, entry):
+        """Persist a markets entry atomically"""
+        target = self._cache_file(exchange_name)
+        tmp_path = target + '.tmp'
+        os.makedirs(self.path, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, target)
+
+    def _is_fresh(self, entry):
+        return time.time() - entry['timestamp'] < self.ttl
+
+    def refresh_markets(self, exchange_name, exchange):
+        """
+        Download markets from the exchange and update memory and disk
+
+        Args:
+            exchange_name (str): Name of the exchange
+            exchange (ccxt.Exchange): Exchange client
+
+        Returns:
+            dict: Markets keyed by symbol
+        """
+        markets = exchange.load_markets(reload=True)
+        entry = {'timestamp': time.time(), 'markets': markets}
+        with self._lock:
+            self._markets[exchange_name] = entry
+        try:
+            self._write_disk(exchange_name, entry)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"✗ Could not persist markets for {exchange_name}: {str(e)}")
+        return markets
+
+    @staticmethod
+    def _background_client(exchange):
+        """A separate client for the same exchange and endpoints, for use off the caller's thread"""
+        client = exchange.__class__({
+            'apiKey': exchange.apiKey,
+            'secret': exchange.secret,
+            'enableRateLimit': exchange.enableRateLimit,
+            'timeout': exchange.timeout,
+        })
+        client.urls = copy.deepcopy(exchange.urls)
+        return client
+
+    def _refresh_in_background(self, exchange_name, exchange):
+        """Start one refresh thread per exchange unless one is already running"""
+        with self._lock:
+            if exchange_name in self._refreshing:
+                return
+            self._refreshing.add(exchange_name)
+
+        def refresh():
+            try:
+                self.refresh_markets(exchange_name, self._background_client(exchange))
+            except Exception as e:
+                print(f"✗ Background market refresh failed for {exchange_name}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(exchange_name)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_markets(self, exchange_name, exchange):
+        """
+        Get markets for an exchange, downloading them only when nothing is cached
+
+        Cached markets are also installed on the exchange client so ccxt does
+        not load them again on the next request.
+
+        Args:
+            exchange_name (str): Name of the exchange
+            exchange (ccxt.Exchange): Exchange client
+
+        Returns:
+            dict: Markets keyed by symbol
+        """
+        with self._lock:
+            entry = self._markets.get(exchange_name)
+
+        if entry is None:
+            entry = self._read_disk(exchange_name)
+            if entry is None:
+                return self.refresh_markets(exchange_name, exchange)
+            with self._lock:
+                self._markets[exchange_name] = entry
+
+        if not getattr(exchange, 'markets', None):
+            try:
+                exchange.set_markets(entry['markets'])
+            except Exception:
+                pass
+
+        if not self._is_fresh(entry):
+            self._refresh_in_background(exchange_name, exchange)
+        return entry['markets']
+
+    def get_symbols(self, exchange_name, exchange):
+        """
+        Get the list of symbols traded on an exchange
+
+        Returns:
+            list: Market symbols
+        """
+        return list(self.get_markets(exchange_name, exchange).keys())
+
+    def get_ticker(self, exchange_name, exchange, symbol):
+        """
+        Get a ticker, reusing one fetched within the last `ticker_ttl` seconds
+
+        Args:
+            exchange_name (str): Name of the exchange
+            exchange (ccxt.Exchange): Exchange client
+            symbol (str): Trading pair symbol
+
+        Returns:
+            dict: ccxt ticker
+        """
+        key = (exchange_name, symbol)
+        with self._lock:
+            cached = self._tickers.get(key)
+        if cached is not None and time.time() - cached[0] < self.ticker_ttl:
+            return cached[1]
+
+        ticker = exchange.fetch_ticker(symbol)
+        with self._lock:
+            self._tickers[key] = (time.time(), ticker)
+        return ticker
+
+    def start_background_refresh(self, exchanges, interval=None):
+        """
+        Periodically refresh markets for long-running processes
+
+        Args:
+            exchanges (dict): Exchange name -> exchange client
+            interval (float): Seconds between refreshes (defaults to the TTL)
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+
+        interval = interval or self.ttl
+        self._stop.clear()
+
+        def loop():
+            clients = {}
+            while not self._stop.wait(interval):
+                for exchange_name, exchange in list(exchanges.items()):
+                    try:
+                        if exchange_name not in clients:
+                            clients[exchange_name] = self._background_client(exchange)
+                        self.refresh_markets(exchange_name, clients[exchange_name])
+                    except Exception as e:
+                        print(f"✗ Market refresh failed for {exchange_name}: {str(e)}")
+
+        self._refresh_thread = threading.Thread(target=loop, daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self):
+        """Stop the periodic refresh thread"""
+        self._stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=1)
+            self._refresh_thread = None
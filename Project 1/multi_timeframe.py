@@ -0,0 +1,172 @@
+import ccxt
+import numpy as np
+import pandas as pd
+from indicators import calculate_sma, calculate_ema, calculate_rsi, calculate_bollinger_bands
+from config import SMA_PERIODS, EMA_PERIODS
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Exchanges start weekly candles on Monday; the Unix epoch was a Thursday
+WEEK_ORIGIN = pd.Timestamp('1970-01-05')
+
+
+def timeframe_seconds(timeframe):
+    """Length of a ccxt timeframe string ('15m', '4h', '1d', ...) in seconds"""
+    return ccxt.Exchange.parse_timeframe(timeframe)
+
+
+def base_timeframe(timeframes):
+    """Shortest timeframe of a set, the one that is actually fetched"""
+    return min(timeframes, key=timeframe_seconds)
+
+
+def resample_panel(index, values, timeframe, base):
+    """
+    Aggregate a panel of candles into a higher timeframe
+
+    Buckets are aligned the way exchanges align candles (to the epoch, with
+    weeks starting on Monday). Buckets that do not contain every base candle
+    (the leading bucket of a series that starts mid-bucket, the trailing
+    bucket that is still filling up, and buckets straddling a gap in the
+    data) are dropped, so derived candles are never partial.
+
+    Args:
+        index (pd.DatetimeIndex): Base candle open times shared by every series
+        values (np.ndarray): (series, bars, 5) OHLCV block
+        timeframe (str): Target timeframe
+        base (str): Timeframe of the input candles
+
+    Returns:
+        tuple: (DatetimeIndex of bucket open times, (series, buckets, 5) OHLCV block)
+    """
+    bucket = pd.Timedelta(seconds=timeframe_seconds(timeframe))
+    if bucket == pd.Timedelta(seconds=timeframe_seconds(base)):
+        return index, values
+
+    origin = WEEK_ORIGIN if timeframe.endswith('w') else pd.Timestamp(0)
+    bucket_ids = (index - origin) // bucket
+    bucket_ids = np.asarray(bucket_ids, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+
+    if len(starts) == 0:
+        return index[:0], values[:, :0]
+
+    ends = np.r_[starts[1:], values.shape[1]] - 1
+    resampled = np.empty((values.shape[0], len(starts), 5))
+    resampled[..., 0] = values[:, starts, 0]
+    resampled[..., 1] = np.maximum.reduceat(values[..., 1], starts, axis=1)
+    resampled[..., 2] = np.minimum.reduceat(values[..., 2], starts, axis=1)
+    resampled[..., 3] = values[:, ends, 3]
+    resampled[..., 4] = np.add.reduceat(values[..., 4], starts, axis=1)
+
+    # Keep only buckets holding every base candle
+    candles_per_bucket = int(bucket / pd.Timedelta(seconds=timeframe_seconds(base)))
+    complete = np.diff(np.r_[starts, values.shape[1]]) >= candles_per_bucket
+
+    bucket_index = pd.DatetimeIndex(origin + bucket * bucket_ids[starts[complete]], name=index.name)
+    return bucket_index, resampled[:, complete]
+
+
+class MultiTimeframeEngine:
+    """
+    Indicators and signals for many (symbol, timeframe) pairs in batched passes
+
+    Series that share the same base candle timestamps are stacked into one
+    (series, bars, OHLCV) block. Every higher timeframe is aggregated from
+    that block with a single reduce per column, indicators are computed once
+    per (block, timeframe) with one column per series, and the compiled rule
+    set evaluates all series at once. The cost grows with the number of
+    distinct timelines and timeframes, not with the number of symbols.
+    """
+
+    def __init__(self, signal_generator, timeframes):
+        self.signal_generator = signal_generator
+        self.timeframes = sorted(timeframes, key=timeframe_seconds)
+        self.base = self.timeframes[0]
+
+    @staticmethod
+    def group_by_timeline(frames):
+        """
+        Stack series with identical timestamps into OHLCV blocks
+
+        Args:
+            frames (dict): key -> OHLCV DataFrame of base candles
+
+        Returns:
+            list: (keys, DatetimeIndex, (series, bars, 5) block) per distinct timeline
+        """
+        groups = {}
+        for key, df in frames.items():
+            if df is None or len(df) == 0:
+                continue
+            fingerprint = (len(df), df.index[0], df.index[-1])
+            for index, keys in groups.get(fingerprint, []):
+                if index.equals(df.index):
+                    keys.append(key)
+                    break
+            else:
+                groups.setdefault(fingerprint, []).append((df.index, [key]))
+
+        blocks = []
+        for entries in groups.values():
+            for index, keys in entries:
+                block = np.stack([frames[key][OHLCV_COLUMNS].to_numpy(dtype=np.float64) for key in keys])
+                blocks.append((keys, index, block))
+        return blocks
+
+    def indicators(self, index, close):
+        """
+        Compute every configured indicator for a block of series
+
+        Args:
+            index (pd.DatetimeIndex): Bar timestamps
+            close (np.ndarray): (series, bars) close prices
+
+        Returns:
+            dict: Indicator name -> (series, bars) array
+        """
+        prices = pd.DataFrame(close.T, index=index)
+        features = {}
+        for period in SMA_PERIODS:
+            features[f'sma_{period}'] = calculate_sma(prices, period).to_numpy().T
+        for period in EMA_PERIODS:
+            features[f'ema_{period}'] = calculate_ema(prices, period).to_numpy().T
+        features['rsi'] = calculate_rsi(prices).to_numpy().T
+        bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(prices)
+        features['bb_upper'] = bb_upper.to_numpy().T
+        features['bb_middle'] = bb_middle.to_numpy().T
+        features['bb_lower'] = bb_lower.to_numpy().T
+        return features
+
+    def run(self, frames):
+        """
+        Process every series on every timeframe
+
+        Args:
+            frames (dict): key -> OHLCV DataFrame of base-timeframe candles
+
+        Returns:
+            dict: (key, timeframe) -> DataFrame with OHLCV, indicators and signals,
+                the same columns process_data produces
+        """
+        rule_set = self.signal_generator.rule_set
+        results = {}
+
+        for keys, index, block in self.group_by_timeline(frames):
+            for timeframe in self.timeframes:
+                tf_index, tf_block = resample_panel(index, block, timeframe, self.base)
+                if len(tf_index) == 0:
+                    continue
+
+                features = {column: tf_block[..., i] for i, column in enumerate(OHLCV_COLUMNS)}
+                features.update(self.indicators(tf_index, features['close']))
+                features.update(rule_set.evaluate_arrays(features))
+
+                for row, key in enumerate(keys):
+                    columns = {}
+                    for column, values in features.items():
+                        values = values[row]
+                        columns[column] = values.astype(np.int64) if values.dtype == np.int8 else values
+                    results[(key, timeframe)] = pd.DataFrame(columns, index=tf_index)
+
+        return results
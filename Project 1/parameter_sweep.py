@@ -0,0 +1,226 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from config import SWEEP_HORIZON, SWEEP_WORKERS, SWEEP_CHUNK
+
+# Arrays shared with sweep workers, set once per process by _init_sweep_worker
+_SWEEP_STATE = {}
+
+
+def sma_from_cumsum(cumsum, period):
+    """
+    Simple moving average from a precomputed cumulative sum
+
+    Args:
+        cumsum (np.ndarray): Cumulative sum of closes with a leading 0 (length n + 1)
+        period (int): Window length
+
+    Returns:
+        np.ndarray: SMA with NaN for the first period - 1 bars
+    """
+    sma = np.full(len(cumsum) - 1, np.nan)
+    sma[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+    return sma
+
+
+def _init_sweep_worker(state):
+    """Keep the shared precomputation for every task handled by this process"""
+    _SWEEP_STATE.clear()
+    _SWEEP_STATE.update(state)
+
+
+def _moving_average(state, period):
+    """Look up one moving average from the shared precomputation"""
+    if state['ma_type'] == 'sma':
+        return sma_from_cumsum(state['cumsum'], period)
+    return state['ema_bank'][state['ema_rows'][period]]
+
+
+def _evaluate_pairs(pairs, state=None):
+    """
+    Evaluate a block of (short, long) pairs for every threshold
+
+    Args:
+        pairs (list): (short, long) period pairs
+        state (dict): Shared precomputation (defaults to the worker state)
+
+    Returns:
+        list: One result row per (pair, threshold)
+    """
+    state = state if state is not None else _SWEEP_STATE
+    thresholds = state['thresholds']
+    forward = state['forward']
+    valid = ~np.isnan(forward)
+    forward = np.where(valid, forward, 0.0)
+
+    fast = np.stack([_moving_average(state, short) for short, _ in pairs])
+    slow = np.stack([_moving_average(state, long) for _, long in pairs])
+
+    # Crossovers for every pair at once, same semantics as the 'crossover' rule
+    above, below = fast > slow, fast < slow
+    cross = np.zeros(fast.shape, dtype=np.int8)
+    cross[:, 1:][above[:, 1:] & (fast[:, :-1] <= slow[:, :-1])] = 1
+    cross[:, 1:][below[:, 1:] & (fast[:, :-1] >= slow[:, :-1])] = -1
+
+    combined = (state['base'] + state['weight'] * cross) / state['total_weight']
+
+    # Threshold axis is broadcast: (thresholds, pairs, bars)
+    limits = thresholds[:, None, None]
+    buys = (combined >= limits) & valid
+    sells = (combined <= -limits) & valid
+
+    buy_counts = buys.sum(axis=-1)
+    sell_counts = sells.sum(axis=-1)
+    buy_returns = buys.astype(np.float64) @ forward
+    sell_returns = -(sells.astype(np.float64) @ forward)
+    wins = (buys.astype(np.float64) @ (forward > 0)) + (sells.astype(np.float64) @ (forward < 0))
+    crossovers = np.count_nonzero(cross, axis=-1)
+
+    rows = []
+    for t, threshold in enumerate(thresholds):
+        for p, (short, long) in enumerate(pairs):
+            n_buys, n_sells = int(buy_counts[t, p]), int(sell_counts[t, p])
+            n_signals = n_buys + n_sells
+            rows.append({
+                'ma_type': state['ma_type'],
+                'short': short,
+                'long': long,
+                'threshold': float(threshold),
+                'crossovers': int(crossovers[p]),
+                'buy_signals': n_buys,
+                'sell_signals': n_sells,
+                'avg_buy_return': buy_returns[t, p] / n_buys if n_buys else np.nan,
+                'avg_sell_return': sell_returns[t, p] / n_sells if n_sells else np.nan,
+                'avg_signal_return': (buy_returns[t, p] + sell_returns[t, p]) / n_signals if n_signals else np.nan,
+                'hit_rate': wins[t, p] / n_signals if n_signals else np.nan,
+            })
+    return rows
+
+
+class ParameterSweep:
+    """
+    Evaluate many moving-average crossover settings over one price history
+
+    One crossover rule of the signal generator (e.g. 'sma_signal') is
+    replaced by every (short, long) pair in turn, while the other rules stay
+    as configured. For each pair and threshold the final signal is counted
+    and scored by the forward return over `horizon` bars (sells score the
+    negated return).
+
+    Shared work is done once: a cumulative sum of closes serves every SMA
+    window, EMAs come from a bank computed once per period, and the
+    remaining rules are evaluated a single time. Pairs are split into blocks
+    spread over a process pool; thresholds are a broadcast axis within each
+    block.
+    """
+
+    def __init__(self, signal_generator, df, horizon=SWEEP_HORIZON, workers=SWEEP_WORKERS,
+                 chunk_size=SWEEP_CHUNK):
+        self.signal_generator = signal_generator
+        self.df = df
+        self.horizon = horizon
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        close = df['close'].to_numpy(dtype=np.float64)
+        self.close = close
+        self.cumsum = np.concatenate(([0.0], np.cumsum(close)))
+        self.forward = np.full(len(close), np.nan)
+        self.forward[:-horizon] = close[horizon:] / close[:-horizon] - 1
+
+    def _base_signal(self, rule_name):
+        """
+        Weighted sum of every rule except the swept one
+
+        Returns:
+            tuple: (base, weight of the swept rule, total weight)
+        """
+        rule_set = self.signal_generator.rule_set
+        others = [rule for rule in rule_set.rules if rule['name'] != rule_name]
+        swept = [rule for rule in rule_set.rules if rule['name'] == rule_name]
+        weight = swept[0].get('weight', 1.0) if swept else 1.0
+        total_weight = sum(rule.get('weight', 1.0) for rule in others) + weight
+
+        base = np.zeros(len(self.close))
+        if others:
+            indicators = self.signal_generator.calculate_indicators(self.df[['open', 'high', 'low', 'close', 'volume']].copy())
+            signals = type(rule_set)(others, rule_set.threshold).evaluate_frame(indicators)
+            for rule in others:
+                base += rule.get('weight', 1.0) * signals[rule['name']]
+        return base, weight, total_weight
+
+    def run(self, short_periods, long_periods, thresholds, ma_type='sma', rule_name=None):
+        """
+        Evaluate every combination and rank them
+
+        Args:
+            short_periods (iterable): Fast moving-average periods
+            long_periods (iterable): Slow moving-average periods (pairs with short >= long are skipped)
+            thresholds (iterable): Thresholds applied to the combined signal
+            ma_type (str): 'sma' or 'ema'
+            rule_name (str): Rule replaced by the swept crossover (defaults to '<ma_type>_signal')
+
+        Returns:
+            pd.DataFrame: One row per (short, long, threshold), best average signal return first
+        """
+        if ma_type not in ('sma', 'ema'):
+            raise ValueError(f"Unknown moving average type '{ma_type}'")
+
+        pairs = [(int(short), int(long)) for short in short_periods for long in long_periods if short < long]
+        if not pairs:
+            return pd.DataFrame()
+
+        base, weight, total_weight = self._base_signal(rule_name or f'{ma_type}_signal')
+        state = {
+            'ma_type': ma_type,
+            'thresholds': np.asarray(list(thresholds), dtype=np.float64),
+            'forward': self.forward,
+            'base': base,
+            'weight': weight,
+            'total_weight': total_weight,
+            'cumsum': self.cumsum,
+        }
+
+        if ma_type == 'ema':
+            # One EMA per distinct period, shared by every pair that uses it
+            periods = sorted({period for pair in pairs for period in pair})
+            close = pd.Series(self.close)
+            state['ema_bank'] = np.stack([close.ewm(span=period, adjust=False).mean().to_numpy()
+                                          for period in periods])
+            state['ema_rows'] = {period: row for row, period in enumerate(periods)}
+
+        blocks = [pairs[i:i + self.chunk_size] for i in range(0, len(pairs), self.chunk_size)]
+        rows = []
+        if self.workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_sweep_worker,
+                                     initargs=(state,)) as pool:
+                for block_rows in pool.map(_evaluate_pairs, blocks):
+                    rows.extend(block_rows)
+        else:
+            for block in blocks:
+                rows.extend(_evaluate_pairs(block, state))
+
+        results = pd.DataFrame(rows)
+        results = results.sort_values(['avg_signal_return', 'hit_rate'], ascending=False, na_position='last')
+        results.insert(0, 'rank', np.arange(1, len(results) + 1))
+        return results.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import time
+    from demo_data import generate_synthetic_market
+    from signal_generator import SignalGenerator
+
+    # Sweep SMA and EMA crossovers over a year of 5-minute candles
+    market = generate_synthetic_market(n_bars=100_000, exchanges=['demo'], timeframe='5m', seed=7)
+    df = market['demo']['BTC/USDT']
+    generator = SignalGenerator()
+
+    for ma_type in ('sma', 'ema'):
+        start = time.perf_counter()
+        results = generator.sweep_parameters(df, range(5, 55, 5), range(20, 210, 10),
+                                             [0.001, 0.25, 0.5], ma_type=ma_type)
+        elapsed = time.perf_counter() - start
+        print(f"\n{ma_type.upper()} sweep: {len(results)} combinations over {len(df):,} bars in {elapsed:.2f}s")
+        print(results.head(10).to_string(index=False))
@@ -0,0 +1,233 @@
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+import numpy as np
+from contextlib import contextmanager
+from datetime import datetime
+from config import PROFILE_PIPELINE, PROFILE_CAPTURE, PROFILE_REPORT_PATH, PROFILE_HISTORY
+
+
+class PipelineProfiler:
+    """
+    Stage-level instrumentation for the trading pipeline
+
+    Records wall time per stage (fetch, indicators, signals, charts or, with
+    the chart pool, charts_wait, exchange_info) and per exchange, plus
+    counters such as rows processed and bytes downloaded. Finished runs are
+    appended to a JSON report that also holds latency percentiles over the
+    stored history, so regressions show up across runs. Optionally captures
+    a cProfile or tracemalloc snapshot of the whole run.
+
+    When disabled every method is a cheap no-op.
+    """
+
+    def __init__(self, enabled=PROFILE_PIPELINE, capture=PROFILE_CAPTURE,
+                 report_path=PROFILE_REPORT_PATH, history=PROFILE_HISTORY):
+        self.enabled = enabled
+        self.capture = capture
+        self.report_path = report_path
+        self.history = history
+        self.timings = {}
+        self.counters = {}
+        self.started = None
+        self._profile = None
+
+    def start_run(self):
+        """Reset measurements and start the optional capture"""
+        if not self.enabled:
+            return
+        self.timings = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+
+        if self.capture == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.capture == 'tracemalloc':
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, exchange=None):
+        """
+        Time a block of code
+
+        Args:
+            name (str): Stage name
+            exchange (str): Exchange the work belongs to (optional)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stage = self.timings.setdefault(name, {'total': 0.0, 'exchanges': {}})
+            stage['total'] += elapsed
+            if exchange is not None:
+                stage['exchanges'][exchange] = stage['exchanges'].get(exchange, 0.0) + elapsed
+
+    def count(self, name, value, exchange=None):
+        """
+        Add to a counter
+
+        Args:
+            name (str): Counter name, e.g. 'rows' or 'bytes_downloaded'
+            value (int): Amount to add
+            exchange (str): Exchange the count belongs to (optional)
+        """
+        if not self.enabled:
+            return
+        counter = self.counters.setdefault(name, {'total': 0, 'exchanges': {}})
+        counter['total'] += value
+        if exchange is not None:
+            counter['exchanges'][exchange] = counter['exchanges'].get(exchange, 0) + value
+
+    def instrument_exchange(self, exchange_name, exchange):
+        """
+        Count the bytes of every HTTP response a ccxt client receives
+
+        Wraps the client's response handler, which ccxt calls once per
+        request in both the sync and async clients, so paged fetches and
+        backfills are counted in full and failed requests are not counted
+        twice.
+
+        Args:
+            exchange_name (str): Name the bytes are counted under
+            exchange (ccxt.Exchange): Sync or async exchange client
+        """
+        if not self.enabled or getattr(exchange, '_profiler_instrumented', False):
+            return
+        on_rest_response = exchange.on_rest_response
+
+        def counting_on_rest_response(code, reason, url, method, response_headers, response_body, *args):
+            if response_body:
+                size = len(response_body.encode() if isinstance(response_body, str) else response_body)
+                self.count('bytes_downloaded', size, exchange_name)
+            return on_rest_response(code, reason, url, method, response_headers, response_body, *args)
+
+        exchange.on_rest_response = counting_on_rest_response
+        exchange._profiler_instrumented = True
+
+    def _stop_capture(self):
+        """Stop the optional capture and summarize it"""
+        if self.capture == 'cprofile' and self._profile is not None:
+            self._profile.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream).sort_stats('cumulative')
+            stats.print_stats(20)
+            profile_path = os.path.splitext(self.report_path)[0] + '.prof'
+            stats.dump_stats(profile_path)
+            self._profile = None
+            return {'type': 'cprofile', 'stats_file': profile_path, 'top': stream.getvalue()}
+
+        if self.capture == 'tracemalloc' and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            top = snapshot.statistics('lineno')[:10]
+            return {
+                'type': 'tracemalloc',
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top': [{'location': str(stat.traceback), 'bytes': stat.size} for stat in top],
+            }
+
+        return None
+
+    def finish_run(self):
+        """
+        Close the run, append it to the JSON report and return the report
+
+        Returns:
+            dict: Report with the stored runs and percentiles, or None if disabled
+        """
+        if not self.enabled or self.started is None:
+            return None
+
+        run = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'total': time.perf_counter() - self.started,
+            'stages': self.timings,
+            'counters': self.counters,
+        }
+        capture = self._stop_capture()
+        if capture is not None:
+            run['capture'] = capture
+        self.started = None
+
+        report = self.load_report()
+        report['runs'] = (report['runs'] + [run])[-self.history:]
+        report['percentiles'] = self.percentiles(report['runs'])
+
+        os.makedirs(os.path.dirname(self.report_path) or '.', exist_ok=True)
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def load_report(self):
+        """Load the stored report, or an empty one"""
+        try:
+            with open(self.report_path, 'r') as f:
+                report = json.load(f)
+            if isinstance(report.get('runs'), list):
+                return report
+        except (OSError, ValueError):
+            pass
+        return {'runs': []}
+
+    @staticmethod
+    def percentiles(runs):
+        """
+        Latency percentiles per stage over a list of runs
+
+        Args:
+            runs (list): Runs as stored in the report
+
+        Returns:
+            dict: {stage: {'p50', 'p95', 'p99', 'max', 'samples'}} including 'total'
+        """
+        samples = {'total': [run['total'] for run in runs]}
+        for run in runs:
+            for name, stage in run['stages'].items():
+                samples.setdefault(name, []).append(stage['total'])
+
+        result = {}
+        for name, values in samples.items():
+            values = np.asarray(values)
+            result[name] = {
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'p99': float(np.percentile(values, 99)),
+                'max': float(values.max()),
+                'samples': len(values),
+            }
+        return result
+
+    def print_report(self, report):
+        """Print the latest run and the percentiles over stored runs"""
+        if not report:
+            return
+
+        run = report['runs'][-1]
+        print("\n" + "="*80)
+        print("⏱️  PIPELINE PROFILE")
+        print("="*80)
+        print(f"   Total: {run['total']:.3f}s")
+        for name, stage in run['stages'].items():
+            percentiles = report['percentiles'][name]
+            per_exchange = ", ".join(f"{ex} {t:.3f}s" for ex, t in stage['exchanges'].items())
+            print(f"   {name:<14} {stage['total']:.3f}s  "
+                  f"(p50 {percentiles['p50']:.3f}s, p95 {percentiles['p95']:.3f}s over "
+                  f"{percentiles['samples']} runs){'  ' + per_exchange if per_exchange else ''}")
+        for name, counter in run['counters'].items():
+            print(f"   {name:<14} {counter['total']:,}")
+        if 'capture' in run:
+            print(f"   Capture: {run['capture']['type']}")
+        print(f"   Report: {os.path.abspath(self.report_path)}")
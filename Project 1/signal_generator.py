@@ -1,11 +1,15 @@
 import pandas as pd
 import numpy as np
-from indicators import calculate_sma, calculate_ema, detect_crossover, calculate_rsi, calculate_bollinger_bands
-from config import SMA_PERIODS, EMA_PERIODS, SIGNAL_THRESHOLD
+from indicators import calculate_sma, calculate_ema, calculate_rsi, calculate_bollinger_bands, StreamingIndicators
+from signal_rules import SignalRuleSet
+from config import SMA_PERIODS, EMA_PERIODS, SIGNAL_THRESHOLD, SIGNAL_RULES, SWEEP_HORIZON, SWEEP_WORKERS
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
 
 class SignalGenerator:
-    def __init__(self):
+    def __init__(self, rules=SIGNAL_RULES, threshold=SIGNAL_THRESHOLD):
         self.signals = []
+        self.rule_set = SignalRuleSet(rules, threshold)
     
     def calculate_indicators(self, df):
         """
@@ -36,51 +40,103 @@ class SignalGenerator:
         
         return df
     
-    def generate_signals(self, df):
+    def indicator_columns(self):
+        """Names of the indicator columns added by calculate_indicators, in order"""
+        return ([f'sma_{period}' for period in SMA_PERIODS] +
+                [f'ema_{period}' for period in EMA_PERIODS] +
+                ['rsi', 'bb_upper', 'bb_middle', 'bb_lower'])
+    
+    def calculate_indicators_compact(self, df):
+        """
+        Calculate all indicators into one preallocated float32 block
+        
+        Indicator columns share a single float32 array that the returned
+        DataFrame wraps without copying; OHLCV stays float64 so prices keep
+        full precision. Indicators are computed in float64 one at a time and
+        written into their column, so the only full-size allocation besides
+        the candles is the block itself.
+        
+        Args:
+            df (pd.DataFrame): OHLCV data (not modified)
+        
+        Returns:
+            pd.DataFrame: float64 OHLCV columns followed by float32 indicator columns
+        """
+        columns = self.indicator_columns()
+        block = np.empty((len(df), len(columns)), dtype=np.float32)
+        
+        close = df['close'].astype(np.float64)
+        position = 0
+        for period in SMA_PERIODS:
+            block[:, position] = calculate_sma(close, period).to_numpy()
+            position += 1
+        for period in EMA_PERIODS:
+            block[:, position] = calculate_ema(close, period).to_numpy()
+            position += 1
+        block[:, position] = calculate_rsi(close).to_numpy()
+        for band in calculate_bollinger_bands(close):
+            position += 1
+            block[:, position] = band.to_numpy()
+        
+        indicators = pd.DataFrame(block, index=df.index, columns=columns, copy=False)
+        return pd.concat([df[OHLCV_COLUMNS].astype(np.float64), indicators], axis=1)
+    
+    def create_streaming_indicators(self, df=None):
+        """
+        Create an incremental indicator engine using the configured periods
+        
+        Args:
+            df (pd.DataFrame): Optional OHLCV history to warm the engine up with
+        
+        Returns:
+            StreamingIndicators: Engine that updates all indicators one bar at a time
+        """
+        engine = StreamingIndicators(SMA_PERIODS, EMA_PERIODS)
+        if df is not None and len(df) > 0:
+            engine.warm_up(df)
+        return engine
+    
+    def sweep_parameters(self, df, short_periods, long_periods, thresholds, ma_type='sma',
+                         horizon=SWEEP_HORIZON, workers=SWEEP_WORKERS):
+        """
+        Rank moving-average crossover settings over an OHLCV history
+        
+        Args:
+            df (pd.DataFrame): OHLCV data
+            short_periods (iterable): Fast moving-average periods
+            long_periods (iterable): Slow moving-average periods
+            thresholds (iterable): Thresholds applied to the combined signal
+            ma_type (str): 'sma' or 'ema'
+            horizon (int): Bars ahead used to score each signal
+            workers (int): Processes to spread the sweep over (None uses every core)
+        
+        Returns:
+            pd.DataFrame: Signal counts and forward returns per combination, best first
+        """
+        from parameter_sweep import ParameterSweep
+        
+        sweep = ParameterSweep(self, df, horizon=horizon, workers=workers)
+        return sweep.run(short_periods, long_periods, thresholds, ma_type=ma_type)
+    
+    def generate_signals(self, df, compact=False):
         """
         Generate buy/sell signals based on technical indicators
         
+        Signal columns come from the compiled rule set (SIGNAL_RULES by default).
+        
         Args:
             df (pd.DataFrame): DataFrame with indicators
+            compact (bool): Store rule and final signals as int8 and the combined signal as float32
         
         Returns:
             pd.DataFrame: DataFrame with signals added
         """
-        # Initialize signal columns
-        df['sma_signal'] = 0
-        df['ema_signal'] = 0
-        df['rsi_signal'] = 0
-        df['bb_signal'] = 0
-        df['combined_signal'] = 0
-        
-        # SMA crossover signals
-        if len(SMA_PERIODS) >= 2:
-            short_sma = f'sma_{SMA_PERIODS[0]}'
-            long_sma = f'sma_{SMA_PERIODS[1]}'
-            df['sma_signal'] = detect_crossover(df[short_sma], df[long_sma])
-        
-        # EMA crossover signals
-        if len(EMA_PERIODS) >= 2:
-            short_ema = f'ema_{EMA_PERIODS[0]}'
-            long_ema = f'ema_{EMA_PERIODS[1]}'
-            df['ema_signal'] = detect_crossover(df[short_ema], df[long_ema])
-        
-        # RSI signals
-        df.loc[df['rsi'] < 30, 'rsi_signal'] = 1  # Oversold - buy signal
-        df.loc[df['rsi'] > 70, 'rsi_signal'] = -1  # Overbought - sell signal
-        
-        # Bollinger Bands signals
-        df.loc[df['close'] <= df['bb_lower'], 'bb_signal'] = 1  # Price at lower band - buy signal
-        df.loc[df['close'] >= df['bb_upper'], 'bb_signal'] = -1  # Price at upper band - sell signal
-        
-        # Combined signal (simple average of all signals)
-        signal_columns = ['sma_signal', 'ema_signal', 'rsi_signal', 'bb_signal']
-        df['combined_signal'] = df[signal_columns].mean(axis=1)
-        
-        # Apply threshold to combined signal
-        df.loc[df['combined_signal'] >= SIGNAL_THRESHOLD, 'final_signal'] = 1  # Buy
-        df.loc[df['combined_signal'] <= -SIGNAL_THRESHOLD, 'final_signal'] = -1  # Sell
-        df.loc[(df['combined_signal'] > -SIGNAL_THRESHOLD) & (df['combined_signal'] < SIGNAL_THRESHOLD), 'final_signal'] = 0  # Hold
+        # Evaluate every rule in one vectorized pass over the indicator arrays
+        for column, values in self.rule_set.evaluate_frame(df).items():
+            if compact:
+                df[column] = values.astype(np.float32 if column == 'combined_signal' else np.int8)
+            else:
+                df[column] = values if values.dtype == np.float64 else values.astype(np.int64)
         
         return df
     
@@ -99,14 +155,15 @@ class SignalGenerator:
         signals = {
             'timestamp': latest.name,
             'price': latest['close'],
-            'sma_signal': latest['sma_signal'],
-            'ema_signal': latest['ema_signal'],
-            'rsi_signal': latest['rsi_signal'],
-            'bb_signal': latest['bb_signal'],
+        }
+        # One entry per configured rule, in rule order
+        for name in self.rule_set.names:
+            signals[name] = latest[name]
+        signals.update({
             'combined_signal': latest['combined_signal'],
             'final_signal': latest['final_signal'],
             'recommendation': self._get_recommendation(latest['final_signal'])
-        }
+        })
         
         return signals
     
@@ -0,0 +1,203 @@
+import numpy as np
+
+# Condition kinds understood by the compiled evaluator
+COMPARISONS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+CROSSES = ('cross_above', 'cross_below')
+
+# Conditions gathered per NumPy call; bounds temporary memory for large rule sets
+RULE_CHUNK = 32
+
+
+def _rule_conditions(rule):
+    """
+    Translate one declarative rule into its (buy, sell) conditions
+
+    Each condition is a tuple (kind, left, right) where left/right are
+    column names or numeric constants.
+
+    Args:
+        rule (dict): Rule definition, see SignalRuleSet
+
+    Returns:
+        tuple: (buy_condition, sell_condition), or None for a rule that never fires
+    """
+    rule_type = rule['type']
+
+    if rule_type == 'hold':
+        return None
+
+    if rule_type == 'crossover':
+        return (('cross_above', rule['fast'], rule['slow']),
+                ('cross_below', rule['fast'], rule['slow']))
+
+    if rule_type == 'threshold':
+        return (('<', rule['column'], rule['buy_below']),
+                ('>', rule['column'], rule['sell_above']))
+
+    if rule_type == 'band':
+        return (('<=', rule['column'], rule['lower']),
+                ('>=', rule['column'], rule['upper']))
+
+    if rule_type == 'compare':
+        return (tuple(rule['buy']), tuple(rule['sell']))
+
+    raise ValueError(f"Unknown rule type '{rule_type}' in rule {rule.get('name')}")
+
+
+class SignalRuleSet:
+    """
+    Declarative signal rules compiled into a single vectorized evaluation
+
+    Each rule produces a signal column of 1 (buy), -1 (sell) or 0 (hold).
+    Supported rule types:
+
+        {'name': 'sma_signal', 'type': 'crossover', 'fast': 'sma_20', 'slow': 'sma_50'}
+        {'name': 'rsi_signal', 'type': 'threshold', 'column': 'rsi', 'buy_below': 30, 'sell_above': 70}
+        {'name': 'bb_signal', 'type': 'band', 'column': 'close', 'lower': 'bb_lower', 'upper': 'bb_upper'}
+        {'name': 'custom', 'type': 'compare', 'buy': ('<', 'close', 'sma_50'), 'sell': ('>', 'rsi', 80)}
+        {'name': 'sma_signal', 'type': 'hold'}  # Always 0, still counts in the combined signal
+
+    Every rule takes an optional 'weight' (default 1). The combined signal is
+    the weighted mean of the rule signals and the final signal applies the
+    threshold to it. When a bar meets both conditions of a rule, sell wins.
+
+    Compilation resolves all referenced columns to row indices of one
+    contiguous feature block, so evaluation is a handful of NumPy operations
+    regardless of the number of rules, and works on arrays with any number
+    of leading dimensions (e.g. symbols x bars).
+    """
+
+    def __init__(self, rules, threshold):
+        self.rules = list(rules)
+        self.threshold = threshold
+        self.names = [rule['name'] for rule in self.rules]
+        self.weights = np.array([rule.get('weight', 1.0) for rule in self.rules], dtype=np.float64)
+        self._compile()
+
+    def _compile(self):
+        """Resolve conditions into index arrays over the feature block"""
+        conditions = []
+        self.active = []
+        for position, rule in enumerate(self.rules):
+            rule_conditions = _rule_conditions(rule)
+            if rule_conditions is not None:
+                conditions.extend(rule_conditions)
+                self.active.append(position)
+        self.active = np.array(self.active, dtype=np.intp)
+        # Buy conditions first, then sell conditions, in rule order
+        conditions = conditions[0::2] + conditions[1::2]
+
+        self.features = []
+        self.constants = []
+        operands = []
+        for kind, left, right in conditions:
+            if kind not in COMPARISONS and kind not in CROSSES:
+                raise ValueError(f"Unknown condition '{kind}'")
+            operands.append((self._operand(left), self._operand(right)))
+
+        # Group conditions that share an operation so each group is one NumPy call
+        self.n_conditions = len(conditions)
+        groups = {}
+        for position, ((kind, _, _), (left, right)) in enumerate(zip(conditions, operands)):
+            if left[0] != 'feature':
+                raise ValueError(f"Left operand of '{kind}' must be a column name")
+            key = (kind, right[0] == 'constant')
+            groups.setdefault(key, ([], [], []))
+            groups[key][0].append(position)
+            groups[key][1].append(left[1])
+            groups[key][2].append(right[1])
+
+        self.groups = [(kind, constant_rhs, np.array(positions, dtype=np.intp),
+                        np.array(lefts, dtype=np.intp), np.array(rights, dtype=np.intp))
+                       for (kind, constant_rhs), (positions, lefts, rights) in groups.items()]
+
+        # Columns read on evaluation; 'close' only gives the shape when no rule reads a column
+        self.inputs = self.features or ['close']
+
+    def _operand(self, ref):
+        """Register a column name or constant and return where it lives"""
+        if isinstance(ref, str):
+            if ref not in self.features:
+                self.features.append(ref)
+            return ('feature', self.features.index(ref))
+        self.constants.append(float(ref))
+        return ('constant', len(self.constants) - 1)
+
+    def evaluate_arrays(self, features):
+        """
+        Evaluate all rules in one pass
+
+        Args:
+            features (dict): Column name -> array of shape (..., n_bars)
+
+        Returns:
+            dict: Rule signal arrays (int8), 'combined_signal' and 'final_signal' (float64)
+        """
+        block = np.stack([np.asarray(features[name], dtype=np.float64) for name in self.inputs])
+        shape = block.shape[1:]
+        constants = np.array(self.constants, dtype=np.float64).reshape((-1,) + (1,) * len(shape))
+
+        # Conditions are evaluated in chunks to bound the size of the gathered operands
+        hits = np.empty((self.n_conditions,) + shape, dtype=bool)
+        for kind, constant_rhs, positions, lefts, rights in self.groups:
+            for start in range(0, len(positions), RULE_CHUNK):
+                chunk = slice(start, start + RULE_CHUNK)
+                left = block[lefts[chunk]]
+                right = constants[rights[chunk]] if constant_rhs else block[rights[chunk]]
+                hits[positions[chunk]] = self._condition(kind, left, right)
+
+        n_rules, n_active = len(self.rules), len(self.active)
+        buy, sell = hits[:n_active], hits[n_active:]
+        active_signals = buy.astype(np.int8)
+        active_signals[sell] = -1
+        signals = np.zeros((n_rules,) + shape, dtype=np.int8)
+        signals[self.active] = active_signals
+
+        combined = np.zeros(shape, dtype=np.float64)
+        for start in range(0, n_rules, RULE_CHUNK):
+            chunk = slice(start, start + RULE_CHUNK)
+            combined += np.tensordot(self.weights[chunk], signals[chunk], axes=1)
+        # No rules (or zero total weight) leaves the combined signal at 0
+        total_weight = self.weights.sum()
+        if total_weight:
+            combined /= total_weight
+
+        final = np.where(combined >= self.threshold, 1.0,
+                         np.where(combined <= -self.threshold, -1.0, 0.0))
+
+        result = {name: signals[i] for i, name in enumerate(self.names)}
+        result['combined_signal'] = combined
+        result['final_signal'] = final
+        return result
+
+    @staticmethod
+    def _condition(kind, left, right):
+        """Evaluate one kind of condition for a stack of operands"""
+        if kind in COMPARISONS:
+            return COMPARISONS[kind](left, right)
+
+        right = np.broadcast_to(right, left.shape)
+        if kind == 'cross_above':
+            now, before = left > right, left[..., :-1] <= right[..., :-1]
+        else:
+            now, before = left < right, left[..., :-1] >= right[..., :-1]
+        crossed = np.zeros(now.shape, dtype=bool)
+        crossed[..., 1:] = now[..., 1:] & before
+        return crossed
+
+    def evaluate_frame(self, df):
+        """
+        Evaluate all rules over a DataFrame of indicators
+
+        Args:
+            df (pd.DataFrame): DataFrame with the referenced indicator columns
+
+        Returns:
+            dict: Signal arrays keyed by output column name
+        """
+        return self.evaluate_arrays({name: df[name].to_numpy(dtype=np.float64) for name in self.inputs})
@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+from config import TIMEFRAME, SPREAD_TOLERANCE, SPREAD_ZSCORE_WINDOW, SPREAD_MAX_ROWS
+from multi_timeframe import timeframe_seconds
+
+
+class SpreadAnalyzer:
+    """
+    Cross-exchange price alignment and spread analytics
+
+    Closes from N exchanges are aligned on the union of their timestamps with
+    a backward as-of join: each venue contributes its latest candle at or
+    before a timestamp, as long as it is no older than `tolerance` (by default
+    half a `timeframe` bar), otherwise NaN. The result is one contiguous
+    (timestamps x venues) float64 matrix, from which every pairwise spread
+    (in basis points) and its rolling z-score are computed with array
+    operations.
+
+    The aligned matrix is cached. When the same venues are updated, only the
+    rows at or after the oldest of the venues' previous last timestamps are
+    re-aligned, because earlier rows cannot see the new candles.
+    """
+
+    def __init__(self, tolerance=SPREAD_TOLERANCE, zscore_window=SPREAD_ZSCORE_WINDOW,
+                 max_rows=SPREAD_MAX_ROWS, column='close', timeframe=TIMEFRAME):
+        if tolerance is None:
+            tolerance = pd.Timedelta(seconds=timeframe_seconds(timeframe) / 2)
+        self.tolerance = pd.Timedelta(tolerance)
+        self.zscore_window = zscore_window
+        self.max_rows = max_rows
+        self.column = column
+        self.venues = []
+        self.index = None
+        self.matrix = None
+        self._spreads = None
+        self._last_seen = {}
+
+    def _align_rows(self, grid, series_by_venue):
+        """
+        As-of join every venue onto the grid timestamps
+
+        Args:
+            grid (np.ndarray): Sorted int64 timestamps to align on
+            series_by_venue (list): (timestamps, values) per venue, sorted by time
+
+        Returns:
+            np.ndarray: (len(grid), n_venues) matrix with NaN where a venue has no recent candle
+        """
+        tolerance = self.tolerance.value
+        matrix = np.full((len(grid), len(series_by_venue)), np.nan)
+        for column, (timestamps, values) in enumerate(series_by_venue):
+            if len(timestamps) == 0:
+                continue
+            positions = np.searchsorted(timestamps, grid, side='right') - 1
+            found = positions >= 0
+            positions = np.where(found, positions, 0)
+            fresh = found & (grid - timestamps[positions] <= tolerance)
+            matrix[fresh, column] = values[positions[fresh]]
+        return matrix
+
+    def _venue_series(self, data_dict):
+        """Timestamps (int64 ns) and values for each venue in a fixed order"""
+        series = []
+        for venue in self.venues:
+            df = data_dict[venue]
+            index = pd.DatetimeIndex(df.index).as_unit('ns')
+            series.append((index.asi8, df[self.column].to_numpy(dtype=np.float64)))
+        return series
+
+    @staticmethod
+    def _union(timestamp_arrays):
+        """Sorted union of timestamps, skipping the sort when every venue has the same candles"""
+        if not timestamp_arrays:
+            return np.array([], dtype=np.int64)
+        first = timestamp_arrays[0]
+        if all(np.array_equal(first, other) for other in timestamp_arrays[1:]):
+            return first.copy()
+        return np.unique(np.concatenate(timestamp_arrays))
+
+    def update(self, data_dict):
+        """
+        Align the latest data, re-using the cached matrix where possible
+
+        Args:
+            data_dict (dict): Exchange name -> DataFrame with a datetime index
+
+        Returns:
+            pd.DataFrame: Aligned prices, one column per exchange
+        """
+        venues = [name for name, df in data_dict.items() if df is not None and len(df) > 0]
+        rebuild = venues != self.venues or self.matrix is None
+        self.venues = venues
+        series = self._venue_series(data_dict)
+
+        if rebuild:
+            grid = self._union([timestamps for timestamps, _ in series])
+            self.index = grid
+            self.matrix = self._align_rows(grid, series)
+        else:
+            # Rows before the oldest previous last candle cannot change
+            start = min(self._last_seen[venue] for venue in venues)
+            keep = np.searchsorted(self.index, start, side='left')
+            tail = self._union([timestamps[np.searchsorted(timestamps, start, side='left'):]
+                                for timestamps, _ in series])
+            self.index = np.concatenate([self.index[:keep], tail])
+            self.matrix = np.concatenate([self.matrix[:keep], self._align_rows(tail, series)])
+        self._spreads = None
+
+        if self.max_rows is not None and len(self.index) > self.max_rows:
+            self.index = self.index[-self.max_rows:]
+            self.matrix = np.ascontiguousarray(self.matrix[-self.max_rows:])
+
+        self._last_seen = {venue: timestamps[-1] for venue, (timestamps, _) in zip(venues, series)
+                           if len(timestamps) > 0}
+        return self.get_aligned()
+
+    def get_aligned(self):
+        """
+        Get the cached aligned price matrix
+
+        Returns:
+            pd.DataFrame: Aligned prices, one column per exchange
+        """
+        if self.matrix is None:
+            return pd.DataFrame()
+        return pd.DataFrame(self.matrix, index=pd.DatetimeIndex(self.index, name='datetime'),
+                            columns=self.venues, copy=False)
+
+    def pairs(self):
+        """Venue pairs in the column order used by get_spreads"""
+        first, second = np.triu_indices(len(self.venues), k=1)
+        return [(self.venues[i], self.venues[j]) for i, j in zip(first, second)]
+
+    def get_spreads(self):
+        """
+        Pairwise spreads between every two venues
+
+        Returns:
+            pd.DataFrame: (price_a / price_b - 1) in basis points, one column per 'a-b' pair
+        """
+        if self._spreads is None:
+            first, second = np.triu_indices(len(self.venues), k=1)
+            spreads = (self.matrix[:, first] / self.matrix[:, second] - 1) * 10_000
+            columns = [f'{a}-{b}' for a, b in self.pairs()]
+            self._spreads = pd.DataFrame(spreads, index=pd.DatetimeIndex(self.index, name='datetime'),
+                                         columns=columns, copy=False)
+        return self._spreads
+
+    def get_zscores(self, pairs=None):
+        """
+        Rolling z-score of pairwise spreads
+
+        Args:
+            pairs (list): 'a-b' spread columns to compute (defaults to all)
+
+        Returns:
+            pd.DataFrame: z-scores over `zscore_window` rows
+        """
+        spreads = self.get_spreads()
+        if pairs is not None:
+            spreads = spreads[pairs]
+        rolling = spreads.rolling(self.zscore_window, min_periods=max(2, self.zscore_window // 2))
+        return (spreads - rolling.mean()) / rolling.std()
+
+    def latest_zscores(self):
+        """
+        z-score of the newest spread of every pair against its last `zscore_window` values
+
+        Only the trailing window is touched, so this stays cheap on long histories.
+
+        Returns:
+            pd.Series: Latest z-score per pair (NaN if the pair has too few recent values)
+        """
+        window = self.get_spreads().to_numpy()[-self.zscore_window:]
+        valid = ~np.isnan(window)
+        counts = valid.sum(axis=0)
+        last_row = len(window) - 1 - np.argmax(valid[::-1], axis=0)
+        last = window[last_row, np.arange(window.shape[1])]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.nansum(window, axis=0) / counts
+            std = np.sqrt(np.nansum((window - mean) ** 2, axis=0) / (counts - 1))
+            zscores = (last - mean) / std
+        zscores[counts < max(2, self.zscore_window // 2)] = np.nan
+        return pd.Series(zscores, index=self.get_spreads().columns)
+
+    def summary(self):
+        """
+        Summarize every pairwise spread
+
+        Returns:
+            pd.DataFrame: Mean, std, last spread (bps) and last z-score per pair, largest |z| first
+        """
+        spreads = self.get_spreads()
+        values = spreads.to_numpy()
+        valid = ~np.isnan(values)
+        last_row = len(values) - 1 - np.argmax(valid[::-1], axis=0) if len(values) else 0
+        result = pd.DataFrame({
+            'mean_bps': np.nanmean(values, axis=0) if len(values) else np.nan,
+            'std_bps': np.nanstd(values, axis=0, ddof=1) if len(values) else np.nan,
+            'last_bps': values[last_row, np.arange(values.shape[1])] if len(values) else np.nan,
+            'last_zscore': self.latest_zscores() if len(values) else np.nan,
+            'coverage': valid.mean(axis=0) if len(values) else np.nan,
+        }, index=spreads.columns)
+        return result.reindex(result['last_zscore'].abs().sort_values(ascending=False).index)
+
+
+if __name__ == "__main__":
+    import time
+    from demo_data import generate_synthetic_market
+
+    # 12 venues x 500k one-minute candles, with one venue missing 1% of its candles
+    venues = [f'venue{i}' for i in range(12)]
+    market = generate_synthetic_market(n_bars=500_000, exchanges=venues, timeframe='1m', seed=1)
+    data = {venue: frames['BTC/USDT'] for venue, frames in market.items()}
+    data['venue3'] = data['venue3'].sample(frac=0.99, random_state=0).sort_index()
+
+    analyzer = SpreadAnalyzer(timeframe='1m')
+    start = time.perf_counter()
+    analyzer.update(data)
+    summary = analyzer.summary()
+    print(f"Aligned {len(venues)} venues x {len(analyzer.index):,} rows and "
+          f"{len(analyzer.pairs())} spreads in {time.perf_counter() - start:.2f}s")
+
+    # Append one new candle per venue and update incrementally
+    for venue, df in data.items():
+        last = df.iloc[[-1]]
+        data[venue] = pd.concat([df, last.set_axis(last.index + pd.Timedelta('1min'))])
+    start = time.perf_counter()
+    analyzer.update(data)
+    print(f"Incremental update in {time.perf_counter() - start:.3f}s")
+    print(summary.head())
@@ -0,0 +1,148 @@
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+
+TIMEFRAME_MS = {
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+    '4h': 14_400_000,
+    '1d': 86_400_000,
+}
+
+
+class StubExchange:
+    """
+    Offline stand-in for a ccxt exchange
+
+    Serves deterministic synthetic candles with a simulated network latency,
+    so fetching code can be exercised and benchmarked without API access.
+    """
+
+    def __init__(self, name='stub', latency=0.05, jitter=0.0, rate_limit_ms=10, base_price=45000):
+        self.id = name
+        self.latency = latency
+        self.jitter = jitter
+        self.rateLimit = rate_limit_ms
+        self.base_price = base_price
+        self.calls = 0
+        self.latencies = []
+
+    def _next_latency(self):
+        """Draw the simulated round-trip time for one request"""
+        delay = self.latency + (np.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        self.latencies.append(delay)
+        self.calls += 1
+        return delay
+
+    def _candles(self, symbol, timeframe, since=None, limit=500):
+        """
+        Build ccxt-style OHLCV rows for a symbol
+
+        Prices are a function of the symbol and candle timestamp only, so the
+        same candle is identical across calls and pages.
+        """
+        step = TIMEFRAME_MS[timeframe]
+        now = int(time.time() * 1000) // step * step
+        if since is None:
+            start = now - (limit - 1) * step
+        else:
+            start = -(-since // step) * step
+        timestamps = np.arange(start, min(start + limit * step, now + step), step, dtype=np.int64)
+
+        seed = sum(ord(ch) for ch in f'{self.id}:{symbol}')
+        phase = timestamps / step
+        close = self.base_price * (1 + 0.05 * np.sin(phase / 50 + seed) + 0.01 * np.cos(phase / 7))
+        open_ = close * (1 + 0.002 * np.sin(phase))
+        high = np.maximum(open_, close) * 1.003
+        low = np.minimum(open_, close) * 0.997
+        volume = 100 + 50 * (1 + np.sin(phase / 3))
+
+        return np.column_stack([timestamps, open_, high, low, close, volume]).tolist()
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=500, params=None):
+        """Return OHLCV rows after a blocking simulated delay"""
+        time.sleep(self._next_latency())
+        return self._candles(symbol, timeframe, since, limit)
+
+    def close(self):
+        """Match the ccxt client interface"""
+        pass
+
+
+class AsyncStubExchange(StubExchange):
+    """Offline stand-in for a ccxt.async_support exchange"""
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=500, params=None):
+        """Return OHLCV rows after a non-blocking simulated delay"""
+        await asyncio.sleep(self._next_latency())
+        return self._candles(symbol, timeframe, since, limit)
+
+    async def close(self):
+        """Match the ccxt.async_support client interface"""
+        pass
+
+
+def benchmark_concurrent_fetch(n_exchanges=10, n_symbols=20, latency=0.1, jitter=0.1, limit=500, use_store=True):
+    """
+    Compare concurrent fetching against the sum of individual request times
+
+    Runs a fully initialized DataFetcher (profiling on, paging above
+    PAGE_LIMIT, candle store in a temporary directory) with stub exchanges
+    injected in place of the ccxt clients.
+
+    Args:
+        n_exchanges (int): Number of stub venues
+        n_symbols (int): Number of symbols per venue
+        latency (float): Base simulated latency in seconds
+        jitter (float): Extra random latency in seconds
+        limit (int): Candles per symbol (paged when above PAGE_LIMIT)
+        use_store (bool): Write fetched candles to a temporary candle store
+
+    Returns:
+        dict: Benchmark results
+    """
+    import tempfile
+    from data_fetcher import DataFetcher
+    from candle_store import CandleStore
+    from profiler import PipelineProfiler
+
+    exchanges = {f'stub{i}': AsyncStubExchange(f'stub{i}', latency, jitter) for i in range(n_exchanges)}
+    symbols = [f'COIN{i}/USDT' for i in range(n_symbols)]
+
+    with tempfile.TemporaryDirectory() as store_root:
+        profiler = PipelineProfiler(enabled=True, capture=None)
+        fetcher = DataFetcher(use_store=False, use_market_cache=False, profiler=profiler)
+        fetcher.exchanges = {name: StubExchange(name, latency, jitter) for name in exchanges}
+        if use_store:
+            fetcher.store = CandleStore(store_root)
+        profiler.start_run()
+
+        start = time.perf_counter()
+        data = fetcher.fetch_all_concurrent(symbols, '1h', limit, exchanges=exchanges, max_concurrent=n_symbols)
+        elapsed = time.perf_counter() - start
+
+    latencies = [delay for exchange in exchanges.values() for delay in exchange.latencies]
+    return {
+        'requests': len(latencies),
+        'frames': sum(len(frames) for frames in data.values()),
+        'rows_fetched': profiler.counters.get('rows_fetched', {}).get('total', 0),
+        'wall_time': elapsed,
+        'slowest_call': max(latencies),
+        'sequential_time': sum(latencies),
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark 10 venues x 20 symbols against stub exchanges
+    results = benchmark_concurrent_fetch()
+
+    print("\nConcurrent fetch benchmark (offline stub exchanges):")
+    print(f"  Requests: {results['requests']} ({results['frames']} frames, {results['rows_fetched']} rows returned)")
+    print(f"  Wall time: {results['wall_time']:.3f}s")
+    print(f"  Slowest single call: {results['slowest_call']:.3f}s")
+    print(f"  Sequential equivalent: {results['sequential_time']:.3f}s")
+    print(f"  Speedup: {results['sequential_time'] / results['wall_time']:.1f}x")
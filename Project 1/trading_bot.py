@@ -6,17 +6,25 @@ import os
 
 from data_fetcher import DataFetcher
 from signal_generator import SignalGenerator
-from chart_generator import ChartGenerator
-from config import SYMBOL, TIMEFRAME, LIMIT
+from chart_generator import ChartGenerator, ChartRenderPool
+from profiler import PipelineProfiler
+from multi_timeframe import MultiTimeframeEngine, base_timeframe, timeframe_seconds
+from config import (SYMBOL, TIMEFRAME, LIMIT, CHART_MODE, COMPACT_FRAMES, SYMBOLS, TIMEFRAMES,
+                    UNIVERSE_BASE_CANDLES)
 
 class TradingBot:
-    def __init__(self):
+    def __init__(self, compact=COMPACT_FRAMES):
         """Initialize the trading bot with all components"""
-        self.data_fetcher = DataFetcher()
+        self.compact = compact
+        self.profiler = PipelineProfiler()
+        self.data_fetcher = DataFetcher(profiler=self.profiler)
         self.signal_generator = SignalGenerator()
         self.chart_generator = ChartGenerator()
+        self.chart_pool = None
         self.data = {}
         self.processed_data = {}
+        self.universe_data = {}
+        self.universe_results = {}
         
     def fetch_data(self, symbol=SYMBOL, timeframe=TIMEFRAME, limit=LIMIT):
         """
@@ -31,7 +39,8 @@ class TradingBot:
             dict: Dictionary with exchange data
         """
         print(f"\n🔄 Fetching {symbol} data from exchanges...")
-        self.data = self.data_fetcher.fetch_all_exchanges(symbol, timeframe, limit)
+        with self.profiler.stage('fetch_total'):
+            self.data = self.data_fetcher.fetch_all_exchanges(symbol, timeframe, limit)
         return self.data
     
     def process_data(self):
@@ -49,44 +58,158 @@ class TradingBot:
                 print(f"Processing {exchange_name} data...")
                 
                 # Calculate indicators
-                df_with_indicators = self.signal_generator.calculate_indicators(df.copy())
+                with self.profiler.stage('indicators', exchange_name):
+                    if self.compact:
+                        df_with_indicators = self.signal_generator.calculate_indicators_compact(df)
+                    else:
+                        df_with_indicators = self.signal_generator.calculate_indicators(df.copy())
                 
                 # Generate signals
-                df_with_signals = self.signal_generator.generate_signals(df_with_indicators)
+                with self.profiler.stage('signals', exchange_name):
+                    df_with_signals = self.signal_generator.generate_signals(df_with_indicators, compact=self.compact)
                 
                 self.processed_data[exchange_name] = df_with_signals
+                if self.compact:
+                    # Raw candles share the processed frame's OHLCV columns instead of a second copy
+                    self.data[exchange_name] = df_with_signals.iloc[:, :5]
+                self.profiler.count('rows_processed', len(df), exchange_name)
                 print(f"✓ Processed {exchange_name} data")
             else:
                 print(f"✗ No data available for {exchange_name}")
         
         return self.processed_data
     
-    def generate_charts(self):
+    def generate_charts(self, mode=CHART_MODE):
         """
         Generate charts for all exchanges
         
+        Args:
+            mode (str): 'sync' renders here, 'parallel' renders in the chart pool and waits,
+                'background' queues charts without waiting, 'off' skips charting
+        
         Returns:
             list: List of saved chart paths
         """
+        if mode == 'off':
+            return []
+        
+        if mode in ('parallel', 'background'):
+            futures = self.submit_charts()
+            if mode == 'background':
+                return []
+            return self.collect_charts(futures)
+        
         print("\n📈 Generating charts...")
         chart_paths = []
         
         for exchange_name, df in self.processed_data.items():
             if df is not None and len(df) > 0:
                 print(f"Creating chart for {exchange_name}...")
-                chart_path = self.chart_generator.create_candlestick_chart(df, exchange_name)
+                with self.profiler.stage('charts', exchange_name):
+                    chart_path = self.chart_generator.create_candlestick_chart(df, exchange_name)
                 if chart_path:
                     chart_paths.append(chart_path)
         
         # Create comparison chart
         if len(self.data) > 1:
             print("Creating comparison chart...")
-            comparison_path = self.chart_generator.create_comparison_chart(self.data)
+            with self.profiler.stage('charts', 'comparison'):
+                comparison_path = self.chart_generator.create_comparison_chart(self.data)
             if comparison_path:
                 chart_paths.append(comparison_path)
         
         return chart_paths
     
+    def submit_charts(self):
+        """
+        Queue charts for all exchanges on the chart process pool
+        
+        Returns:
+            list: Futures resolving to saved chart paths
+        """
+        if self.chart_pool is None:
+            self.chart_pool = ChartRenderPool()
+        
+        print("\n📈 Queueing charts on the render pool...")
+        futures = []
+        
+        for exchange_name, df in self.processed_data.items():
+            if df is not None and len(df) > 0:
+                futures.append(self.chart_pool.submit_candlestick(df, exchange_name))
+        
+        # Create comparison chart
+        if len(self.data) > 1:
+            futures.append(self.chart_pool.submit_comparison(self.data))
+        
+        return futures
+    
+    def collect_charts(self, futures):
+        """
+        Wait for queued charts to finish
+        
+        Args:
+            futures (list): Futures returned by submit_charts
+        
+        Returns:
+            list: List of saved chart paths
+        """
+        chart_paths = []
+        for future in futures:
+            try:
+                # Rendering happens in the pool processes; this is only the time spent waiting on it
+                with self.profiler.stage('charts_wait'):
+                    chart_path = future.result()
+                if chart_path:
+                    chart_paths.append(chart_path)
+            except Exception as e:
+                print(f"✗ Chart rendering failed: {str(e)}")
+        return chart_paths
+    
+    def shutdown(self):
+        """Stop the chart pool, waiting for queued charts"""
+        if self.chart_pool is not None:
+            self.chart_pool.shutdown()
+            self.chart_pool = None
+    
+    def get_memory_report(self):
+        """
+        Get the memory held per exchange/symbol
+        
+        Returns:
+            dict: Rows, processed frame bytes and bytes per row by exchange
+        """
+        report = {}
+        
+        for exchange_name, df in self.processed_data.items():
+            frame_bytes = int(df.memory_usage(deep=True).sum())
+            report[exchange_name] = {
+                'rows': len(df),
+                'columns': df.shape[1],
+                'bytes': frame_bytes,
+                'bytes_per_row': frame_bytes / len(df) if len(df) else 0,
+                'dtypes': {str(dtype): int(count) for dtype, count in df.dtypes.value_counts().items()},
+            }
+        
+        return report
+    
+    def print_memory_report(self):
+        """Print memory held per exchange/symbol in a formatted way"""
+        report = self.get_memory_report()
+        
+        print("\n" + "="*80)
+        print(f"🧠 MEMORY REPORT ({'compact' if self.compact else 'standard'} frames)")
+        print("="*80)
+        
+        total = 0
+        for exchange_name, info in report.items():
+            total += info['bytes']
+            dtypes = ", ".join(f"{count} {dtype}" for dtype, count in info['dtypes'].items())
+            print(f"\n🔸 {exchange_name.upper()}:")
+            print(f"   Rows: {info['rows']:,} × {info['columns']} columns ({dtypes})")
+            print(f"   Memory: {info['bytes'] / 1024 ** 2:,.2f} MB ({info['bytes_per_row']:.0f} bytes/row)")
+        
+        print(f"\n   Total: {total / 1024 ** 2:,.2f} MB")
+    
     def get_latest_signals(self):
         """
         Get latest signals from all exchanges
@@ -119,6 +242,103 @@ class TradingBot:
         
         return signal_summaries
     
+    def fetch_universe(self, symbols=SYMBOLS, timeframes=TIMEFRAMES, limit=UNIVERSE_BASE_CANDLES):
+        """
+        Fetch base-timeframe candles for every symbol from all exchanges
+        
+        Only the shortest timeframe is requested; higher timeframes are
+        aggregated from it by process_universe.
+        
+        Args:
+            symbols (list): Trading pair symbols
+            timeframes (list): Timeframes to analyze
+            limit (int): Base-timeframe candles per symbol
+        
+        Returns:
+            dict: (exchange, symbol) -> base OHLCV DataFrame
+        """
+        base = base_timeframe(timeframes)
+        print(f"\n🔄 Fetching {len(symbols)} symbols ({base} candles) from exchanges...")
+        self.universe_data = {}
+        
+        for exchange_name in self.data_fetcher.exchanges.keys():
+            for symbol in symbols:
+                with self.profiler.stage('fetch', exchange_name):
+                    df = self.data_fetcher.fetch_ohlcv(exchange_name, symbol, base, limit)
+                if df is not None and len(df) > 0:
+                    self.universe_data[(exchange_name, symbol)] = df
+                    self.profiler.count('rows_fetched', len(df), exchange_name)
+                else:
+                    print(f"✗ No {symbol} data from {exchange_name}")
+        
+        print(f"✓ Fetched {len(self.universe_data)} series")
+        return self.universe_data
+    
+    def process_universe(self, timeframes=TIMEFRAMES):
+        """
+        Compute indicators and signals for every (symbol, timeframe) pair in batches
+        
+        Args:
+            timeframes (list): Timeframes to derive from the base candles
+        
+        Returns:
+            dict: (exchange, symbol, timeframe) -> DataFrame with indicators and signals
+        """
+        print(f"\n📊 Processing {len(self.universe_data)} series on {len(timeframes)} timeframes...")
+        engine = MultiTimeframeEngine(self.signal_generator, timeframes)
+        
+        with self.profiler.stage('universe'):
+            results = engine.run(self.universe_data)
+        
+        self.universe_results = {(exchange_name, symbol, timeframe): df
+                                 for ((exchange_name, symbol), timeframe), df in results.items()}
+        print(f"✓ Processed {len(self.universe_results)} (symbol, timeframe) pairs")
+        return self.universe_results
+    
+    def print_universe_signals(self):
+        """Print the latest recommendation for every symbol and timeframe"""
+        timeframes = sorted({key[2] for key in self.universe_results}, key=timeframe_seconds)
+        
+        print("\n" + "="*80)
+        print("🌐 UNIVERSE SIGNALS")
+        print("="*80)
+        
+        for exchange_name in self.data_fetcher.exchanges.keys():
+            symbols = sorted({key[1] for key in self.universe_results if key[0] == exchange_name})
+            if not symbols:
+                continue
+            print(f"\n🔸 {exchange_name.upper()}:")
+            print("   " + f"{'Symbol':<14}" + "".join(f"{tf:>10}" for tf in timeframes))
+            for symbol in symbols:
+                cells = []
+                for timeframe in timeframes:
+                    df = self.universe_results.get((exchange_name, symbol, timeframe))
+                    signal = self.signal_generator.get_latest_signals(df)['recommendation'] if df is not None else '-'
+                    cells.append(f"{signal:>10}")
+                print("   " + f"{symbol:<14}" + "".join(cells))
+    
+    def run_universe(self, symbols=SYMBOLS, timeframes=TIMEFRAMES, limit=UNIVERSE_BASE_CANDLES):
+        """
+        Fetch and analyze a symbol universe on several timeframes
+        
+        Returns:
+            dict: (exchange, symbol, timeframe) -> DataFrame with indicators and signals
+        """
+        print("🚀 Starting multi-symbol, multi-timeframe analysis...")
+        print("="*80)
+        self.profiler.start_run()
+        
+        self.fetch_universe(symbols, timeframes, limit)
+        if not self.universe_data:
+            print("❌ No data fetched from any exchange. Please check your API keys and internet connection.")
+            return None
+        
+        self.process_universe(timeframes)
+        self.print_universe_signals()
+        
+        print("\n✅ Universe analysis complete!")
+        return self.universe_results
+    
     def print_latest_signals(self):
         """Print latest signals in a formatted way"""
         latest_signals = self.get_latest_signals()
@@ -132,10 +352,8 @@ class TradingBot:
             print(f"   Timestamp: {signals['timestamp']}")
             print(f"   Current Price: ${signals['price']:,.2f}")
             print(f"   Recommendation: {signals['recommendation']}")
-            print(f"   SMA Signal: {signals['sma_signal']}")
-            print(f"   EMA Signal: {signals['ema_signal']}")
-            print(f"   RSI Signal: {signals['rsi_signal']}")
-            print(f"   BB Signal: {signals['bb_signal']}")
+            for name in self.signal_generator.rule_set.names:
+                print(f"   {name.upper().replace('_SIGNAL', '')} Signal: {signals[name]}")
             print(f"   Combined Signal: {signals['combined_signal']:.4f}")
     
     def print_signal_summary(self):
@@ -157,48 +375,60 @@ class TradingBot:
         """
         Run complete analysis: fetch data, process, generate charts, and display results
         
+        The chart pool used by the 'parallel' and 'background' chart modes is
+        shut down when the run ends, after any queued charts have rendered.
+        
         Returns:
             dict: Analysis results
         """
         print("🚀 Starting Trading Bot Analysis...")
         print("="*80)
-        
-        # Fetch data
-        self.fetch_data()
-        
-        if not self.data:
-            print("❌ No data fetched from any exchange. Please check your API keys and internet connection.")
-            return None
-        
-        # Process data
-        self.process_data()
-        
-        if not self.processed_data:
-            print("❌ No data processed. Please check your data.")
-            return None
-        
-        # Generate charts
-        chart_paths = self.generate_charts()
-        
-        # Display results
-        self.print_latest_signals()
-        self.print_signal_summary()
-        
-        # Print chart information
-        if chart_paths:
-            print(f"\n📊 Generated {len(chart_paths)} charts:")
-            for path in chart_paths:
-                print(f"   📁 {path}")
-        
-        print("\n✅ Analysis complete!")
-        
-        return {
-            'data': self.data,
-            'processed_data': self.processed_data,
-            'latest_signals': self.get_latest_signals(),
-            'signal_summary': self.get_signal_summary(),
-            'chart_paths': chart_paths
-        }
+        self.profiler.start_run()
+        
+        try:
+            # Fetch data
+            self.fetch_data()
+            
+            if not self.data:
+                print("❌ No data fetched from any exchange. Please check your API keys and internet connection.")
+                return None
+            
+            # Process data
+            self.process_data()
+            
+            if not self.processed_data:
+                print("❌ No data processed. Please check your data.")
+                return None
+            
+            # Generate charts; with the pool, signals are printed while images render
+            chart_futures = self.submit_charts() if CHART_MODE in ('parallel', 'background') else None
+            chart_paths = self.generate_charts() if chart_futures is None else []
+            
+            # Display results
+            self.print_latest_signals()
+            self.print_signal_summary()
+            
+            if chart_futures is not None and CHART_MODE == 'parallel':
+                chart_paths = self.collect_charts(chart_futures)
+            
+            # Print chart information
+            if chart_paths:
+                print(f"\n📊 Generated {len(chart_paths)} charts:")
+                for path in chart_paths:
+                    print(f"   📁 {path}")
+            
+            print("\n✅ Analysis complete!")
+            
+            return {
+                'data': self.data,
+                'processed_data': self.processed_data,
+                'latest_signals': self.get_latest_signals(),
+                'signal_summary': self.get_signal_summary(),
+                'chart_paths': chart_paths
+            }
+        finally:
+            # Charts queued on the pool finish before it is shut down
+            self.shutdown()
     
     def get_exchange_info(self):
         """
@@ -210,12 +440,24 @@ class TradingBot:
         exchange_info = {}
         
         for exchange_name in self.data_fetcher.exchanges.keys():
-            info = self.data_fetcher.get_exchange_info(exchange_name)
+            with self.profiler.stage('exchange_info', exchange_name):
+                info = self.data_fetcher.get_exchange_info(exchange_name)
             if info:
                 exchange_info[exchange_name] = info
         
         return exchange_info
     
+    def finish_profiling(self):
+        """
+        Close the profiled run, write the JSON report and print it
+        
+        Returns:
+            dict: Profiling report, or None when profiling is disabled
+        """
+        report = self.profiler.finish_run()
+        self.profiler.print_report(report)
+        return report
+    
     def print_exchange_info(self):
         """Print exchange information in a formatted way"""
         exchange_info = self.get_exchange_info()
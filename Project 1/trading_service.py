@@ -0,0 +1,244 @@
+import time
+import numpy as np
+import pandas as pd
+import ccxt
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from trading_bot import TradingBot
+from config import (SYMBOL, TIMEFRAME, LIMIT, SERVICE_CLOSE_GRACE, SERVICE_MAX_WAIT,
+                    SERVICE_CHART_MODE, SIGNAL_LATENCY_SLO)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class TradingService:
+    """
+    Long-running service mode for the trading bot
+
+    Keeps the exchange clients, the in-memory frames and one streaming
+    indicator engine per exchange alive between candles. At every timeframe
+    boundary it polls every exchange concurrently for the newly closed
+    candles, updates indicators and signals incrementally as each exchange
+    answers, prints the latest signals, records the latency from candle
+    close to signal output and appends the candles to the candle store
+    when one is configured.
+    """
+
+    def __init__(self, bot=None, symbol=SYMBOL, timeframe=TIMEFRAME, limit=LIMIT,
+                 chart_mode=SERVICE_CHART_MODE):
+        self.bot = bot or TradingBot()
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.limit = limit
+        self.chart_mode = chart_mode
+        self.step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.engines = {}
+        self.latencies = []
+        self.cycles = 0
+
+    def bootstrap(self):
+        """
+        Load the initial history and warm up the streaming indicators
+
+        Returns:
+            bool: True if at least one exchange has data
+        """
+        self.bot.fetch_data(self.symbol, self.timeframe, self.limit)
+        for exchange_name, df in list(self.bot.data.items()):
+            self.bot.data[exchange_name] = self._closed_only(df)
+        self.bot.process_data()
+
+        for exchange_name, df in self.bot.data.items():
+            self.engines[exchange_name] = self.bot.signal_generator.create_streaming_indicators(df)
+
+        # Keep market metadata fresh without blocking the candle loop
+        market_cache = self.bot.data_fetcher.market_cache
+        if market_cache is not None:
+            market_cache.start_background_refresh(self.bot.data_fetcher.exchanges)
+
+        return bool(self.bot.processed_data)
+
+    def _closed_only(self, df):
+        """Drop the candle that is still open"""
+        if df is None or len(df) == 0:
+            return df
+        now = pd.to_datetime(time.time(), unit='s')
+        return df[df.index + pd.Timedelta(milliseconds=self.step_ms) <= now]
+
+    def seconds_until_next_close(self):
+        """Seconds until the current candle closes, plus the configured grace period"""
+        now_ms = time.time() * 1000
+        next_close_ms = (now_ms // self.step_ms + 1) * self.step_ms
+        return (next_close_ms - now_ms) / 1000 + SERVICE_CLOSE_GRACE
+
+    def fetch_new_candles(self, exchange_name):
+        """
+        Fetch candles that closed after the last one held in memory
+
+        Polls until the exchange publishes the candle or SERVICE_MAX_WAIT passes.
+
+        Args:
+            exchange_name (str): Name of the exchange
+
+        Returns:
+            pd.DataFrame: Newly closed candles (may be empty)
+        """
+        exchange = self.bot.data_fetcher.exchanges[exchange_name]
+        frame = self.bot.processed_data[exchange_name]
+        since = int(frame.index[-1].timestamp() * 1000) + self.step_ms
+        deadline = time.time() + SERVICE_MAX_WAIT
+
+        while True:
+            try:
+                ohlcv = exchange.fetch_ohlcv(self.symbol, self.timeframe, since=since, limit=self.limit)
+                new_rows = self._closed_only(self.bot.data_fetcher._to_dataframe(ohlcv))
+                if len(new_rows) > 0:
+                    return new_rows
+            except Exception as e:
+                print(f"Error polling {exchange_name}: {str(e)}")
+
+            if time.time() >= deadline:
+                return self.bot.data_fetcher._to_dataframe([])
+            time.sleep(1)
+
+    def apply_candles(self, exchange_name, new_rows):
+        """
+        Append closed candles and update indicators and signals incrementally
+
+        Indicators come from the streaming engine (O(1) per candle); signals
+        are evaluated only over the new candles plus the one before them,
+        which crossover rules need.
+
+        Args:
+            exchange_name (str): Name of the exchange
+            new_rows (pd.DataFrame): Newly closed OHLCV candles
+
+        Returns:
+            pd.DataFrame: Updated frame for the exchange
+        """
+        engine = self.engines[exchange_name]
+        indicator_rows = [engine.update(close) for close in new_rows['close'].to_numpy(dtype=float)]
+        update = pd.concat([new_rows[OHLCV_COLUMNS],
+                            pd.DataFrame(indicator_rows, index=new_rows.index)], axis=1)
+
+        frame = self.bot.processed_data[exchange_name]
+        tail = pd.concat([frame.iloc[-1:][update.columns], update])
+        signals = self.bot.signal_generator.rule_set.evaluate_frame(tail)
+        for column, values in signals.items():
+            update[column] = values[1:]
+
+        # Match the stored dtypes (float32/int8 in compact frames) so the concat doesn't upcast
+        update = update[frame.columns].astype(frame.dtypes.to_dict())
+        frame = pd.concat([frame, update]).iloc[-self.limit:]
+        self.bot.processed_data[exchange_name] = frame
+        self.bot.data[exchange_name] = frame[OHLCV_COLUMNS]
+        return frame
+
+    def run_cycle(self):
+        """
+        Process the candles that closed since the last cycle on every exchange
+
+        Returns:
+            dict: Latest signals per exchange that had a new candle
+        """
+        emitted = {}
+        exchange_names = list(self.bot.processed_data.keys())
+        store = self.bot.data_fetcher.store
+
+        # Poll every exchange at once, so a venue that is slow to publish doesn't delay the others
+        with ThreadPoolExecutor(max_workers=max(len(exchange_names), 1)) as pool:
+            futures = {pool.submit(self.fetch_new_candles, name): name for name in exchange_names}
+            for future in as_completed(futures):
+                exchange_name = futures[future]
+                new_rows = future.result()
+                if len(new_rows) == 0:
+                    print(f"✗ No new closed candle from {exchange_name}")
+                    continue
+
+                frame = self.apply_candles(exchange_name, new_rows)
+                signals = self.bot.signal_generator.get_latest_signals(frame)
+                emitted[exchange_name] = signals
+
+                # Latency from the close of the newest candle to its signal
+                close_ms = int(frame.index[-1].timestamp() * 1000) + self.step_ms
+                latency = time.time() - close_ms / 1000
+                self.latencies.append(latency)
+
+                slo_flag = "" if latency <= SIGNAL_LATENCY_SLO else f" ⚠️ over {SIGNAL_LATENCY_SLO}s SLO"
+                print(f"🔸 {exchange_name.upper()} {signals['timestamp']} "
+                      f"${signals['price']:,.2f} → {signals['recommendation']} "
+                      f"(combined {signals['combined_signal']:+.2f}, latency {latency:.2f}s{slo_flag})")
+
+                # Persist after the signal is out, so the write doesn't add to its latency
+                if store is not None:
+                    store.append(exchange_name, self.symbol, self.timeframe, new_rows)
+
+        self.cycles += 1
+        if emitted and self.chart_mode != 'off':
+            self.bot.generate_charts(mode=self.chart_mode)
+        return emitted
+
+    def get_latency_report(self):
+        """
+        Summarize close-to-signal latency
+
+        Returns:
+            dict: Sample count, percentiles and SLO compliance
+        """
+        if not self.latencies:
+            return {}
+
+        latencies = np.array(self.latencies)
+        return {
+            'samples': len(latencies),
+            'p50': float(np.percentile(latencies, 50)),
+            'p95': float(np.percentile(latencies, 95)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(latencies.max()),
+            'slo_seconds': SIGNAL_LATENCY_SLO,
+            'slo_compliance': float((latencies <= SIGNAL_LATENCY_SLO).mean() * 100),
+        }
+
+    def print_latency_report(self):
+        """Print close-to-signal latency in a formatted way"""
+        report = self.get_latency_report()
+        if not report:
+            return
+
+        print("\n" + "="*80)
+        print("⏱️  SIGNAL LATENCY (candle close → signal)")
+        print("="*80)
+        print(f"   Samples: {report['samples']}")
+        print(f"   p50: {report['p50']:.2f}s   p95: {report['p95']:.2f}s   "
+              f"p99: {report['p99']:.2f}s   max: {report['max']:.2f}s")
+        print(f"   Within {report['slo_seconds']}s SLO: {report['slo_compliance']:.1f}%")
+
+    def run(self, max_cycles=None):
+        """
+        Run the service until interrupted
+
+        Args:
+            max_cycles (int): Stop after this many candle closes (optional)
+        """
+        print(f"🛰️  Starting service mode for {self.symbol} {self.timeframe}...")
+        if not self.bootstrap():
+            print("❌ No data fetched from any exchange. Service not started.")
+            return
+
+        self.bot.print_latest_signals()
+
+        try:
+            while max_cycles is None or self.cycles < max_cycles:
+                wait = self.seconds_until_next_close()
+                print(f"\n⏳ Next candle closes in {wait:.0f}s "
+                      f"({datetime.now().strftime('%H:%M:%S')})")
+                time.sleep(wait)
+                self.run_cycle()
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Service stopped by user.")
+        finally:
+            self.print_latency_report()
+            if self.bot.data_fetcher.market_cache is not None:
+                self.bot.data_fetcher.market_cache.stop_background_refresh()
+            self.bot.shutdown()
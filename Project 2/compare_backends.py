@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sentiment Backend Comparison
+============================
+
+Scores the same posts with the PyTorch model and the ONNX Runtime backend
+(full precision and int8-quantized) and reports throughput and how closely
+the ONNX scores follow the PyTorch scores. Also reports how many posts the
+fast lexicon tier of the cascade would escalate to the model, and how often
+it agrees with PyTorch on the posts it keeps.
+
+Usage:
+    python compare_backends.py
+    python compare_backends.py --texts 2000 --batch-size 64
+    python compare_backends.py --cascade-confidence 0.7
+"""
+
+import os
+import time
+import random
+import argparse
+from contextlib import contextmanager
+import numpy as np
+from fast_sentiment import FastSentimentScorer, categorize
+import config
+
+SAMPLE_TEXTS = [
+    "Bitcoin is going to the moon! 🚀",
+    "I'm worried about the crypto market crash",
+    "Bitcoin price is stable today",
+    "This is the worst investment ever",
+    "Amazing gains on my crypto portfolio!",
+    "Bitcoin adoption is growing rapidly",
+    "I'm bullish on Bitcoin's future",
+    "The market is looking bearish today",
+    "Great time to buy the dip!",
+    "Bitcoin will revolutionize finance",
+]
+
+def make_texts(n: int, seed: int = 42) -> list:
+    """Posts of varying length built from the sample texts"""
+    rng = random.Random(seed)
+    return [' '.join(rng.sample(SAMPLE_TEXTS, rng.randint(1, 4))) for _ in range(n)]
+
+@contextmanager
+def config_overrides(**settings):
+    """Temporarily set config values, restoring the previous values afterwards"""
+    previous = {name: getattr(config, name) for name in settings}
+    try:
+        for name, value in settings.items():
+            setattr(config, name, value)
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+def load_analyzer(backend: str, quantize: bool = True):
+    """SentimentAnalyzer on the given backend, with the score cache disabled"""
+    from sentiment_analyzer import SentimentAnalyzer
+
+    with config_overrides(SENTIMENT_BACKEND=backend, ONNX_QUANTIZE=quantize, SENTIMENT_CACHE_ENABLED=False):
+        return SentimentAnalyzer()
+
+def benchmark(analyzer, texts: list, batch_size: int):
+    """Warm up on one batch, then time scoring every text"""
+    analyzer.analyze_texts_transformer(texts[:batch_size], batch_size)
+    start = time.perf_counter()
+    scores = analyzer.analyze_texts_transformer(texts, batch_size)
+    return np.asarray(scores, dtype=np.float64), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare PyTorch and ONNX Runtime sentiment backends')
+    parser.add_argument('--texts', type=int, default=1000, help='Number of posts to score')
+    parser.add_argument('--batch-size', type=int, default=config.SENTIMENT_BATCH_SIZE, help='Texts per forward pass')
+    parser.add_argument('--cascade-confidence', type=float, default=config.CASCADE_CONFIDENCE,
+                        help='Fast-tier confidence below which the cascade escalates a post')
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    print(f"📊 Scoring {len(texts)} posts with batch size {args.batch_size}\n")
+
+    results = {}
+    for label, backend, quantize in [('torch', 'torch', False), ('onnx', 'onnx', False), ('onnx-int8', 'onnx', True)]:
+        analyzer = load_analyzer(backend, quantize)
+        if analyzer.backend != label:
+            print(f"⚠️ Skipping {label}: backend not available")
+            continue
+        scores, seconds = benchmark(analyzer, texts, args.batch_size)
+        size = os.path.getsize(analyzer.model.path) / 1024 ** 2 if backend == 'onnx' else None
+        results[label] = (scores, seconds, size)
+
+    if 'torch' not in results:
+        print("❌ PyTorch backend not available, nothing to compare against")
+        return
+
+    reference, reference_time, _ = results['torch']
+    print(f"\n{'Backend':<12}{'Texts/s':>10}{'Speedup':>10}{'Model MB':>10}{'Mean |Δ|':>10}{'Max |Δ|':>10}{'Agree':>8}")
+    for label, (scores, seconds, size) in results.items():
+        diff = np.abs(scores - reference)
+        agreement = (categorize(scores) == categorize(reference)).mean() * 100
+        print(f"{label:<12}{len(texts) / seconds:>10.1f}{reference_time / seconds:>9.1f}x"
+              f"{size if size is not None else float('nan'):>10.1f}{diff.mean():>10.4f}{diff.max():>10.4f}{agreement:>7.1f}%")
+    
+    # Fast tier of the cascade against the PyTorch labels
+    start = time.perf_counter()
+    fast_scores, confidences = FastSentimentScorer().score_many(texts)
+    fast_time = time.perf_counter() - start
+    confident = confidences >= args.cascade_confidence
+    print(f"\nCascade at confidence {args.cascade_confidence}: {(~confident).mean() * 100:.1f}% escalated to the model, "
+          f"fast tier at {len(texts) / fast_time:.0f} texts/s")
+    if confident.any():
+        agreement = (categorize(fast_scores[confident]) == categorize(reference[confident])).mean() * 100
+        print(f"Fast tier agrees with torch on {agreement:.1f}% of the {confident.sum()} posts it keeps")
+
+if __name__ == "__main__":
+    main()
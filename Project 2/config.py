@@ -20,14 +20,53 @@ SENTIMENT_THRESHOLD_BUY = 0.3
 SENTIMENT_THRESHOLD_SELL = -0.3
 SIGNAL_COOLDOWN_HOURS = 1
 
+# Streaming Sentiment Aggregation
+USE_STREAMING_SENTIMENT = True  # Signals use the decayed score of the streaming aggregator
+SENTIMENT_BUCKET_MINUTES = 60
+SENTIMENT_WINDOW_HOURS = 24
+SENTIMENT_HALF_LIFE_HOURS = 6  # Half-life of the exponentially decayed sentiment score
+SENTIMENT_DECAY_PRIOR_WEIGHT = 1.0  # Weight of a neutral score at the current time, so stale sentiment fades to 0
+
 # Data Collection Settings
 MAX_TWEETS_PER_QUERY = 100
 MAX_REDDIT_POSTS_PER_QUERY = 50
 QUERY_KEYWORDS = ['bitcoin', 'btc', 'crypto', 'cryptocurrency']
+REDDIT_SUBREDDITS = ['Bitcoin']
+COLLECTION_WORKERS = 8  # Concurrent collection requests across all sources
+COLLECTION_TIMEOUT = 60  # Seconds before a cycle continues with partial results
+INCREMENTAL_COLLECTION = True  # Continuous mode only collects and scores new posts
+SEEN_ID_RETENTION_HOURS = 48  # How long collected post IDs are remembered for dedupe
+SOURCE_RATE_LIMITS = {
+    'twitter': {'max_concurrent': 4, 'max_per_minute': 120},
+    'reddit': {'max_concurrent': 1, 'max_per_minute': 60},  # praw is not thread safe
+}
+
+# Pipelined Mode Settings
+PIPELINE_QUEUE_SIZE = 8  # Batches buffered between stages before the upstream stage blocks
+PIPELINE_MICRO_BATCH = 64  # Posts scored together by the inference stage
+PIPELINE_BATCH_WAIT = 0.5  # Seconds the inference stage waits to fill a micro-batch
+PIPELINE_POLL_SECONDS = 60  # Seconds between collection rounds
+PIPELINE_REPORT_SECONDS = 60  # Seconds between stage metric reports
 
 # Model Configuration
 SENTIMENT_MODEL = 'cardiffnlp/twitter-roberta-base-sentiment-latest'
 MAX_TEXT_LENGTH = 512
+SENTIMENT_BATCH_SIZE = 32  # Texts per forward pass
+TORCH_NUM_THREADS = None  # Intra-op CPU threads (None keeps the library default of one per physical core)
+SENTIMENT_BACKEND = 'torch'  # 'torch' or 'onnx' (ONNX Runtime on CPU)
+ONNX_MODEL_PATH = 'models/onnx'  # Exported ONNX models, created on first use
+ONNX_QUANTIZE = True  # Dynamic int8 quantization of the exported model
+CASCADE_ENABLED = False  # Score confident texts with the fast lexicon tier, escalate the rest to the model (check the audit agreement first)
+CASCADE_CONFIDENCE = 0.5  # Fast-tier confidence (0-1) below which a text is escalated
+CASCADE_USE_TEXTBLOB = True  # Escalate texts where TextBlob disagrees with the lexicon
+CASCADE_AUDIT_RATE = 0.05  # Share of confident texts also scored by the model, for agreement metrics
+
+BACKGROUND_MODEL_LOAD = True  # Load the model in a thread while data is collected
+
+# Sentiment Score Cache
+SENTIMENT_CACHE_ENABLED = True
+SENTIMENT_CACHE_PATH = 'cache/sentiment_scores.db'
+SENTIMENT_CACHE_MEMORY_SIZE = 100000  # Scores kept in the in-memory LRU
 
 # Visualization Settings
 CHART_SAVE_PATH = 'sentiment_charts'
@@ -1,15 +1,51 @@
-import tweepy
-import praw
 import pandas as pd
 from datetime import datetime, timedelta
 import time
-from typing import List, Dict, Optional
+import threading
+import numpy as np
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Optional, Iterator, Tuple
 import config
 
+class RateBudget:
+    """Request budget for one source: concurrent requests and request starts per minute"""
+    
+    def __init__(self, max_concurrent: int = 1, max_per_minute: float = None):
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._interval = 60.0 / max_per_minute if max_per_minute else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def request(self):
+        """Hold a request slot, waiting for a free slot and the next allowed start time"""
+        self._slots.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._interval
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            self._slots.release()
+
 class DataCollector:
-    def __init__(self):
+    def __init__(self, max_workers: int = None, rate_limits: Dict = None):
         self.twitter_api = None
         self.reddit_api = None
+        self.max_workers = max_workers or config.COLLECTION_WORKERS
+        rate_limits = config.SOURCE_RATE_LIMITS if rate_limits is None else rate_limits
+        self.budgets = {source: RateBudget(**limits) for source, limits in rate_limits.items()}
+        self.last_collection_stats = {}
+        
+        # High-water marks and dedupe store for incremental collection
+        self.since_ids = {}
+        self.reddit_marks = {}
+        self.seen_ids = {}
+        self._marks_lock = threading.Lock()
         self._initialize_apis()
     
     def _initialize_apis(self):
@@ -18,6 +54,7 @@ class DataCollector:
         if all([config.TWITTER_API_KEY, config.TWITTER_API_SECRET, 
                 config.TWITTER_ACCESS_TOKEN, config.TWITTER_ACCESS_TOKEN_SECRET]):
             try:
+                import tweepy
                 auth = tweepy.OAuthHandler(config.TWITTER_API_KEY, config.TWITTER_API_SECRET)
                 auth.set_access_token(config.TWITTER_ACCESS_TOKEN, config.TWITTER_ACCESS_TOKEN_SECRET)
                 self.twitter_api = tweepy.API(auth, wait_on_rate_limit=True)
@@ -28,6 +65,7 @@ class DataCollector:
         # Initialize Reddit API
         if all([config.REDDIT_CLIENT_ID, config.REDDIT_CLIENT_SECRET]):
             try:
+                import praw
                 self.reddit_api = praw.Reddit(
                     client_id=config.REDDIT_CLIENT_ID,
                     client_secret=config.REDDIT_CLIENT_SECRET,
@@ -37,8 +75,8 @@ class DataCollector:
             except Exception as e:
                 print(f"Failed to initialize Reddit API: {e}")
     
-    def collect_tweets(self, query: str = "bitcoin", max_tweets: int = None) -> pd.DataFrame:
-        """Collect tweets about Bitcoin/crypto"""
+    def collect_tweets(self, query: str = "bitcoin", max_tweets: int = None, since_id: int = None) -> pd.DataFrame:
+        """Collect tweets about Bitcoin/crypto (only tweets newer than `since_id`, if given)"""
         if not self.twitter_api:
             print("Twitter API not available")
             return pd.DataFrame()
@@ -48,13 +86,13 @@ class DataCollector:
         
         tweets_data = []
         try:
+            import tweepy
+            
             # Search for tweets
-            tweets = tweepy.Cursor(
-                self.twitter_api.search_tweets,
-                q=query,
-                lang="en",
-                tweet_mode="extended"
-            ).items(max_tweets)
+            search_params = {'q': query, 'lang': "en", 'tweet_mode': "extended"}
+            if since_id is not None:
+                search_params['since_id'] = since_id
+            tweets = tweepy.Cursor(self.twitter_api.search_tweets, **search_params).items(max_tweets)
             
             for tweet in tweets:
                 tweets_data.append({
@@ -74,8 +112,13 @@ class DataCollector:
             print(f"Error collecting tweets: {e}")
             return pd.DataFrame()
     
-    def collect_reddit_posts(self, subreddit_name: str = "Bitcoin", max_posts: int = None) -> pd.DataFrame:
-        """Collect Reddit posts about Bitcoin/crypto"""
+    def collect_reddit_posts(self, subreddit_name: str = "Bitcoin", max_posts: int = None,
+                             newer_than: datetime = None) -> pd.DataFrame:
+        """Collect Reddit posts about Bitcoin/crypto
+        
+        Hot posts by default; with `newer_than`, only posts created after it,
+        read from the subreddit's newest posts.
+        """
         if not self.reddit_api:
             print("Reddit API not available")
             return pd.DataFrame()
@@ -87,12 +130,16 @@ class DataCollector:
         try:
             subreddit = self.reddit_api.subreddit(subreddit_name)
             
-            # Get hot posts
-            for post in subreddit.hot(limit=max_posts):
+            # Get hot posts, or the newest posts down to the high-water mark
+            posts = subreddit.hot(limit=max_posts) if newer_than is None else subreddit.new(limit=max_posts)
+            for post in posts:
+                created_at = datetime.fromtimestamp(post.created_utc)
+                if newer_than is not None and created_at <= newer_than:
+                    break
                 posts_data.append({
                     'id': post.id,
                     'text': f"{post.title} {post.selftext}",
-                    'created_at': datetime.fromtimestamp(post.created_utc),
+                    'created_at': created_at,
                     'user': str(post.author) if post.author else 'deleted',
                     'score': post.score,
                     'upvote_ratio': post.upvote_ratio,
@@ -106,20 +153,118 @@ class DataCollector:
             print(f"Error collecting Reddit posts: {e}")
             return pd.DataFrame()
     
-    def collect_all_data(self) -> pd.DataFrame:
-        """Collect data from all sources"""
-        all_data = []
+    def _collect_new_tweets(self, query: str) -> Tuple[pd.DataFrame, Optional[tuple]]:
+        """Collect tweets newer than the query's high-water mark
+        
+        Returns the tweets and the new mark, which the caller applies with
+        _advance_mark only once the tweets are actually used, so a request
+        abandoned after a timeout never skips posts.
+        """
+        df = self.collect_tweets(query, since_id=self.since_ids.get(query))
+        mark = (self.since_ids, query, int(df['id'].max())) if not df.empty else None
+        return df, mark
+    
+    def _collect_new_reddit_posts(self, subreddit_name: str) -> Tuple[pd.DataFrame, Optional[tuple]]:
+        """Collect Reddit posts newer than the subreddit's high-water mark, returning the new mark"""
+        df = self.collect_reddit_posts(subreddit_name, newer_than=self.reddit_marks.get(subreddit_name))
+        mark = (self.reddit_marks, subreddit_name, df['created_at'].max()) if not df.empty else None
+        return df, mark
+    
+    def _advance_mark(self, mark: Optional[tuple]):
+        """Move a high-water mark forward (never back) to a collected request's newest post"""
+        if mark is None:
+            return
+        marks, key, newest = mark
+        with self._marks_lock:
+            marks[key] = newest if key not in marks else max(marks[key], newest)
+    
+    def _filter_unseen(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop posts returned in earlier cycles and remember the new ones"""
+        now = time.time()
+        cutoff = now - config.SEEN_ID_RETENTION_HOURS * 3600
+        
+        # Entries are in insertion order, so expired ones are at the front
+        while self.seen_ids:
+            oldest = next(iter(self.seen_ids))
+            if self.seen_ids[oldest] >= cutoff:
+                break
+            del self.seen_ids[oldest]
+        
+        unseen = np.fromiter((post_id not in self.seen_ids for post_id in df['id']), dtype=bool, count=len(df))
+        df = df[unseen]
+        for post_id in df['id']:
+            self.seen_ids[post_id] = now
+        return df
+    
+    def _collect_with_budget(self, source: str, collect, argument: str) -> pd.DataFrame:
+        """Run one collection request inside its source's rate budget"""
+        budget = self.budgets.get(source)
+        if budget is None:
+            return collect(argument)
+        with budget.request():
+            return collect(argument)
+    
+    def iter_collected(self, timeout: float = None, incremental: bool = False) -> Iterator[pd.DataFrame]:
+        """Run every keyword, subreddit and source request concurrently, yielding
+        each request's posts as soon as it completes
         
-        # Collect tweets
-        for keyword in config.QUERY_KEYWORDS:
-            tweets_df = self.collect_tweets(keyword)
-            if not tweets_df.empty:
-                all_data.append(tweets_df)
+        Requests still pending after `timeout` seconds of waiting are abandoned.
+        Time the caller spends between items (e.g. blocked on a full queue)
+        does not count, and requests that have finished are always yielded.
+        With `incremental`, only posts newer than each keyword's and subreddit's
+        high-water mark are requested and posts returned in earlier cycles are
+        dropped.
+        """
+        timeout = config.COLLECTION_TIMEOUT if timeout is None else timeout
+        collect_tweets = self._collect_new_tweets if incremental else self.collect_tweets
+        collect_reddit_posts = self._collect_new_reddit_posts if incremental else self.collect_reddit_posts
+        requests = [('twitter', collect_tweets, keyword) for keyword in config.QUERY_KEYWORDS]
+        requests += [('reddit', collect_reddit_posts, subreddit) for subreddit in config.REDDIT_SUBREDDITS]
         
-        # Collect Reddit posts
-        reddit_df = self.collect_reddit_posts()
-        if not reddit_df.empty:
-            all_data.append(reddit_df)
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='collector')
+        futures = [executor.submit(self._collect_with_budget, *request) for request in requests]
+        pending = set(futures)
+        deadline = start + timeout
+        
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=max(deadline - time.perf_counter(), 0),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    print(f"⏱️ {len(pending)} of {len(futures)} collection requests unfinished after {timeout}s, using partial results")
+                    break
+                for future in done:
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        print(f"Error collecting data: {e}")
+                        continue
+                    if incremental:
+                        df, mark = df
+                        self._advance_mark(mark)
+                        if not df.empty:
+                            df = self._filter_unseen(df.drop_duplicates(subset=['id']))
+                    if not df.empty:
+                        handed_over = time.perf_counter()
+                        yield df
+                        deadline += time.perf_counter() - handed_over
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.last_collection_stats = {
+                'requests': len(futures),
+                'completed': len(futures) - len(pending),
+                'timed_out': len(pending),
+                'seconds': time.perf_counter() - start,
+            }
+    
+    def collect_all_data(self, timeout: float = None, incremental: bool = False) -> pd.DataFrame:
+        """Collect data from all keywords, subreddits and sources concurrently
+        
+        Requests that have not finished after `timeout` seconds are abandoned and
+        the posts collected so far are returned (see iter_collected).
+        """
+        all_data = list(self.iter_collected(timeout, incremental))
         
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
@@ -129,6 +274,10 @@ class DataCollector:
         
         return pd.DataFrame()
     
+    def collect_new_data(self, timeout: float = None) -> pd.DataFrame:
+        """Collect only posts that were not returned in earlier cycles"""
+        return self.collect_all_data(timeout, incremental=True)
+    
     def get_recent_data(self, hours: int = 24) -> pd.DataFrame:
         """Get data from the last N hours"""
         all_data = self.collect_all_data()
@@ -0,0 +1,140 @@
+import re
+import hashlib
+import numpy as np
+from typing import Dict, List, Tuple
+import config
+
+# Valence (-1 to 1) of crypto slang, emoji and common opinion words
+CRYPTO_LEXICON = {
+    # Positive
+    'moon': 0.8, 'mooning': 0.8, '🚀': 0.8, '📈': 0.6, '💎': 0.4, '🙌': 0.4, '🔥': 0.4, '💰': 0.4,
+    'bullish': 0.8, 'bull': 0.5, 'pump': 0.5, 'pumping': 0.6, 'rally': 0.6, 'breakout': 0.5,
+    'ath': 0.6, 'hodl': 0.4, 'gains': 0.6, 'profit': 0.5, 'profits': 0.5, 'surge': 0.6, 'soaring': 0.7,
+    'adoption': 0.4, 'growing': 0.4, 'revolutionize': 0.6, 'undervalued': 0.5,
+    'amazing': 0.8, 'great': 0.6, 'good': 0.5, 'love': 0.7, 'awesome': 0.8, 'excellent': 0.8,
+    'excited': 0.6, 'best': 0.6, 'strong': 0.4, 'win': 0.5, 'winning': 0.6,
+    # Negative
+    '📉': -0.6, '💀': -0.6, '😭': -0.5, '🤡': -0.5,
+    'bearish': -0.8, 'bear': -0.5, 'dump': -0.6, 'dumping': -0.7, 'crash': -0.8, 'crashing': -0.8,
+    'rekt': -0.8, 'scam': -0.9, 'rug': -0.8, 'rugpull': -0.9, 'ponzi': -0.8, 'bubble': -0.5,
+    'fud': -0.4, 'sell-off': -0.6, 'selloff': -0.6, 'plunge': -0.7, 'overvalued': -0.5, 'hack': -0.7,
+    'hacked': -0.8, 'loss': -0.6, 'losses': -0.6, 'down': -0.3,
+    'worst': -0.9, 'terrible': -0.8, 'awful': -0.8, 'bad': -0.5, 'hate': -0.7, 'worried': -0.6,
+    'fear': -0.6, 'scared': -0.6, 'panic': -0.7, 'disaster': -0.8, 'weak': -0.4, 'lose': -0.5,
+}
+
+NEGATIONS = {'not', 'no', 'never', 'nothing', 'nobody', 'none', 'neither', 'nor', 'without'}
+NEGATION_SCOPE = 3  # Words after a negation whose valence is flipped
+NEGATION_SCALE = -0.75
+TOKEN = re.compile(r"[\w'-]+|[^\w\s]")
+
+def categorize(scores: np.ndarray) -> np.ndarray:
+    """Positive/neutral/negative labels with the cut-offs used by analyze_dataframe"""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.where(scores > 0.1, 'positive', np.where(scores < -0.1, 'negative', 'neutral'))
+
+class FastSentimentScorer:
+    """Lexicon scorer, checked against TextBlob, for the cheap tier of the cascade
+
+    Every text gets a score (-1 to 1) and a confidence (0 to 1). Confidence
+    is high when a text contains strong lexicon words that all point the same
+    way, and zero when it has none, when its words point both ways, or when
+    TextBlob's polarity disagrees with the lexicon. Texts below the cutoff are
+    left to the transformer.
+    """
+
+    def __init__(self, lexicon: Dict[str, float] = None, use_textblob: bool = None):
+        self.lexicon = CRYPTO_LEXICON if lexicon is None else lexicon
+        self.use_textblob = config.CASCADE_USE_TEXTBLOB if use_textblob is None else use_textblob
+        self._textblob = None
+
+    def _load_textblob(self) -> bool:
+        """Import TextBlob on first use; False when it is disabled or unavailable"""
+        if self.use_textblob and self._textblob is None:
+            try:
+                from textblob import TextBlob
+                self._textblob = TextBlob
+            except ImportError:
+                self.use_textblob = False
+        return self.use_textblob
+
+    def _textblob_polarity(self, text: str):
+        """TextBlob polarity, or None when TextBlob is unavailable"""
+        if not self._load_textblob():
+            return None
+        return self._textblob(text).sentiment.polarity
+
+    @property
+    def version(self) -> str:
+        """Short hash of everything that changes fast-tier scores, part of the cache key"""
+        settings = (sorted(self.lexicon.items()), sorted(NEGATIONS), NEGATION_SCOPE,
+                    NEGATION_SCALE, self._load_textblob())
+        return hashlib.sha1(repr(settings).encode('utf-8')).hexdigest()[:8]
+
+    def score(self, text: str) -> Tuple[float, float]:
+        """Score and confidence of one text"""
+        positive = negative = 0.0
+        negated = 0
+        for token in TOKEN.findall(str(text).lower()):
+            if token in NEGATIONS or token.endswith("n't"):
+                negated = NEGATION_SCOPE
+                continue
+            valence = self.lexicon.get(token)
+            if valence is None:
+                negated = max(negated - 1, 0)
+                continue
+            if negated:
+                valence *= NEGATION_SCALE
+                negated -= 1
+            if valence > 0:
+                positive += valence
+            else:
+                negative -= valence
+
+        net = positive - negative
+        if net == 0:
+            return 0.0, 0.0
+        confidence = abs(net) / (positive + negative + 0.5)
+
+        polarity = self._textblob_polarity(text)
+        if polarity is not None and abs(polarity) > 0.1 and np.sign(polarity) != np.sign(net):
+            confidence = 0.0
+        return float(np.tanh(net)), confidence
+
+    def score_many(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores and confidences of many texts"""
+        results = [self.score(text) for text in texts]
+        if not results:
+            return np.zeros(0), np.zeros(0)
+        scores, confidences = zip(*results)
+        return np.array(scores), np.array(confidences)
+
+if __name__ == "__main__":
+    import time
+
+    texts = [
+        "Bitcoin is going to the moon! 🚀",
+        "I'm worried about the crypto market crash",
+        "Bitcoin price is stable today",
+        "This is the worst investment ever",
+        "Amazing gains on my crypto portfolio!",
+        "Bitcoin adoption is growing rapidly",
+        "I'm bullish on Bitcoin's future",
+        "The market is looking bearish today",
+        "Great time to buy the dip!",
+        "Bitcoin will revolutionize finance",
+        "Not bullish at all after this dump",
+        "Great rally but I fear a crash",
+    ]
+
+    scorer = FastSentimentScorer()
+    scores, confidences = scorer.score_many(texts)
+    for text, score, confidence in zip(texts, scores, confidences):
+        print(f"{score:+.2f}  conf {confidence:.2f}  {text}")
+
+    many = texts * 1000
+    start = time.perf_counter()
+    scorer.score_many(many)
+    print(f"\nFast tier: {len(many) / (time.perf_counter() - start):.0f} texts/s")
+    for cutoff in (0.3, 0.5, 0.7):
+        print(f"Escalated at confidence {cutoff}: {(confidences < cutoff).mean() * 100:.0f}%")
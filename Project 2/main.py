@@ -15,51 +15,102 @@ Features:
 - Simulated trading with performance tracking
 """
 
+import time
+PROCESS_START = time.perf_counter()  # Taken before the other imports, for the startup report
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import time
 import os
 import sys
 
-# Import our modules
+# Import our modules (heavy libraries inside them are imported on first use)
 from data_collector import DataCollector
 from sentiment_analyzer import SentimentAnalyzer
 from trading_signals import SentimentTradingBot
-from visualizer import SentimentVisualizer
+from sentiment_stream import StreamingSentimentAggregator
 import config
 
 class CryptoSentimentBot:
     def __init__(self):
         """Initialize the crypto sentiment analysis bot"""
-        print("🚀 Initializing Crypto Sentiment Analysis Bot...")
+        init_start = time.perf_counter()
+        print(f"🚀 Initializing Crypto Sentiment Analysis Bot... ({init_start - PROCESS_START:.2f}s)")
+        self.startup_times = {'imports': init_start - PROCESS_START}
         
+        step = time.perf_counter()
         self.data_collector = DataCollector()
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.startup_times['data_collector'] = time.perf_counter() - step
+        
+        # The model loads in a background thread while the first data is collected
+        step = time.perf_counter()
+        self.sentiment_analyzer = SentimentAnalyzer(load_in_background=config.BACKGROUND_MODEL_LOAD)
+        self.startup_times['sentiment_analyzer'] = time.perf_counter() - step
+        
         self.trading_bot = SentimentTradingBot()
-        self.visualizer = SentimentVisualizer()
+        self.sentiment_stream = StreamingSentimentAggregator()
+        self._visualizer = None
         
         self.data_history = []
         self.analysis_history = []
+        self.window_data = pd.DataFrame()
+        self._startup_reported = False
         
-        print("✅ Bot initialized successfully!")
+        self.startup_times['ready'] = time.perf_counter() - PROCESS_START
+        print(f"✅ Bot initialized successfully! ({self.startup_times['ready']:.2f}s)")
     
-    def collect_and_analyze(self, hours: int = 24) -> pd.DataFrame:
-        """Collect data and perform sentiment analysis"""
-        print(f"\n📊 Collecting data from the last {hours} hours...")
-        
-        # Collect data
-        data = self.data_collector.get_recent_data(hours=hours)
-        
-        if data.empty:
-            print("⚠️ No data collected. Check API configurations.")
-            return pd.DataFrame()
+    @property
+    def visualizer(self):
+        """Chart generator, created on first use since it imports matplotlib and seaborn"""
+        if self._visualizer is None:
+            from visualizer import SentimentVisualizer
+            self._visualizer = SentimentVisualizer()
+        return self._visualizer
+    
+    def print_startup_report(self):
+        """Print where startup time went, once the model has finished loading"""
+        if self._startup_reported or not self.sentiment_analyzer.is_loaded:
+            return
+        self._startup_reported = True
+        
+        analyzer = self.sentiment_analyzer
+        print(f"⏱️ Startup Report:")
+        print(f"   Imports: {self.startup_times['imports']:.2f}s")
+        print(f"   Data collector: {self.startup_times['data_collector']:.2f}s")
+        print(f"   Sentiment analyzer: {self.startup_times['sentiment_analyzer']:.2f}s")
+        print(f"   Bot ready after: {self.startup_times['ready']:.2f}s")
+        if analyzer.load_time is not None:
+            print(f"   Model load: {analyzer.load_time:.2f}s "
+                  f"({analyzer.load_time - analyzer.load_wait_time:.2f}s hidden behind other work, "
+                  f"{analyzer.load_wait_time:.2f}s waited)")
+    
+    def collect_and_analyze(self, hours: int = 24, incremental: bool = False) -> pd.DataFrame:
+        """Collect data and perform sentiment analysis
         
-        print(f"📈 Collected {len(data)} posts/tweets")
+        With `incremental`, only posts not seen in earlier cycles are collected
+        and scored, then merged into the retained window of the last `hours`.
+        """
+        print(f"\n📊 Collecting data from the last {hours} hours...")
         
-        # Perform sentiment analysis
-        print("🧠 Performing sentiment analysis...")
-        analyzed_data = self.sentiment_analyzer.analyze_dataframe(data)
+        if incremental:
+            analyzed_data = self.collect_and_analyze_new(hours)
+        else:
+            # Collect data
+            data = self.data_collector.get_recent_data(hours=hours)
+            
+            if data.empty:
+                print("⚠️ No data collected. Check API configurations.")
+                return pd.DataFrame()
+            
+            print(f"📈 Collected {len(data)} posts/tweets")
+            
+            # Perform sentiment analysis
+            print("🧠 Performing sentiment analysis...")
+            analyzed_data = self.sentiment_analyzer.analyze_dataframe(data)
+            
+            # Every post was re-scored, so the streaming aggregate starts over
+            self.sentiment_stream.reset()
+            self.sentiment_stream.add_dataframe(analyzed_data)
         
         if not analyzed_data.empty:
             # Get sentiment statistics
@@ -69,9 +120,56 @@ class CryptoSentimentBot:
             print(f"   Positive Posts: {stats.get('positive_count', 0)} ({stats.get('positive_percentage', 0):.1f}%)")
             print(f"   Negative Posts: {stats.get('negative_count', 0)} ({stats.get('negative_percentage', 0):.1f}%)")
             print(f"   Neutral Posts: {stats.get('neutral_count', 0)} ({stats.get('neutral_percentage', 0):.1f}%)")
+            self.print_cache_stats()
+        self.print_startup_report()
         
         return analyzed_data
     
+    def collect_and_analyze_new(self, hours: int = 24) -> pd.DataFrame:
+        """Score only new posts and merge them into the retained window"""
+        new_data = self.data_collector.collect_new_data()
+        print(f"📈 Collected {len(new_data)} new posts/tweets")
+        
+        if not new_data.empty:
+            print("🧠 Performing sentiment analysis on new posts...")
+            new_data = self.sentiment_analyzer.analyze_dataframe(new_data)
+            self.sentiment_stream.add_dataframe(new_data)
+        
+        window = self.merge_into_window(new_data, hours)
+        if window.empty:
+            print("⚠️ No data collected. Check API configurations.")
+        else:
+            print(f"🪟 Window: {len(window)} posts from the last {hours} hours")
+        return window
+    
+    def merge_into_window(self, analyzed_data: pd.DataFrame, hours: int = 24) -> pd.DataFrame:
+        """Add newly scored posts to the retained window and drop posts older than `hours`"""
+        frames = [df for df in (self.window_data, analyzed_data) if not df.empty]
+        if not frames:
+            return self.window_data
+        
+        window = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['id'], keep='last')
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        window = window[window['created_at'] >= cutoff_time]
+        self.window_data = window.sort_values('created_at', ascending=False).reset_index(drop=True)
+        return self.window_data
+    
+    def print_cache_stats(self):
+        """Print sentiment cache hit rates and cascade escalation/agreement rates"""
+        cache_stats = self.sentiment_analyzer.get_cache_stats()
+        if cache_stats.get('lookups'):
+            print(f"   Cache Hit Rate: {cache_stats['hit_rate'] * 100:.1f}% "
+                  f"({cache_stats['memory_hits']} memory, {cache_stats['disk_hits']} disk, "
+                  f"{cache_stats['duplicate_hits']} duplicate, {cache_stats['misses']} scored)")
+        cascade_stats = self.sentiment_analyzer.get_cascade_stats()
+        if cascade_stats['texts']:
+            print(f"   Escalated to Model: {cascade_stats['escalation_rate'] * 100:.1f}% "
+                  f"({cascade_stats['escalated']} of {cascade_stats['texts']} texts)")
+            if cascade_stats['audited']:
+                print(f"   Fast Tier Agreement: {cascade_stats['agreement_rate'] * 100:.1f}% "
+                      f"of {cascade_stats['audited']} audited texts "
+                      f"(mean |Δ| {cascade_stats['audit_mean_abs_diff']:.3f})")
+    
     def generate_trading_decision(self, analyzed_data: pd.DataFrame) -> dict:
         """Generate trading decision based on sentiment analysis"""
         print("\n💰 Generating trading decision...")
@@ -80,7 +178,9 @@ class CryptoSentimentBot:
             return {'action': 'HOLD', 'reason': 'No data available'}
         
         # Process sentiment data and get trading decision
-        decision = self.trading_bot.process_sentiment_data(analyzed_data)
+        stream = self.sentiment_stream
+        stream_stats = stream.get_stats(now=stream.clock()) if config.USE_STREAMING_SENTIMENT else None
+        decision = self.trading_bot.process_sentiment_data(analyzed_data, stream_stats)
         
         print(f"📈 Trading Decision: {decision['action']}")
         print(f"   Confidence: {decision.get('confidence', 0):.2f}")
@@ -89,16 +189,24 @@ class CryptoSentimentBot:
         
         return decision
     
-    def create_visualizations(self, analyzed_data: pd.DataFrame, save_charts: bool = True):
-        """Create comprehensive visualizations"""
+    def create_visualizations(self, analyzed_data: pd.DataFrame, save_charts: bool = True,
+                              signal_history: pd.DataFrame = None, aggregated: pd.DataFrame = None):
+        """Create comprehensive visualizations
+        
+        `signal_history` and `aggregated` default to the current signal history
+        and streaming buckets; pass snapshots to draw from a consistent view.
+        """
         print("\n📊 Creating visualizations...")
         
         if analyzed_data.empty:
             print("⚠️ No data available for visualization")
             return
         
-        # Get signal history
-        signal_history = self.trading_bot.signals.get_signal_history()
+        # Get signal history and the streaming per-bucket aggregates
+        if signal_history is None:
+            signal_history = self.trading_bot.signals.get_signal_history()
+        if aggregated is None:
+            aggregated = self.sentiment_stream.get_buckets()
         
         # Create various charts
         charts_created = []
@@ -110,7 +218,7 @@ class CryptoSentimentBot:
             print(f"   📈 Sentiment distribution chart: {os.path.basename(chart_path)}")
         
         # 2. Sentiment over time
-        chart_path = self.visualizer.plot_sentiment_over_time(analyzed_data, save=save_charts)
+        chart_path = self.visualizer.plot_sentiment_over_time(analyzed_data, save=save_charts, aggregated=aggregated)
         if chart_path:
             charts_created.append(chart_path)
             print(f"   📈 Sentiment over time chart: {os.path.basename(chart_path)}")
@@ -129,7 +237,8 @@ class CryptoSentimentBot:
                 print(f"   📈 Trading signals chart: {os.path.basename(chart_path)}")
         
         # 5. Comprehensive analysis dashboard
-        chart_path = self.visualizer.plot_comprehensive_analysis(analyzed_data, signal_history, save=save_charts)
+        chart_path = self.visualizer.plot_comprehensive_analysis(analyzed_data, signal_history, save=save_charts,
+                                                                 aggregated=aggregated)
         if chart_path:
             charts_created.append(chart_path)
             print(f"   📈 Comprehensive analysis dashboard: {os.path.basename(chart_path)}")
@@ -137,14 +246,14 @@ class CryptoSentimentBot:
         print(f"✅ Created {len(charts_created)} charts")
         return charts_created
     
-    def run_single_analysis(self, hours: int = 24, save_charts: bool = True):
+    def run_single_analysis(self, hours: int = 24, save_charts: bool = True, incremental: bool = False):
         """Run a single analysis cycle"""
         print(f"\n{'='*60}")
         print(f"🔄 Starting Analysis Cycle - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*60}")
         
         # Step 1: Collect and analyze data
-        analyzed_data = self.collect_and_analyze(hours)
+        analyzed_data = self.collect_and_analyze(hours, incremental)
         
         if analyzed_data.empty:
             print("❌ Analysis failed - no data available")
@@ -186,7 +295,7 @@ class CryptoSentimentBot:
                 print(f"\n🔄 Cycle {cycle_count}")
                 
                 # Run analysis
-                self.run_single_analysis(hours=24, save_charts=True)
+                self.run_single_analysis(hours=24, save_charts=True, incremental=config.INCREMENTAL_COLLECTION)
                 
                 # Wait for next cycle
                 if max_cycles is None or cycle_count < max_cycles:
@@ -201,6 +310,19 @@ class CryptoSentimentBot:
         # Print summary
         self.print_summary()
     
+    def run_pipeline(self, interval_minutes: int = 60, max_rounds: int = None, save_charts: bool = True):
+        """Run continuous monitoring with collection, inference and signals as concurrent stages"""
+        from pipeline import SentimentPipeline
+        
+        pipeline = SentimentPipeline(self)
+        try:
+            pipeline.run(interval_minutes, max_rounds, save_charts)
+        except Exception as e:
+            print(f"\n❌ Error during monitoring: {e}")
+            pipeline.stop()
+        
+        self.print_summary()
+    
     def print_summary(self):
         """Print analysis summary"""
         if not self.data_history:
@@ -268,6 +390,10 @@ class CryptoSentimentBot:
         
         # Analyze sample data
         analyzed_data = self.sentiment_analyzer.analyze_dataframe(sample_data)
+        self.sentiment_stream.reset()
+        self.sentiment_stream.add_dataframe(analyzed_data)
+        self.print_cache_stats()
+        self.print_startup_report()
         
         # Generate trading decision
         decision = self.generate_trading_decision(analyzed_data)
@@ -285,25 +411,25 @@ def main():
     print("🚀 Crypto Sentiment Analysis Bot")
     print("=" * 50)
     
-    # Initialize bot
-    bot = CryptoSentimentBot()
-    
-    # Parse command line arguments
+    # Parse command line arguments before anything is loaded, so --help is instant
     import argparse
     parser = argparse.ArgumentParser(description='Crypto Sentiment Analysis Bot')
-    parser.add_argument('--mode', choices=['single', 'continuous', 'demo'], 
+    parser.add_argument('--mode', choices=['single', 'continuous', 'pipeline', 'demo'], 
                        default='single', help='Operation mode')
     parser.add_argument('--hours', type=int, default=24, 
                        help='Hours of data to analyze')
     parser.add_argument('--interval', type=int, default=60, 
-                       help='Interval between analyses in minutes (continuous mode)')
+                       help='Interval between analyses (charts in pipeline mode) in minutes')
     parser.add_argument('--max-cycles', type=int, default=None, 
-                       help='Maximum number of cycles (continuous mode)')
+                       help='Maximum number of cycles (continuous mode) or collection rounds (pipeline mode)')
     parser.add_argument('--no-charts', action='store_true', 
                        help='Disable chart saving')
     
     args = parser.parse_args()
     
+    # Initialize bot
+    bot = CryptoSentimentBot()
+    
     try:
         if args.mode == 'demo':
             bot.demo_mode()
@@ -312,6 +438,12 @@ def main():
                 interval_minutes=args.interval,
                 max_cycles=args.max_cycles
             )
+        elif args.mode == 'pipeline':
+            bot.run_pipeline(
+                interval_minutes=args.interval,
+                max_rounds=args.max_cycles,
+                save_charts=not args.no_charts
+            )
         else:  # single mode
             bot.run_single_analysis(
                 hours=args.hours,
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+from typing import Dict
+import config
+
+INPUT_NAMES = ['input_ids', 'attention_mask']
+
+def model_directory(model_name: str) -> str:
+    """Directory holding the exported ONNX files for a HuggingFace model"""
+    return os.path.join(config.ONNX_MODEL_PATH, model_name.replace('/', '--'))
+
+def export_onnx(model_name: str, quantize: bool = True) -> str:
+    """Export a sequence classifier to ONNX once, optionally with dynamic int8 quantization
+
+    Returns the path of the model to run. Existing exports are reused.
+    """
+    directory = model_directory(model_name)
+    fp32_path = os.path.join(directory, 'model.onnx')
+    int8_path = os.path.join(directory, 'model.int8.onnx')
+    target = int8_path if quantize else fp32_path
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(directory, exist_ok=True)
+    if not os.path.exists(fp32_path):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        print(f"Exporting {model_name} to ONNX...")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name, return_dict=False)
+        model.eval()
+        sample = tokenizer(["Bitcoin is going to the moon!"], return_tensors="pt")
+
+        # Batch size and sequence length stay dynamic, so any padded batch can be fed
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in INPUT_NAMES),
+            fp32_path,
+            input_names=INPUT_NAMES,
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'},
+            },
+            opset_version=14,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        print("Quantizing ONNX model weights to int8...")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    print(f"ONNX model ready: {target}")
+    return target
+
+class OnnxSentimentModel:
+    """Sequence classifier running on ONNX Runtime's CPU execution provider"""
+
+    def __init__(self, model_name: str = None, quantize: bool = None, num_threads: int = None):
+        import onnxruntime as ort
+
+        self.model_name = model_name or config.SENTIMENT_MODEL
+        self.quantize = config.ONNX_QUANTIZE if quantize is None else quantize
+        self.path = export_onnx(self.model_name, self.quantize)
+
+        options = ort.SessionOptions()
+        # 0 lets ONNX Runtime choose (one thread per physical core)
+        options.intra_op_num_threads = num_threads or config.TORCH_NUM_THREADS or 0
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.path, options, providers=['CPUExecutionProvider'])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    @property
+    def name(self) -> str:
+        """Backend label, e.g. for cache keys and reports"""
+        return 'onnx-int8' if self.quantize else 'onnx'
+
+    def predict_probabilities(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Class probabilities (rows sum to 1) for a tokenized, padded batch"""
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+        logits = self.session.run(None, feed)[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
@@ -0,0 +1,361 @@
+import time
+import queue
+import threading
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+import config
+
+# Sent down the queues when the collector stops, so each stage drains and exits
+_DONE = object()
+# Sent down the queues after each collection round, so the round is recorded once
+_ROUND_END = object()
+
+class StageMetrics:
+    """Throughput, busy time and input-queue depth of one pipeline stage"""
+
+    def __init__(self, name: str, input_queue: queue.Queue = None):
+        self.name = name
+        self.input_queue = input_queue
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, items: int, seconds: float):
+        """Count one unit of work of `items` posts that took `seconds`"""
+        with self._lock:
+            self.items += items
+            self.batches += 1
+            self.busy_seconds += seconds
+
+    def record_blocked(self, seconds: float):
+        """Count time spent waiting for room in the next stage's queue (backpressure)"""
+        with self._lock:
+            self.blocked_seconds += seconds
+
+    def sample_queue(self) -> int:
+        """Current depth of the input queue, remembering the maximum"""
+        depth = self.input_queue.qsize() if self.input_queue is not None else 0
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+        return depth
+
+    def snapshot(self) -> Dict:
+        """Counters and rates since the stage started"""
+        depth = self.sample_queue()
+        with self._lock:
+            elapsed = max(time.perf_counter() - self.started, 1e-9)
+            return {
+                'stage': self.name,
+                'items': self.items,
+                'batches': self.batches,
+                'items_per_second': self.items / elapsed,
+                'utilization': min(self.busy_seconds / elapsed, 1.0),
+                'blocked_seconds': self.blocked_seconds,
+                'queue_depth': depth,
+                'max_queue_depth': self.max_queue_depth,
+            }
+
+class SentimentPipeline:
+    """Continuous mode as three concurrent stages joined by bounded queues
+
+    The collector streams each finished request into `posts_queue`, the
+    inference stage scores micro-batches of posts while further fetches are
+    in flight, and the signal stage updates the streaming aggregate, the
+    retained window and the trading decision as soon as a batch is scored.
+    Each collection round adds one entry to the bot's data_history once all
+    of its posts have been scored. When a queue is full the stage feeding it blocks, so a slow model holds
+    back collection instead of piling up unscored posts in memory.
+    """
+
+    def __init__(self, bot, hours: int = 24, queue_size: int = None, micro_batch: int = None,
+                 batch_wait: float = None, poll_seconds: float = None):
+        self.bot = bot
+        self.hours = hours
+        self.micro_batch = micro_batch or config.PIPELINE_MICRO_BATCH
+        self.batch_wait = config.PIPELINE_BATCH_WAIT if batch_wait is None else batch_wait
+        self.poll_seconds = config.PIPELINE_POLL_SECONDS if poll_seconds is None else poll_seconds
+        queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+
+        self.posts_queue = queue.Queue(maxsize=queue_size)
+        self.scored_queue = queue.Queue(maxsize=queue_size)
+        self.metrics = {
+            'collector': StageMetrics('collector'),
+            'inference': StageMetrics('inference', self.posts_queue),
+            'signal': StageMetrics('signal', self.scored_queue),
+        }
+
+        self.stop_event = threading.Event()
+        self.state_lock = threading.Lock()  # Guards the window, signals and aggregate shared with charting
+        self.latest_decision = None
+        self.rounds = 0
+        self.errors = []
+        self._threads = []
+
+    def _put(self, target: queue.Queue, item, stage: str) -> bool:
+        """Block until `target` has room, giving up if the pipeline is stopped"""
+        start = time.perf_counter()
+        while not self.stop_event.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.metrics[stage].record_blocked(time.perf_counter() - start)
+        return not self.stop_event.is_set()
+
+    def _get(self, source: queue.Queue, timeout: float = 0.1):
+        """Next item from `source`, or None after `timeout`"""
+        try:
+            return source.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _fail(self, stage: str, error: Exception):
+        """Record an unexpected stage error and stop the pipeline"""
+        print(f"\n❌ Error in {stage} stage: {error}")
+        self.errors.append((stage, error))
+        self.stop_event.set()
+
+    def _collector_stage(self, max_rounds: Optional[int]):
+        """Collect new posts every poll interval, passing each request's posts on as it completes"""
+        collector = self.bot.data_collector
+        metrics = self.metrics['collector']
+        try:
+            while not self.stop_event.is_set():
+                self.rounds += 1
+                round_start = time.perf_counter()
+                for df in collector.iter_collected(incremental=True):
+                    metrics.record(len(df), time.perf_counter() - round_start)
+                    for start in range(0, len(df), self.micro_batch):
+                        if not self._put(self.posts_queue, df.iloc[start:start + self.micro_batch], 'collector'):
+                            return
+                    round_start = time.perf_counter()
+                if not self._put(self.posts_queue, _ROUND_END, 'collector'):
+                    return
+
+                if max_rounds and self.rounds >= max_rounds:
+                    break
+                self.stop_event.wait(self.poll_seconds)
+        except Exception as e:
+            self._fail('collector', e)
+        finally:
+            self._put(self.posts_queue, _DONE, 'collector')
+
+    def _inference_stage(self):
+        """Score posts in micro-batches of up to `micro_batch` posts or `batch_wait` seconds"""
+        analyzer = self.bot.sentiment_analyzer
+        metrics = self.metrics['inference']
+        done = False
+        try:
+            while not done and not self.stop_event.is_set():
+                metrics.sample_queue()
+                first = self._get(self.posts_queue)
+                if first is None:
+                    continue
+                frames = []
+                round_end = first is _ROUND_END
+                if first is _DONE:
+                    done = True
+                elif not round_end:
+                    frames.append(first)
+
+                # Top up the batch with whatever arrives before the deadline or the end of the round
+                deadline = time.perf_counter() + self.batch_wait
+                while not done and not round_end and sum(len(df) for df in frames) < self.micro_batch:
+                    item = self._get(self.posts_queue, max(deadline - time.perf_counter(), 0))
+                    if item is None:
+                        break
+                    if item is _DONE:
+                        done = True
+                    elif item is _ROUND_END:
+                        round_end = True
+                    else:
+                        frames.append(item)
+
+                if frames:
+                    batch = pd.concat(frames, ignore_index=True)
+                    start = time.perf_counter()
+                    scored = analyzer.analyze_dataframe(batch)
+                    metrics.record(len(batch), time.perf_counter() - start)
+                    if not self._put(self.scored_queue, scored, 'inference'):
+                        return
+                if round_end and not self._put(self.scored_queue, _ROUND_END, 'inference'):
+                    return
+        except Exception as e:
+            self._fail('inference', e)
+        finally:
+            self._put(self.scored_queue, _DONE, 'inference')
+
+    def _signal_stage(self):
+        """Fold each scored batch into the aggregate and window, then refresh the trading decision"""
+        bot = self.bot
+        metrics = self.metrics['signal']
+        try:
+            while not self.stop_event.is_set():
+                metrics.sample_queue()
+                scored = self._get(self.scored_queue)
+                if scored is None:
+                    continue
+                if scored is _DONE:
+                    return
+                if scored is _ROUND_END:
+                    self._record_round()
+                    continue
+
+                start = time.perf_counter()
+                with self.state_lock:
+                    bot.sentiment_stream.add_dataframe(scored)
+                    window = bot.merge_into_window(scored, self.hours)
+                    stream = bot.sentiment_stream
+                    stream_stats = stream.get_stats(now=stream.clock()) if config.USE_STREAMING_SENTIMENT else None
+                    decision = bot.trading_bot.process_sentiment_data(window, stream_stats)
+                    self.latest_decision = decision
+                metrics.record(len(scored), time.perf_counter() - start)
+        except Exception as e:
+            self._fail('signal', e)
+
+    def _record_round(self):
+        """Add one data_history entry for a finished collection round, like a continuous-mode cycle"""
+        with self.state_lock:
+            window = self.bot.window_data
+            if self.latest_decision is None or window.empty:
+                return
+            self.bot.data_history.append({
+                'timestamp': datetime.now(),
+                'data_count': len(window),
+                'mean_sentiment': window['sentiment_score'].mean(),
+                'decision': self.latest_decision,
+                'charts_created': 0
+            })
+
+    def start(self, max_rounds: int = None):
+        """Start the three stage threads"""
+        self._threads = [
+            threading.Thread(target=self._collector_stage, args=(max_rounds,), name='pipeline-collector', daemon=True),
+            threading.Thread(target=self._inference_stage, name='pipeline-inference', daemon=True),
+            threading.Thread(target=self._signal_stage, name='pipeline-signal', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop every stage without draining the queues"""
+        self.stop_event.set()
+        self.join(timeout)
+
+    def join(self, timeout: float = None):
+        """Wait for the stage threads to exit"""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def is_running(self) -> bool:
+        """True while any stage thread is alive"""
+        return any(thread.is_alive() for thread in self._threads)
+
+    def get_metrics(self) -> List[Dict]:
+        """Per-stage throughput and queue-depth snapshots, in pipeline order"""
+        return [stage.snapshot() for stage in self.metrics.values()]
+
+    def print_metrics(self):
+        """Print per-stage throughput and queue depth"""
+        print(f"\n⚙️ Pipeline metrics (round {self.rounds}):")
+        print(f"   {'Stage':<10}{'Posts':>8}{'Batches':>9}{'Posts/s':>10}{'Busy':>7}{'Blocked':>9}{'Queue':>7}{'Max':>5}")
+        for stage in self.get_metrics():
+            print(f"   {stage['stage']:<10}{stage['items']:>8}{stage['batches']:>9}{stage['items_per_second']:>10.1f}"
+                  f"{stage['utilization'] * 100:>6.0f}%{stage['blocked_seconds']:>8.1f}s"
+                  f"{stage['queue_depth']:>7}{stage['max_queue_depth']:>5}")
+
+    def run(self, interval_minutes: float = 60, max_rounds: int = None, save_charts: bool = True,
+            report_seconds: float = None):
+        """Run the pipeline, reporting metrics and drawing charts from the calling thread
+
+        Charts are drawn here rather than in a stage thread, since matplotlib
+        is not thread-safe. With `max_rounds`, the pipeline stops once that
+        many collection rounds have been scored.
+        """
+        report_seconds = report_seconds or config.PIPELINE_REPORT_SECONDS
+        print(f"\n🔄 Starting pipelined monitoring (poll every {self.poll_seconds}s, "
+              f"micro-batch {self.micro_batch}, queue size {self.posts_queue.maxsize})")
+        self.start(max_rounds)
+
+        next_report = time.perf_counter() + report_seconds
+        next_charts = time.perf_counter() + interval_minutes * 60
+        try:
+            while self.is_running():
+                self.join(0.5)
+                now = time.perf_counter()
+                if now >= next_report:
+                    self.print_metrics()
+                    next_report = now + report_seconds
+                if save_charts and now >= next_charts:
+                    self.create_visualizations(save_charts)
+                    next_charts = now + interval_minutes * 60
+        except KeyboardInterrupt:
+            print(f"\n⏹️ Pipeline stopped by user after {self.rounds} rounds")
+            self.stop()
+
+        self.print_metrics()
+        if save_charts:
+            self.create_visualizations(save_charts)
+        if self.latest_decision:
+            print(f"\n📈 Latest Trading Decision: {self.latest_decision['action']}")
+            print(f"   Confidence: {self.latest_decision.get('confidence', 0):.2f}")
+            print(f"   Reason: {self.latest_decision.get('reason', 'N/A')}")
+
+    def create_visualizations(self, save_charts: bool = True):
+        """Draw charts from a snapshot of the window, aggregate and signal history
+        
+        Only the snapshot is taken under the state lock, so the signal stage
+        keeps running while the charts render.
+        """
+        with self.state_lock:
+            window = self.bot.window_data
+            signal_history = self.bot.trading_bot.signals.get_signal_history()
+            aggregated = self.bot.sentiment_stream.get_buckets()
+        if window.empty:
+            return
+        charts = self.bot.create_visualizations(window, save_charts, signal_history, aggregated)
+        
+        # Count the charts against the latest recorded round
+        with self.state_lock:
+            if charts and self.bot.data_history:
+                self.bot.data_history[-1]['charts_created'] += len(charts)
+
+if __name__ == "__main__":
+    from stub_social import StubSocialCollector
+    from sentiment_stream import StreamingSentimentAggregator
+    from trading_signals import SentimentTradingBot
+
+    class SlowAnalyzer:
+        """Stand-in model that takes a fixed time per batch plus a little per post"""
+
+        def analyze_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+            time.sleep(0.2 + 0.002 * len(df))
+            df = df.copy()
+            df['sentiment_score'] = [0.5 if '!' in text else -0.2 for text in df['text']]
+            return df
+
+    class DemoBot:
+        """Just the parts of CryptoSentimentBot the pipeline uses"""
+
+        def __init__(self):
+            self.data_collector = StubSocialCollector(latency=1.0, jitter=0.5, new_posts=40)
+            self.sentiment_analyzer = SlowAnalyzer()
+            self.sentiment_stream = StreamingSentimentAggregator()
+            self.trading_bot = SentimentTradingBot()
+            self.window_data = pd.DataFrame()
+            self.data_history = []
+
+        def merge_into_window(self, analyzed_data: pd.DataFrame, hours: int = 24) -> pd.DataFrame:
+            self.window_data = pd.concat([self.window_data, analyzed_data], ignore_index=True)
+            return self.window_data
+
+    pipeline = SentimentPipeline(DemoBot(), poll_seconds=1.0)
+    start = time.perf_counter()
+    pipeline.run(max_rounds=3, save_charts=False, report_seconds=2)
+    print(f"\n3 rounds collected, scored and signalled in {time.perf_counter() - start:.2f}s")
@@ -1,33 +1,112 @@
+import time
+import threading
+import zlib
 import pandas as pd
 import numpy as np
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
-from textblob import TextBlob
 from typing import List, Dict, Tuple
+from sentiment_cache import SentimentCache, normalize_text
+from fast_sentiment import FastSentimentScorer, categorize
 import config
 
+# torch, transformers and textblob are imported on first use: importing them
+# takes seconds, which would otherwise delay every startup (even --help)
+
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, load_in_background: bool = False):
         self.tokenizer = None
         self.model = None
-        self._load_model()
+        self.backend = None
+        self.cache = SentimentCache() if config.SENTIMENT_CACHE_ENABLED else None
+        self.fast_scorer = FastSentimentScorer() if config.CASCADE_ENABLED else None
+        self.reset_cascade_stats()
+        self.load_time = None
+        self.load_wait_time = 0.0
+        self._load_thread = None
+        
+        if load_in_background:
+            self._load_thread = threading.Thread(target=self._load_model, name='sentiment-model-loader', daemon=True)
+            self._load_thread.start()
+        else:
+            self._load_model()
+    
+    def wait_until_loaded(self):
+        """Block until a background model load has finished (safe to call from several threads)"""
+        load_thread = self._load_thread
+        if load_thread is None:
+            return
+        start = time.perf_counter()
+        load_thread.join()
+        self._load_thread = None
+        self.load_wait_time += time.perf_counter() - start
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model load (successful or not) has finished"""
+        load_thread = self._load_thread
+        return load_thread is None or not load_thread.is_alive()
     
     def _load_model(self):
         """Load the pre-trained sentiment analysis model"""
+        start = time.perf_counter()
         try:
             print(f"Loading sentiment model: {config.SENTIMENT_MODEL}")
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
             self.tokenizer = AutoTokenizer.from_pretrained(config.SENTIMENT_MODEL)
+            if config.SENTIMENT_BACKEND == 'onnx' and self._load_onnx_model():
+                return
             self.model = AutoModelForSequenceClassification.from_pretrained(config.SENTIMENT_MODEL)
             self.model.eval()
+            if config.TORCH_NUM_THREADS:
+                torch.set_num_threads(config.TORCH_NUM_THREADS)
+            self.backend = 'torch'
             print("Sentiment model loaded successfully")
         except Exception as e:
             print(f"Failed to load sentiment model: {e}")
             print("Falling back to TextBlob for sentiment analysis")
             self.model = None
             self.tokenizer = None
+            self.backend = None
+        finally:
+            self.load_time = time.perf_counter() - start
+    
+    def _load_onnx_model(self) -> bool:
+        """Load the ONNX Runtime backend, returning False to fall back to PyTorch"""
+        try:
+            from onnx_backend import OnnxSentimentModel
+            self.model = OnnxSentimentModel(config.SENTIMENT_MODEL)
+            self.backend = self.model.name
+            print(f"Sentiment model loaded successfully ({self.backend})")
+            return True
+        except Exception as e:
+            print(f"Failed to load ONNX backend: {e}")
+            print("Falling back to PyTorch")
+            self.model = None
+            return False
+    
+    @property
+    def _tensor_type(self) -> str:
+        """Tensor type the active backend consumes"""
+        return "pt" if self.backend == 'torch' else "np"
+    
+    def _predict_probabilities(self, inputs):
+        """Class probabilities for a tokenized batch with the active backend"""
+        if self.backend != 'torch':
+            return self.model.predict_probabilities(inputs)
+        import torch
+        with torch.inference_mode():
+            outputs = self.model(**inputs)
+            return torch.softmax(outputs.logits, dim=1)
     
     def analyze_text_transformer(self, text: str) -> float:
-        """Analyze sentiment using transformer model"""
+        """Analyze sentiment using transformer model, behind the fast-path cascade when enabled"""
+        self.wait_until_loaded()
+        if self.fast_scorer is not None and self.model and self.tokenizer:
+            return self.analyze_texts_cascade([text])[0]
+        return self._transformer_score(text)
+    
+    def _transformer_score(self, text: str) -> float:
+        """Score one text with the transformer model alone"""
         if not self.model or not self.tokenizer:
             return self.analyze_text_textblob(text)
         
@@ -38,32 +117,76 @@ class SentimentAnalyzer:
                 truncation=True, 
                 padding=True, 
                 max_length=config.MAX_TEXT_LENGTH,
-                return_tensors="pt"
+                return_tensors=self._tensor_type
             )
             
             # Get model prediction
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                probabilities = torch.softmax(outputs.logits, dim=1)
+            probabilities = self._predict_probabilities(inputs)
             
-            # Map to sentiment score (-1 to 1)
-            # Assuming model outputs: [negative, neutral, positive]
-            if probabilities.shape[1] == 3:
-                # Convert to -1 to 1 scale
-                sentiment_score = (probabilities[0][2] - probabilities[0][0]).item()
-            else:
-                # Binary classification
-                sentiment_score = (probabilities[0][1] - 0.5) * 2
-            
-            return sentiment_score
+            return self._probabilities_to_scores(probabilities)[0]
             
         except Exception as e:
             print(f"Error in transformer analysis: {e}")
             return self.analyze_text_textblob(text)
     
+    @staticmethod
+    def _probabilities_to_scores(probabilities) -> List[float]:
+        """Map class probabilities to sentiment scores (-1 to 1), one per row"""
+        # Assuming model outputs: [negative, neutral, positive]
+        if probabilities.shape[1] == 3:
+            scores = probabilities[:, 2] - probabilities[:, 0]
+        else:
+            # Binary classification
+            scores = (probabilities[:, 1] - 0.5) * 2
+        return scores.tolist()
+    
+    def analyze_texts_transformer(self, texts: List[str], batch_size: int = None) -> List[float]:
+        """Analyze many texts with batched forward passes
+        
+        Texts are tokenized once, sorted by token length and split into batches
+        that are only padded to their own longest text, so short posts are never
+        padded to MAX_TEXT_LENGTH. If a batch fails, only its texts are retried
+        one at a time (falling back to TextBlob per text).
+        """
+        self.wait_until_loaded()
+        if not self.model or not self.tokenizer:
+            return [self.analyze_text_textblob(text) for text in texts]
+        if not texts:
+            return []
+        
+        batch_size = batch_size or config.SENTIMENT_BATCH_SIZE
+        try:
+            encodings = self.tokenizer(list(texts), truncation=True, max_length=config.MAX_TEXT_LENGTH)
+        except Exception as e:
+            print(f"Error tokenizing batch: {e}")
+            return [self._transformer_score(text) for text in texts]
+        
+        # Length buckets: neighbours in this order have similar token counts
+        order = sorted(range(len(texts)), key=lambda i: len(encodings['input_ids'][i]))
+        sentiments = [0.0] * len(texts)
+        
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            try:
+                inputs = self.tokenizer.pad(
+                    {key: [encodings[key][i] for i in batch] for key in encodings.keys()},
+                    padding=True,
+                    return_tensors=self._tensor_type
+                )
+                scores = self._probabilities_to_scores(self._predict_probabilities(inputs))
+            except Exception as e:
+                print(f"Error in batched transformer analysis ({len(batch)} texts), retrying one by one: {e}")
+                scores = [self._transformer_score(texts[i]) for i in batch]
+            
+            for i, score in zip(batch, scores):
+                sentiments[i] = score
+        
+        return sentiments
+    
     def analyze_text_textblob(self, text: str) -> float:
         """Analyze sentiment using TextBlob as fallback"""
         try:
+            from textblob import TextBlob
             blob = TextBlob(text)
             return blob.sentiment.polarity
         except Exception as e:
@@ -72,18 +195,108 @@ class SentimentAnalyzer:
     
     def analyze_text(self, text: str) -> float:
         """Analyze sentiment of text using best available method"""
+        self.wait_until_loaded()
         if self.model:
             return self.analyze_text_transformer(text)
         else:
             return self.analyze_text_textblob(text)
     
-    def analyze_batch(self, texts: List[str]) -> List[float]:
-        """Analyze sentiment for a batch of texts"""
-        sentiments = []
-        for text in texts:
-            sentiment = self.analyze_text(text)
-            sentiments.append(sentiment)
-        return sentiments
+    @property
+    def backend_name(self) -> str:
+        """Name of the scoring backend, part of every cache key"""
+        return self._backend_label()
+    
+    def _backend_label(self, confidence: float = None) -> str:
+        """Backend name including the cascade cutoff, audit rate and lexicon version actually applied"""
+        if not self.model:
+            return 'textblob'
+        name = config.SENTIMENT_MODEL if self.backend == 'torch' else f"{config.SENTIMENT_MODEL}:{self.backend}"
+        if self.fast_scorer is not None:
+            cutoff = config.CASCADE_CONFIDENCE if confidence is None else confidence
+            name += f"+cascade@{cutoff}/audit{config.CASCADE_AUDIT_RATE}/{self.fast_scorer.version}"
+        return name
+    
+    def analyze_batch(self, texts: List[str], confidence: float = None) -> List[float]:
+        """Analyze sentiment for a batch of texts, scoring only texts not seen before
+        
+        `confidence` overrides CASCADE_CONFIDENCE for this call.
+        """
+        self.wait_until_loaded()
+        if self.cache is None:
+            return self._score_texts(texts, confidence)
+        
+        keys = [SentimentCache.make_key(text, self._backend_label(confidence)) for text in texts]
+        scores = self.cache.get_many(keys)
+        
+        # Each unseen text is scored once, in its normalized form
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in scores and key not in pending:
+                pending[key] = normalize_text(text)
+        if pending:
+            new_scores = dict(zip(pending.keys(), self._score_texts(list(pending.values()), confidence)))
+            self.cache.put_many(new_scores)
+            scores.update(new_scores)
+        
+        return [scores[key] for key in keys]
+    
+    def _score_texts(self, texts: List[str], confidence: float = None) -> List[float]:
+        """Score texts with the active backend, bypassing the cache"""
+        if self.model:
+            if self.fast_scorer is not None:
+                return self.analyze_texts_cascade(texts, confidence)
+            return self.analyze_texts_transformer(texts)
+        return [self.analyze_text_textblob(text) for text in texts]
+    
+    def analyze_texts_cascade(self, texts: List[str], confidence: float = None) -> List[float]:
+        """Score texts with the fast lexicon tier, escalating ambiguous ones to the model
+        
+        Texts whose fast-tier confidence is below `confidence` (default
+        CASCADE_CONFIDENCE) are scored by the transformer in batches. A
+        CASCADE_AUDIT_RATE share of the confident texts is scored by both
+        tiers, to measure how often the fast tier agrees with the model.
+        """
+        if not texts:
+            return []
+        cutoff = config.CASCADE_CONFIDENCE if confidence is None else confidence
+        fast_scores, confidences = self.fast_scorer.score_many(texts)
+        confident = confidences >= cutoff
+        
+        # Audit a stable sample of confident texts, chosen by a hash of the text so
+        # the same text gets the same score whether it is scored alone or in a batch
+        audit = np.zeros(len(texts), dtype=bool)
+        confident_idx = np.flatnonzero(confident)
+        if config.CASCADE_AUDIT_RATE > 0:
+            stride = max(1, round(1 / config.CASCADE_AUDIT_RATE))
+            hashes = np.array([zlib.crc32(texts[i].encode('utf-8')) for i in confident_idx], dtype=np.int64)
+            audit[confident_idx[hashes % stride == 0]] = True
+        
+        to_model = np.flatnonzero(~confident | audit)
+        scores = fast_scores.copy()
+        if len(to_model):
+            scores[to_model] = self.analyze_texts_transformer([texts[i] for i in to_model])
+        
+        audited = np.flatnonzero(audit)
+        stats = self.cascade_stats
+        stats['texts'] += len(texts)
+        stats['fast'] += len(confident_idx)
+        stats['escalated'] += int(len(texts) - len(confident_idx))
+        stats['audited'] += len(audited)
+        stats['agreed'] += int((categorize(fast_scores[audited]) == categorize(scores[audited])).sum())
+        stats['audit_abs_diff'] += float(np.abs(fast_scores[audited] - scores[audited]).sum())
+        return scores.tolist()
+    
+    def get_cascade_stats(self) -> Dict:
+        """Escalation rate of the cascade and agreement of the fast tier with the model"""
+        stats = dict(self.cascade_stats)
+        stats['escalation_rate'] = stats['escalated'] / stats['texts'] if stats['texts'] else 0.0
+        stats['agreement_rate'] = stats['agreed'] / stats['audited'] if stats['audited'] else None
+        stats['audit_mean_abs_diff'] = stats.pop('audit_abs_diff') / stats['audited'] if stats['audited'] else None
+        return stats
+    
+    def reset_cascade_stats(self):
+        """Start counting cascade metrics from zero"""
+        self.cascade_stats = {'texts': 0, 'fast': 0, 'escalated': 0, 'audited': 0, 'agreed': 0, 'audit_abs_diff': 0.0}
     
     def analyze_dataframe(self, df: pd.DataFrame, text_column: str = 'text') -> pd.DataFrame:
         """Analyze sentiment for all texts in a dataframe"""
@@ -93,13 +306,8 @@ class SentimentAnalyzer:
         # Create a copy to avoid modifying original
         result_df = df.copy()
         
-        # Analyze sentiment for each text
-        sentiments = []
-        for text in result_df[text_column]:
-            sentiment = self.analyze_text(str(text))
-            sentiments.append(sentiment)
-        
-        result_df['sentiment_score'] = sentiments
+        # Analyze sentiment for all texts in batches
+        result_df['sentiment_score'] = self.analyze_batch([str(text) for text in result_df[text_column]])
         
         # Add sentiment category
         result_df['sentiment_category'] = result_df['sentiment_score'].apply(
@@ -108,6 +316,10 @@ class SentimentAnalyzer:
         
         return result_df
     
+    def get_cache_stats(self) -> Dict:
+        """Hit rates of the sentiment score cache"""
+        return self.cache.get_stats() if self.cache else {}
+    
     def get_sentiment_statistics(self, df: pd.DataFrame) -> Dict:
         """Get sentiment statistics from analyzed dataframe"""
         if df.empty or 'sentiment_score' not in df.columns:
@@ -177,4 +389,17 @@ if __name__ == "__main__":
         sentiment = analyzer.analyze_text(text)
         print(f"Text: {text}")
         print(f"Sentiment: {sentiment:.3f}")
-        print("-" * 50) 
\ No newline at end of file
+        print("-" * 50)
+    
+    # Throughput: one text per forward pass vs batched inference
+    import time
+    texts = test_texts * 40
+    start = time.perf_counter()
+    single = [analyzer.analyze_text(text) for text in texts]
+    single_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = analyzer.analyze_batch(texts)
+    batch_time = time.perf_counter() - start
+    print(f"One by one: {len(texts) / single_time:.1f} texts/s")
+    print(f"Batched:    {len(texts) / batch_time:.1f} texts/s ({single_time / batch_time:.1f}x)")
+    print(f"Max score difference: {max(abs(a - b) for a, b in zip(single, batched)):.2e}") 
\ No newline at end of file
@@ -0,0 +1,148 @@
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Dict, Optional
+import config
+
+# Retweet prefix ("RT @user: ") that makes a copy of a post look like new text
+RETWEET_PREFIX = re.compile(r'^(rt\s+@\w+:?\s*)+', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a post: NFKC, no retweet prefix, collapsed whitespace"""
+    text = unicodedata.normalize('NFKC', str(text))
+    text = RETWEET_PREFIX.sub('', text.strip())
+    return WHITESPACE.sub(' ', text).strip()
+
+class SentimentCache:
+    """Content-addressed cache of sentiment scores
+
+    Scores are keyed by a hash of the scoring backend and the normalized text,
+    so retweets, cross-posts and posts seen in earlier cycles are never scored
+    twice. Lookups go to an in-memory LRU first, then to a local SQLite store
+    that survives restarts.
+    """
+
+    def __init__(self, path: str = None, memory_size: int = None):
+        self.path = path or config.SENTIMENT_CACHE_PATH
+        self.memory_size = memory_size or config.SENTIMENT_CACHE_MEMORY_SIZE
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.duplicate_hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, score REAL NOT NULL)')
+        self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, backend: str) -> str:
+        """Hash of the scoring backend and the normalized text"""
+        return hashlib.sha1(f"{backend}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, score: float):
+        """Insert into the LRU, evicting the least recently used entries"""
+        self._memory[key] = score
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        """Look up cached scores, returning only the keys that were found"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            # One query per chunk, below SQLite's bound-parameter limit
+            unique_missing = list(dict.fromkeys(missing))
+            stored = {}
+            for start in range(0, len(unique_missing), 500):
+                chunk = unique_missing[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, score FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                stored.update(rows)
+
+            seen = set()
+            for key in missing:
+                if key in stored:
+                    found[key] = stored[key]
+                    self._remember(key, stored[key])
+                    self.disk_hits += 1
+                elif key in seen:
+                    # Repeated within this lookup, scored once by the caller
+                    self.duplicate_hits += 1
+                else:
+                    seen.add(key)
+                    self.misses += 1
+        return found
+
+    def put_many(self, scores: Dict[str, float]):
+        """Store new scores in memory and on disk"""
+        if not scores:
+            return
+        with self._lock:
+            for key, score in scores.items():
+                self._remember(key, float(score))
+            self._db.executemany('INSERT OR REPLACE INTO scores (key, score) VALUES (?, ?)',
+                                 [(key, float(score)) for key, score in scores.items()])
+            self._db.commit()
+
+    def get_stats(self) -> Dict:
+        """Hit counts and rates since the cache was opened"""
+        hits = self.memory_hits + self.disk_hits + self.duplicate_hits
+        lookups = hits + self.misses
+        return {
+            'lookups': lookups,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'duplicate_hits': self.duplicate_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+        }
+
+    def reset_stats(self):
+        """Start counting hits from zero (e.g. at the start of a cycle)"""
+        self.memory_hits = self.disk_hits = self.duplicate_hits = self.misses = 0
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self._db.close()
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+
+    # Demo-mode style data: 10 texts repeated, plus retweets of them
+    texts = [f"Bitcoin post number {i % 10}" for i in range(1000)]
+    texts += [f"RT @trader{i}: Bitcoin post number {i % 10}" for i in range(1000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SentimentCache(os.path.join(tmp, 'scores.db'))
+        keys = [SentimentCache.make_key(text, 'demo') for text in texts]
+        found = cache.get_many(keys)
+        cache.put_many({key: 0.5 for key in keys if key not in found})
+
+        start = time.perf_counter()
+        cache.reset_stats()
+        cache.get_many(keys)
+        print(f"Looked up {len(keys)} texts in {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"Unique keys: {len(set(keys))}, stats: {cache.get_stats()}")
+        cache.close()
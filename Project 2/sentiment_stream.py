@@ -0,0 +1,224 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict
+from trading_signals import engagement_weights
+import config
+
+# Per-bucket statistics kept in the ring buffer
+COUNT, SUM, SUM_SQ, POSITIVE, NEGATIVE = range(5)
+
+class StreamingSentimentAggregator:
+    """Time-bucketed sentiment over a sliding window, updated in O(1) per post
+
+    Posts are added to fixed-width time buckets held in a ring buffer that
+    covers the window. Every bucket keeps its post count, score sum, sum of
+    squares and positive/negative counts, and window totals are adjusted as
+    buckets are filled and expire, so rolling count, mean and std never
+    rescan old posts. An engagement-weighted score with exponential time
+    decay is maintained alongside. It is blended with a neutral prior of
+    SENTIMENT_DECAY_PRIOR_WEIGHT at the current time, so when no new posts
+    arrive (pass `now` to get_stats) the score fades towards 0 and the
+    buckets expire instead of the last score driving signals indefinitely.
+    """
+
+    def __init__(self, bucket_minutes: float = None, window_hours: float = None, half_life_hours: float = None):
+        bucket_minutes = bucket_minutes or config.SENTIMENT_BUCKET_MINUTES
+        window_hours = window_hours or config.SENTIMENT_WINDOW_HOURS
+        self.bucket_seconds = int(bucket_minutes * 60)
+        self.n_buckets = max(1, math.ceil(window_hours * 3600 / self.bucket_seconds))
+        self.half_life = (half_life_hours or config.SENTIMENT_HALF_LIFE_HOURS) * 3600
+        self.prior_weight = config.SENTIMENT_DECAY_PRIOR_WEIGHT
+        self.reset()
+
+    def reset(self):
+        """Forget every post"""
+        self.bucket_ids = np.full(self.n_buckets, -1, dtype=np.int64)
+        self.buckets = np.zeros((self.n_buckets, 5))
+        self.totals = np.zeros(5)
+        self.head = None
+        self.tz = None
+        self.decayed_sum = 0.0
+        self.decayed_weight = 0.0
+        self.decay_time = None
+        self.posts_added = 0
+        self.posts_dropped = 0
+
+    def _advance(self, bucket_id: int):
+        """Move the newest bucket forward, expiring the buckets that leave the window"""
+        if self.head is None:
+            self.head = bucket_id
+            return
+        if bucket_id <= self.head:
+            return
+        for expired in range(max(self.head + 1, bucket_id - self.n_buckets + 1), bucket_id + 1):
+            slot = expired % self.n_buckets
+            self.totals -= self.buckets[slot]
+            self.buckets[slot] = 0.0
+            self.bucket_ids[slot] = expired
+        self.head = bucket_id
+
+    def add(self, timestamps: np.ndarray, scores: np.ndarray, weights: np.ndarray = None):
+        """Add scored posts
+
+        Args:
+            timestamps: Post times in epoch seconds
+            scores: Sentiment scores (-1 to 1)
+            weights: Engagement weights for the decayed score (default 1)
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        weights = np.ones(len(scores)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if len(scores) == 0:
+            return
+
+        bucket_ids = timestamps // self.bucket_seconds
+        self._advance(int(bucket_ids.max()))
+
+        # Posts older than the window are counted but not stored
+        in_window = bucket_ids > self.head - self.n_buckets
+        self.posts_dropped += int(len(scores) - np.count_nonzero(in_window))
+        timestamps, scores, weights, bucket_ids = (
+            timestamps[in_window], scores[in_window], weights[in_window], bucket_ids[in_window])
+        if len(scores) == 0:
+            return
+
+        slots = bucket_ids % self.n_buckets
+        self.bucket_ids[slots] = bucket_ids
+        values = np.column_stack([np.ones(len(scores)), scores, scores ** 2, scores > 0.1, scores < -0.1])
+        for column in range(values.shape[1]):
+            self.buckets[:, column] += np.bincount(slots, weights=values[:, column], minlength=self.n_buckets)
+        self.totals += values.sum(axis=0)
+        self.posts_added += len(scores)
+
+        # Decay the running sums to the newest post, then add the new posts decayed to that time
+        self._decay_to(int(timestamps.max()))
+        decay = weights * 0.5 ** ((self.decay_time - timestamps) / self.half_life)
+        self.decayed_sum += float(scores @ decay)
+        self.decayed_weight += float(decay.sum())
+
+    def _decay_to(self, timestamp: int):
+        """Decay the running weighted sums forward to `timestamp` (epoch seconds)"""
+        if self.decay_time is None:
+            self.decay_time = timestamp
+        elif timestamp > self.decay_time:
+            factor = 0.5 ** ((timestamp - self.decay_time) / self.half_life)
+            self.decayed_sum *= factor
+            self.decayed_weight *= factor
+            self.decay_time = timestamp
+
+    def clock(self) -> pd.Timestamp:
+        """Current time on the posts' clock: in their timezone, or naive like the posts"""
+        return pd.Timestamp.now(tz=self.tz)
+
+    def add_dataframe(self, df: pd.DataFrame):
+        """Add analyzed posts (created_at and sentiment_score columns), weighted by engagement"""
+        if df.empty or 'sentiment_score' not in df.columns or 'created_at' not in df.columns:
+            return
+        created_at = df['created_at']
+        if not pd.api.types.is_datetime64_any_dtype(created_at):
+            created_at = pd.to_datetime(created_at)
+        created_at = pd.DatetimeIndex(created_at)
+        if self.tz is None:
+            self.tz = created_at.tz
+        timestamps = created_at.as_unit('s').asi8
+        self.add(timestamps, df['sentiment_score'].to_numpy(dtype=np.float64), engagement_weights(df))
+
+    def get_buckets(self) -> pd.DataFrame:
+        """Per-bucket mean, std and count from the first non-empty bucket to the newest
+
+        Same columns as SentimentAnalyzer.get_aggregated_sentiment.
+        """
+        if self.head is None:
+            return pd.DataFrame()
+
+        ids = np.arange(self.head - self.n_buckets + 1, self.head + 1)
+        slots = ids % self.n_buckets
+        stats = np.where((self.bucket_ids[slots] == ids)[:, None], self.buckets[slots], 0.0)
+        filled = np.flatnonzero(stats[:, COUNT] > 0)
+        if len(filled) == 0:
+            return pd.DataFrame()
+        ids, stats = ids[filled[0]:], stats[filled[0]:]
+
+        count, total, total_sq = stats[:, COUNT], stats[:, SUM], stats[:, SUM_SQ]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, 0.0)
+            variance = np.where(count > 1, (total_sq - total * mean) / (count - 1), 0.0)
+
+        created_at = pd.to_datetime(ids * self.bucket_seconds, unit='s', utc=self.tz is not None)
+        if self.tz is not None:
+            created_at = created_at.tz_convert(self.tz)
+        return pd.DataFrame({
+            'created_at': created_at,
+            'sentiment_mean': mean,
+            'sentiment_std': np.sqrt(np.maximum(variance, 0.0)),
+            'post_count': count.astype(np.int64),
+        })
+
+    def get_stats(self, now=None) -> Dict:
+        """Rolling window statistics and the decayed engagement-weighted score
+
+        Args:
+            now: Time to decay the score and expire buckets to (datetime or
+                epoch seconds, on the posts' clock, see clock()); by default
+                the newest post's time
+        """
+        if now is not None and self.head is not None:
+            if not isinstance(now, (int, float, np.integer, np.floating)):
+                # Naive times count as UTC, matching how add_dataframe converts posts
+                now = pd.Timestamp(now).timestamp()
+            now = int(now)
+            self._advance(now // self.bucket_seconds)
+            self._decay_to(now)
+            # Posts that left the window no longer count towards the score
+            if self.totals[COUNT] < 0.5:
+                self.decayed_sum = self.decayed_weight = 0.0
+
+        count, total, total_sq, positive, negative = self.totals.tolist()
+        count = int(round(count))
+        mean = total / count if count else 0.0
+        variance = (total_sq - total * mean) / (count - 1) if count > 1 else 0.0
+        return {
+            'decayed_sentiment': (self.decayed_sum / (self.decayed_weight + self.prior_weight)
+                                  if self.decayed_weight > 0 else mean),
+            'mean_sentiment': mean,
+            'std_sentiment': math.sqrt(max(variance, 0.0)),
+            'total_posts': count,
+            'positive_posts': int(round(positive)),
+            'negative_posts': int(round(negative)),
+            'positive_ratio': positive / count if count else 0.0,
+            'negative_ratio': negative / count if count else 0.0,
+            'window_hours': self.n_buckets * self.bucket_seconds / 3600,
+        }
+
+if __name__ == "__main__":
+    import time
+
+    # A day of posts arriving in 200 batches: streaming updates vs resampling everything so far each time
+    rng = np.random.default_rng(42)
+    n = 200_000
+    posts = pd.DataFrame({
+        'created_at': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.uniform(0, 86400, n)), unit='s'),
+        'sentiment_score': rng.uniform(-1, 1, n),
+        'source': 'other',
+    })
+
+    aggregator = StreamingSentimentAggregator()
+    start = time.perf_counter()
+    for batch_start in range(0, n, n // 200):
+        aggregator.add_dataframe(posts.iloc[batch_start:batch_start + n // 200])
+        aggregator.get_stats()
+    streaming_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for batch_end in range(n // 200, n + 1, n // 200):
+        seen = posts.iloc[:batch_end].copy()
+        seen['created_at'] = pd.to_datetime(seen['created_at'])
+        resampled = seen.set_index('created_at')['sentiment_score'].resample('1h').agg(['mean', 'std', 'count']).fillna(0)
+    resample_time = time.perf_counter() - start
+
+    buckets = aggregator.get_buckets()
+    print(f"Streaming: {streaming_time * 1000:.1f} ms for 200 updates")
+    print(f"Resampling from scratch: {resample_time * 1000:.1f} ms for 200 updates")
+    print(f"Max mean difference vs resample: {np.abs(buckets['sentiment_mean'].to_numpy() - resampled['mean'].to_numpy()).max():.2e}")
+    print(aggregator.get_stats())
@@ -0,0 +1,140 @@
+import time
+import random
+import itertools
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict
+from data_collector import DataCollector
+import config
+
+STUB_TEXTS = [
+    "Bitcoin is going to the moon! 🚀",
+    "I'm worried about the crypto market crash",
+    "Bitcoin price is stable today",
+    "This is the worst investment ever",
+    "Amazing gains on my crypto portfolio!",
+    "Bitcoin adoption is growing rapidly",
+    "The market is looking bearish today",
+    "Great time to buy the dip!",
+]
+
+class StubSocialCollector(DataCollector):
+    """Offline stand-in for the Twitter and Reddit APIs
+
+    Returns synthetic posts after a simulated round-trip time, so collection
+    code can be exercised and benchmarked without credentials or network.
+    Post IDs increase over time like tweet IDs, and requests with a
+    high-water mark only return up to `new_posts` freshly created posts.
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, seed: int = 42, new_posts: int = 10, **kwargs):
+        self.latency = latency
+        self.jitter = jitter
+        self.new_posts = new_posts
+        self.calls = 0
+        self.latencies = []
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        super().__init__(**kwargs)
+
+    def _initialize_apis(self):
+        """No real clients are needed"""
+        pass
+
+    def _simulate_request(self) -> float:
+        """Sleep for one simulated round trip and record it"""
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        self.latencies.append(delay)
+        self.calls += 1
+        time.sleep(delay)
+        return delay
+
+    def _posts(self, source: str, count: int, fresh: bool = False) -> list:
+        """Synthetic posts from the last 24 hours, or created just now if `fresh`"""
+        now = datetime.now()
+        posts = []
+        for _ in range(count):
+            post_id = next(self._ids)
+            posts.append({
+                'id': post_id if source == 'twitter' else f"{source}-{post_id}",
+                'text': self._rng.choice(STUB_TEXTS),
+                'created_at': now if fresh else now - timedelta(minutes=self._rng.uniform(0, 24 * 60)),
+                'user': f"user_{self._rng.randint(0, 999)}",
+                'source': source,
+            })
+        return posts
+
+    def _count(self, limit: int, incremental: bool) -> int:
+        """Posts in a response: a full page, or the few created since the last request"""
+        return min(limit, self._rng.randint(0, self.new_posts)) if incremental else limit
+
+    def collect_tweets(self, query: str = "bitcoin", max_tweets: int = None, since_id: int = None) -> pd.DataFrame:
+        """Synthetic tweets after a simulated delay"""
+        self._simulate_request()
+        count = self._count(max_tweets or config.MAX_TWEETS_PER_QUERY, since_id is not None)
+        posts = self._posts('twitter', count, fresh=since_id is not None)
+        for post in posts:
+            post['retweet_count'] = self._rng.randint(0, 100)
+            post['favorite_count'] = self._rng.randint(0, 50)
+        return pd.DataFrame(posts)
+
+    def collect_reddit_posts(self, subreddit_name: str = "Bitcoin", max_posts: int = None,
+                             newer_than: datetime = None) -> pd.DataFrame:
+        """Synthetic Reddit posts after a simulated delay"""
+        self._simulate_request()
+        count = self._count(max_posts or config.MAX_REDDIT_POSTS_PER_QUERY, newer_than is not None)
+        posts = self._posts('reddit', count, fresh=newer_than is not None)
+        for post in posts:
+            post['score'] = self._rng.randint(0, 1000)
+            post['upvote_ratio'] = self._rng.uniform(0.5, 1.0)
+        return pd.DataFrame(posts)
+
+def benchmark_collection(latency: float = 1.0, jitter: float = 0.5, subreddits: int = 3) -> Dict:
+    """Compare one-request-at-a-time collection with concurrent collection against the stub APIs"""
+    config.REDDIT_SUBREDDITS = [f"Subreddit{i}" for i in range(subreddits)]
+
+    sequential = StubSocialCollector(latency, jitter, max_workers=1)
+    start = time.perf_counter()
+    sequential_posts = len(sequential.collect_all_data())
+    sequential_time = time.perf_counter() - start
+
+    concurrent = StubSocialCollector(latency, jitter)
+    start = time.perf_counter()
+    concurrent_posts = len(concurrent.collect_all_data())
+    concurrent_time = time.perf_counter() - start
+
+    # A timeout shorter than the slowest request returns whatever has arrived
+    partial = StubSocialCollector(latency, jitter)
+    partial_posts = len(partial.collect_all_data(timeout=latency * 1.2))
+
+    return {
+        'requests': concurrent.calls,
+        'sequential_time': sequential_time,
+        'sequential_posts': sequential_posts,
+        'concurrent_time': concurrent_time,
+        'concurrent_posts': concurrent_posts,
+        'partial_posts': partial_posts,
+        'partial_stats': partial.last_collection_stats,
+    }
+
+def benchmark_incremental(cycles: int = 5, latency: float = 0.05) -> list:
+    """Posts returned per cycle by full and incremental collection against the stub APIs"""
+    full = StubSocialCollector(latency)
+    incremental = StubSocialCollector(latency)
+    return [(len(full.collect_all_data()), len(incremental.collect_new_data())) for _ in range(cycles)]
+
+if __name__ == "__main__":
+    results = benchmark_collection()
+
+    print("\nCollection benchmark (offline stub APIs):")
+    print(f"  Requests per cycle: {results['requests']}")
+    print(f"  Sequential: {results['sequential_time']:.2f}s ({results['sequential_posts']} posts)")
+    print(f"  Concurrent: {results['concurrent_time']:.2f}s ({results['concurrent_posts']} posts)")
+    print(f"  Speedup: {results['sequential_time'] / results['concurrent_time']:.1f}x")
+    stats = results['partial_stats']
+    print(f"  With a short timeout: {results['partial_posts']} posts from "
+          f"{stats['completed']}/{stats['requests']} requests")
+
+    print("\nPosts to score per cycle (full vs incremental collection):")
+    for cycle, (full, new) in enumerate(benchmark_incremental(), 1):
+        print(f"  Cycle {cycle}: {full} vs {new}")
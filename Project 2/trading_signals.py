@@ -1,13 +1,70 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Callable
 import config
 
+def _column(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """Column as float array with missing values (or a missing column) set to `default`"""
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=np.float64)
+    return df[name].fillna(default).to_numpy(dtype=np.float64)
+
+def twitter_engagement_weight(df: pd.DataFrame) -> np.ndarray:
+    """Retweets + likes + 1"""
+    return _column(df, 'retweet_count', 0) + _column(df, 'favorite_count', 0) + 1
+
+def reddit_engagement_weight(df: pd.DataFrame) -> np.ndarray:
+    """(Score + 1) * upvote ratio"""
+    return (_column(df, 'score', 0) + 1) * _column(df, 'upvote_ratio', 0.5)
+
+# Engagement weight formula per source; posts from other sources weigh 1
+ENGAGEMENT_WEIGHTS: Dict[str, Callable[[pd.DataFrame], np.ndarray]] = {
+    'twitter': twitter_engagement_weight,
+    'reddit': reddit_engagement_weight,
+}
+
+def register_engagement_weight(source: str, weight_function: Callable[[pd.DataFrame], np.ndarray]):
+    """Set the engagement weight formula for a source (a function of the whole frame's columns)"""
+    ENGAGEMENT_WEIGHTS[source] = weight_function
+
+def engagement_weights(df: pd.DataFrame) -> np.ndarray:
+    """Engagement weight of every post, computed with column operations"""
+    weights = np.ones(len(df))
+    if 'source' not in df.columns:
+        return weights
+    
+    source = df['source'].to_numpy()
+    for name, weight_function in ENGAGEMENT_WEIGHTS.items():
+        is_source = source == name
+        if is_source.any():
+            weights = np.where(is_source, weight_function(df), weights)
+    return weights
+
+def sentiment_summary(df: pd.DataFrame) -> Dict:
+    """Weighted sentiment and post counts from one pass over the score and weight arrays"""
+    scores = df['sentiment_score'].to_numpy(dtype=np.float64)
+    weights = engagement_weights(df)
+    total_weight = weights.sum()
+    mean_sentiment = scores.mean()
+    positive_posts = int(np.count_nonzero(scores > 0.1))
+    negative_posts = int(np.count_nonzero(scores < -0.1))
+    
+    return {
+        'weighted_sentiment': (scores @ weights) / total_weight if total_weight > 0 else mean_sentiment,
+        'mean_sentiment': mean_sentiment,
+        'total_posts': len(scores),
+        'positive_posts': positive_posts,
+        'negative_posts': negative_posts,
+        'positive_ratio': positive_posts / len(scores),
+        'negative_ratio': negative_posts / len(scores),
+    }
+
 class TradingSignals:
     def __init__(self):
         self.last_signal_time = None
         self.signal_history = []
+        self.last_sentiment_stats = {}
     
     def generate_signal(self, sentiment_score: float, sentiment_stats: Dict = None) -> Optional[str]:
         """Generate trading signal based on sentiment score"""
@@ -46,31 +103,19 @@ class TradingSignals:
         if df.empty or 'sentiment_score' not in df.columns:
             return None
         
-        # Calculate weighted average sentiment
-        # Weight by engagement (retweets, likes, upvotes)
-        weights = []
-        for _, row in df.iterrows():
-            if row['source'] == 'twitter':
-                weight = (row.get('retweet_count', 0) + row.get('favorite_count', 0) + 1)
-            elif row['source'] == 'reddit':
-                weight = (row.get('score', 0) + 1) * row.get('upvote_ratio', 0.5)
-            else:
-                weight = 1
-            weights.append(weight)
-        
-        # Calculate weighted average sentiment
-        weighted_sentiment = np.average(df['sentiment_score'], weights=weights)
-        
-        # Get sentiment statistics
-        sentiment_stats = {
-            'weighted_sentiment': weighted_sentiment,
-            'mean_sentiment': df['sentiment_score'].mean(),
-            'total_posts': len(df),
-            'positive_posts': len(df[df['sentiment_score'] > 0.1]),
-            'negative_posts': len(df[df['sentiment_score'] < -0.1])
-        }
+        # Weighted average sentiment, weighted by engagement (retweets, likes, upvotes)
+        sentiment_stats = sentiment_summary(df)
+        self.last_sentiment_stats = sentiment_stats
+        
+        return self.generate_signal(sentiment_stats['weighted_sentiment'], sentiment_stats)
+    
+    def generate_signal_from_stream(self, stream_stats: Dict) -> Optional[str]:
+        """Generate trading signal from the streaming aggregator's decayed sentiment"""
+        if not stream_stats or not stream_stats.get('total_posts'):
+            return None
         
-        return self.generate_signal(weighted_sentiment, sentiment_stats)
+        self.last_sentiment_stats = stream_stats
+        return self.generate_signal(stream_stats['decayed_sentiment'], stream_stats)
     
     def get_signal_strength(self, sentiment_score: float) -> float:
         """Calculate signal strength based on sentiment score"""
@@ -135,24 +180,26 @@ class SentimentTradingBot:
         self.signals = TradingSignals()
         self.trade_history = []
     
-    def process_sentiment_data(self, df: pd.DataFrame) -> Dict:
-        """Process sentiment data and generate trading decision"""
+    def process_sentiment_data(self, df: pd.DataFrame, stream_stats: Dict = None) -> Dict:
+        """Process sentiment data and generate trading decision
+        
+        With `stream_stats` from a StreamingSentimentAggregator, the signal uses its
+        decayed sentiment and window statistics instead of re-reading every post.
+        """
         if df.empty:
             return {'action': 'HOLD', 'reason': 'No data available'}
         
         # Generate signal
-        signal = self.signals.generate_signal_from_dataframe(df)
+        if stream_stats:
+            signal = self.signals.generate_signal_from_stream(stream_stats)
+        else:
+            signal = self.signals.generate_signal_from_dataframe(df)
         
         if not signal:
             return {'action': 'HOLD', 'reason': 'No clear signal'}
         
-        # Get sentiment statistics
-        sentiment_stats = {
-            'mean_sentiment': df['sentiment_score'].mean(),
-            'total_posts': len(df),
-            'positive_ratio': len(df[df['sentiment_score'] > 0.1]) / len(df),
-            'negative_ratio': len(df[df['sentiment_score'] < -0.1]) / len(df)
-        }
+        # Sentiment statistics computed while generating the signal
+        sentiment_stats = self.signals.last_sentiment_stats
         
         # Calculate confidence
         confidence = self.signals.get_signal_strength(sentiment_stats['mean_sentiment'])
@@ -216,4 +263,21 @@ if __name__ == "__main__":
         print(f"Sentiment: {sentiment:.2f} -> Signal: {signal}, Strength: {strength:.2f}")
     
     print("\nSignal history:")
-    print(signals.get_signal_history()) 
\ No newline at end of file
+    print(signals.get_signal_history())
+    
+    # Weighted sentiment over a large mixed Twitter/Reddit cycle
+    import time
+    n = 100_000
+    rng = np.random.default_rng(42)
+    posts = pd.DataFrame({
+        'sentiment_score': rng.uniform(-1, 1, n),
+        'source': rng.choice(['twitter', 'reddit'], n),
+        'retweet_count': rng.integers(0, 100, n),
+        'favorite_count': rng.integers(0, 50, n),
+        'score': rng.integers(0, 1000, n),
+        'upvote_ratio': rng.uniform(0.5, 1.0, n),
+    })
+    start = time.perf_counter()
+    summary = sentiment_summary(posts)
+    print(f"\nWeighted sentiment of {n:,} posts: {summary['weighted_sentiment']:.4f} "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms") 
\ No newline at end of file
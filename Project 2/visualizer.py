@@ -67,20 +67,34 @@ class SentimentVisualizer:
             plt.show()
             return ""
     
-    def plot_sentiment_over_time(self, df: pd.DataFrame, time_window: str = '1H', save: bool = True) -> str:
-        """Plot sentiment over time"""
-        if df.empty or 'sentiment_score' not in df.columns or 'created_at' not in df.columns:
-            return ""
+    def _aggregate_over_time(self, df: pd.DataFrame, time_window: str = '1H', aggregated: pd.DataFrame = None) -> pd.DataFrame:
+        """Mean, std and count per time window, indexed by time
+        
+        Uses pre-aggregated buckets (e.g. from StreamingSentimentAggregator.get_buckets)
+        when given, and only resamples the raw posts otherwise.
+        """
+        if aggregated is not None and not aggregated.empty:
+            sentiment_over_time = aggregated.set_index('created_at')[['sentiment_mean', 'sentiment_std', 'post_count']]
+            sentiment_over_time.columns = ['mean', 'std', 'count']
+            return sentiment_over_time
         
         # Convert to datetime and set as index
-        df_copy = df.copy()
+        df_copy = df[['created_at', 'sentiment_score']].copy()
         df_copy['created_at'] = pd.to_datetime(df_copy['created_at'])
         df_copy.set_index('created_at', inplace=True)
         
         # Resample and aggregate
-        sentiment_over_time = df_copy['sentiment_score'].resample(time_window).agg([
+        return df_copy['sentiment_score'].resample(time_window).agg([
             'mean', 'std', 'count'
         ]).fillna(0)
+    
+    def plot_sentiment_over_time(self, df: pd.DataFrame, time_window: str = '1H', save: bool = True,
+                                 aggregated: pd.DataFrame = None) -> str:
+        """Plot sentiment over time"""
+        if df.empty or 'sentiment_score' not in df.columns or 'created_at' not in df.columns:
+            return ""
+        
+        sentiment_over_time = self._aggregate_over_time(df, time_window, aggregated)
         
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
         
@@ -216,7 +230,8 @@ class SentimentVisualizer:
             plt.show()
             return ""
     
-    def plot_comprehensive_analysis(self, df: pd.DataFrame, signal_df: pd.DataFrame = None, save: bool = True) -> str:
+    def plot_comprehensive_analysis(self, df: pd.DataFrame, signal_df: pd.DataFrame = None, save: bool = True,
+                                    aggregated: pd.DataFrame = None) -> str:
         """Create a comprehensive analysis dashboard"""
         if df.empty:
             return ""
@@ -254,11 +269,7 @@ class SentimentVisualizer:
         # 4. Sentiment over time (full width)
         ax4 = fig.add_subplot(gs[1, :])
         if 'created_at' in df.columns:
-            df_copy = df.copy()
-            df_copy['created_at'] = pd.to_datetime(df_copy['created_at'])
-            df_copy.set_index('created_at', inplace=True)
-            
-            sentiment_over_time = df_copy['sentiment_score'].resample('1H').mean().fillna(0)
+            sentiment_over_time = self._aggregate_over_time(df, '1H', aggregated)['mean']
             ax4.plot(sentiment_over_time.index, sentiment_over_time.values, marker='o', linewidth=2)
             ax4.axhline(y=config.SENTIMENT_THRESHOLD_BUY, color='green', linestyle='--', 
                        label=f'Buy Threshold ({config.SENTIMENT_THRESHOLD_BUY})')